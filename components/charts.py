@@ -1,9 +1,15 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List, Optional
 import pandas as pd
 
+from utils.perf import span
+
 # ====== THEME ======
 _THEME = {
     "accent": "#2563eb",     # albastru implicit
@@ -83,68 +89,124 @@ def _apply_layout(fig, height: int):
     )
     return fig
 
+# ====== cache figuri ======
+# cheie: (funcție, hash date, temă, înălțime) -> (figură, durata construirii)
+# figura se refolosește ca obiect (fără serializare JSON); funcțiile de mai jos doar o
+# trimit la st.plotly_chart, deci nu trebuie modificată după ce a intrat în cache
+FIG_CACHE_SIZE = 64
+_FIG_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_FIG_STATS = {"hits": 0, "misses": 0, "saved_s": 0.0}
+
+def _data_hash(payload: Any) -> str:
+    h = hashlib.sha1()
+    if isinstance(payload, pd.DataFrame):
+        h.update(repr(list(payload.columns)).encode())
+        h.update(pd.util.hash_pandas_object(payload, index=True).values.tobytes())
+    else:
+        h.update(repr(payload).encode())
+    return h.hexdigest()
+
+def _cached_figure(kind: str, payload: Any, height: int, build: Callable[[], go.Figure]) -> go.Figure:
+    key = (kind, _data_hash(payload), tuple(sorted(_THEME.items())), height)
+    hit = _FIG_CACHE.get(key)
+    if hit is not None:
+        _FIG_CACHE.move_to_end(key)
+        _FIG_STATS["hits"] += 1
+        _FIG_STATS["saved_s"] += hit[1]  # un hit costă doar căutarea cheii, plătită și la miss
+        return hit[0]
+    t0 = time.perf_counter()
+    with span(f"chart.{kind}"):
+        fig = _apply_layout(build(), height)
+    _FIG_CACHE[key] = (fig, time.perf_counter() - t0)
+    while len(_FIG_CACHE) > FIG_CACHE_SIZE:
+        _FIG_CACHE.popitem(last=False)
+    _FIG_STATS["misses"] += 1
+    return fig
+
+def figure_cache_stats() -> Dict[str, float]:
+    """Rata de reutilizare a figurilor și timpul economisit (secunde)."""
+    total = _FIG_STATS["hits"] + _FIG_STATS["misses"]
+    return {
+        "hits": _FIG_STATS["hits"],
+        "misses": _FIG_STATS["misses"],
+        "hit_rate": round(100.0 * _FIG_STATS["hits"] / total, 1) if total else 0.0,
+        "saved_s": round(_FIG_STATS["saved_s"], 3),
+        "entries": len(_FIG_CACHE),
+    }
+
 # ====== CHARTS ======
 def donut(counter: Dict[str, float], title: str, height: int = 150, key: Optional[str]=None):
     labels = list(counter.keys()) or ["N/A"]
     values = list(counter.values()) or [1]
-    fig = px.pie(names=labels, values=values, hole=0.62)
-    fig.update_traces(textinfo="percent", textposition="inside",
-                      marker=dict(line=dict(color=_THEME["card_border"], width=1.4)))
-    _apply_layout(fig, height)
+    def _build():
+        fig = px.pie(names=labels, values=values, hole=0.62)
+        fig.update_traces(textinfo="percent", textposition="inside",
+                          marker=dict(line=dict(color=_THEME["card_border"], width=1.4)))
+        return fig
+    fig = _cached_figure("donut", (labels, values), height, _build)
     card_start(title); st.plotly_chart(fig, use_container_width=True, key=key); card_end()
 
 def donut_tiny(counter: Dict[str, float], title: str, height: int = 110, key: Optional[str]=None):
     labels = list(counter.keys()) or ["N/A"]
     values = list(counter.values()) or [1]
-    fig = px.pie(names=labels, values=values, hole=0.70)
-    fig.update_traces(textinfo="none", marker=dict(line=dict(color=_THEME["card_border"], width=1)))
-    _apply_layout(fig, height)
+    def _build():
+        fig = px.pie(names=labels, values=values, hole=0.70)
+        fig.update_traces(textinfo="none", marker=dict(line=dict(color=_THEME["card_border"], width=1)))
+        return fig
+    fig = _cached_figure("donut_tiny", (labels, values), height, _build)
     card_start(title); st.plotly_chart(fig, use_container_width=True, key=key); card_end()
 
 def gauge_semicircle(percent: float, title="Progress", height: int = 120, key: Optional[str]=None):
     value = max(0, min(100, percent))
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number", value=value,
-        number={'suffix': "%", 'font': {'size': 18, 'color': _THEME["font"]}},
-        gauge={
-            'shape': "angular",
-            'axis': {'range':[0,100], 'visible': True, 'tickfont': {'size': 9}},
-            'bar': {'color': _THEME["accent"]},
-            'bgcolor': "rgba(0,0,0,0)",
-            'borderwidth': 1.6, 'bordercolor': _THEME["card_border"]
-        },
-        domain={'x':[0,1], 'y':[0,0.55]}
-    ))
-    _apply_layout(fig, height)
+    def _build():
+        return go.Figure(go.Indicator(
+            mode="gauge+number", value=value,
+            number={'suffix': "%", 'font': {'size': 18, 'color': _THEME["font"]}},
+            gauge={
+                'shape': "angular",
+                'axis': {'range':[0,100], 'visible': True, 'tickfont': {'size': 9}},
+                'bar': {'color': _THEME["accent"]},
+                'bgcolor': "rgba(0,0,0,0)",
+                'borderwidth': 1.6, 'bordercolor': _THEME["card_border"]
+            },
+            domain={'x':[0,1], 'y':[0,0.55]}
+        ))
+    fig = _cached_figure("gauge_semicircle", value, height, _build)
     card_start(title); st.plotly_chart(fig, use_container_width=True, key=key); card_end()
 
 def bullet(actual: float, target: float, title: str, height: int = 80, key: Optional[str]=None):
     # Bară tip bullet (actual vs target)
     actual = max(0, actual); target = max(actual, target)
-    fig = go.Figure()
-    fig.add_trace(go.Bar(x=[target], y=[" "], orientation='h',
-                         marker=dict(color="rgba(148,163,184,.35)"), hoverinfo='skip'))
-    fig.add_trace(go.Bar(x=[actual], y=[" "], orientation='h',
-                         marker=dict(color=_THEME["accent"]), hovertemplate="Actual: %{x}<extra></extra>"))
-    fig.update_layout(barmode="overlay")
-    fig.update_xaxes(range=[0, target*1.05], showgrid=False)
-    fig.update_yaxes(visible=False)
-    _apply_layout(fig, height)
+    def _build():
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=[target], y=[" "], orientation='h',
+                             marker=dict(color="rgba(148,163,184,.35)"), hoverinfo='skip'))
+        fig.add_trace(go.Bar(x=[actual], y=[" "], orientation='h',
+                             marker=dict(color=_THEME["accent"]), hovertemplate="Actual: %{x}<extra></extra>"))
+        fig.update_layout(barmode="overlay")
+        fig.update_xaxes(range=[0, target*1.05], showgrid=False)
+        fig.update_yaxes(visible=False)
+        return fig
+    fig = _cached_figure("bullet", (actual, target), height, _build)
     card_start(title); st.plotly_chart(fig, use_container_width=True, key=key); card_end()
 
 def bar(df: Optional[pd.DataFrame], x: str, y: str, title: str, height: int = 150, color: Optional[str]=None, stacked=False, key: Optional[str]=None):
     if df is None or df.empty:
         card_start(title); st.caption("Nu există date."); card_end(); return
-    fig = px.bar(df, x=x, y=y, color=color)
-    if stacked: fig.update_layout(barmode="stack")
-    fig.update_traces(marker_line=dict(color=_THEME["card_border"], width=1.1))
-    _apply_layout(fig, height)
+    def _build():
+        fig = px.bar(df, x=x, y=y, color=color)
+        if stacked: fig.update_layout(barmode="stack")
+        fig.update_traces(marker_line=dict(color=_THEME["card_border"], width=1.1))
+        return fig
+    fig = _cached_figure(f"bar:{x}:{y}:{color}:{stacked}", df, height, _build)
     card_start(title); st.plotly_chart(fig, use_container_width=True, key=key); card_end()
 
 def line(df: Optional[pd.DataFrame], x: str, y: str, title: str, height: int = 150, color: Optional[str]=None, key: Optional[str]=None):
     if df is None or df.empty:
         card_start(title); st.caption("Nu există date."); card_end(); return
-    fig = px.line(df, x=x, y=y, color=color)
-    fig.update_traces(line=dict(width=2.2))
-    _apply_layout(fig, height)
+    def _build():
+        fig = px.line(df, x=x, y=y, color=color)
+        fig.update_traces(line=dict(width=2.2))
+        return fig
+    fig = _cached_figure(f"line:{x}:{y}:{color}", df, height, _build)
     card_start(title); st.plotly_chart(fig, use_container_width=True, key=key); card_end()
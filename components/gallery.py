@@ -0,0 +1,86 @@
+# components/gallery.py
+from __future__ import annotations
+"""
+Galerie paginată de atașamente (Profil utilizator).
+
+– Citește din indexul de atașamente (utils.attachments) doar pagina curentă:
+  LIMIT/OFFSET + COUNT, deci costul unei pagini nu crește cu numărul de fișiere.
+– Filtre: secție și tip (imagini / PDF).
+– Grila arată doar miniaturi (sau prima pagină a PDF-ului, dacă există renderer);
+  originalul / documentul se încarcă numai pentru elementul deschis în «Detalii».
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import streamlit as st
+
+from components.previews import show_image, show_pdf
+from utils.attachments import attachments
+from utils.data_loader import APP_ROOT
+from utils.thumbnails import pdf_first_page, thumbnail
+
+PAGE_SIZES = [8, 12, 24, 48]
+GRID_COLS = 4
+TYPE_FILTERS = {"Toate": None, "Imagini": "image/", "PDF": "application/pdf"}
+
+def _tile(att, key: str, open_key: str) -> None:
+    path = APP_ROOT / att["path"]
+    is_pdf = att["mime"] == "application/pdf"
+    thumb = pdf_first_page(path) if is_pdf else thumbnail(path)
+    if thumb is not None:
+        st.image(str(thumb), use_container_width=True)
+    elif is_pdf:
+        st.markdown("📄")
+    else:
+        st.image(str(path), use_container_width=True)  # fără Pillow: originalul
+    st.caption(f"{path.name} · {att['section']}")
+    if st.button("Detalii", key=key):
+        st.session_state[open_key] = att["path"]
+
+def render_gallery(project_id: str, key: str = "gal", title: Optional[str] = None) -> None:
+    """Galeria atașamentelor unui proiect, cu filtre și paginare."""
+    if title:
+        st.markdown(title)
+    secs = attachments.sections(project_id)
+    if not secs:
+        st.caption("_Nu sunt atașamente salvate încă._")
+        return
+
+    f1, f2, f3, f4 = st.columns([2, 1, 1, 1])
+    with f1:
+        sec = st.selectbox("Secție", ["Toate"] + secs, key=f"{key}_sec")
+    with f2:
+        kind = st.selectbox("Tip", list(TYPE_FILTERS), key=f"{key}_type")
+    with f3:
+        page_size = st.selectbox("Pe pagină", PAGE_SIZES, index=1, key=f"{key}_size")
+    section = None if sec == "Toate" else sec
+    mime = TYPE_FILTERS[kind]
+    total = attachments.count(project=project_id, section=section, mime_prefix=mime)
+    n_pages = max((total + page_size - 1) // page_size, 1)
+    with f4:
+        page = st.number_input("Pagina", min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page")
+    offset = (int(page) - 1) * page_size
+    items = attachments.list(project=project_id, section=section, mime_prefix=mime,
+                             limit=page_size, offset=offset)
+    st.caption(f"Fișiere {offset + 1 if total else 0}–{offset + len(items)} din {total}")
+
+    cols = st.columns(GRID_COLS)
+    for i, (_, att) in enumerate(items.iterrows()):
+        with cols[i % GRID_COLS]:
+            _tile(att, f"{key}_{offset + i}", f"{key}_open")
+
+    # detaliu: un singur element, încărcat la cerere
+    opened = st.session_state.get(f"{key}_open")
+    if opened:
+        path = APP_ROOT / opened
+        with st.container(border=True):
+            c1, c2 = st.columns([4, 1])
+            c1.markdown(f"**{Path(opened).name}**")
+            if c2.button("✖ Închide", key=f"{key}_close"):
+                st.session_state.pop(f"{key}_open", None)
+                st.rerun()
+            if path.suffix.lower() == ".pdf":
+                show_pdf(path, height=520, key=f"{key}_detail_pdf")
+            elif path.exists():
+                show_image(path, key=f"{key}_detail_img")
@@ -0,0 +1,164 @@
+# components/previews.py
+from __future__ import annotations
+"""
+Previzualizări comune pentru atașamente (Secțiuni, Profil utilizator, Comandă nouă, Utilizatori).
+
+– Imaginile se afișează din miniatură; originalul se încarcă doar la cerere.
+– PDF-urile nu se mai pun în pagină ca base64: fișierul se publică o singură dată în
+  static/att/<sha256>.pdf (static serving Streamlit, «enableStaticServing») și se
+  deschide prin URL; iframe-ul apare doar la cerere. Dacă există un renderer PDF,
+  se arată rasterul primei pagini (cache pe disc).
+– Previzualizările fișierelor încă neîncărcate (st.file_uploader) se calculează o singură
+  dată per (file_id, dimensiune) și se țin în session_state: miniatura ca bytes, URL-ul
+  PDF-ului publicat. Se șterg când fișierul dispare din uploader sau la salvare; copia din
+  static/att a unui fișier care nu a mai fost salvat o șterge «python -m utils.attachments gc».
+"""
+
+import hashlib
+import io
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+try:  # dependență opțională (miniaturi pentru previzualizări)
+    from PIL import Image, ImageOps
+except Exception:  # pragma: no cover
+    Image = None
+    ImageOps = None
+
+import streamlit as st
+
+from utils.attachments import PUBLISHED_DIR
+from utils.thumbnails import IMAGE_EXTS, THUMB_PX, file_sha256, pdf_first_page, thumbnail
+from utils.uploads import UploadTooLarge, stream_upload
+
+STATIC_DIR = PUBLISHED_DIR.parent  # servit de Streamlit la «app/static/…»
+STATIC_URL = "app/static/att"
+_PREVIEWS = "_upload_previews"  # session_state: uploader -> {(file_id, size): payload}
+
+def _key(path, prefix: str) -> str:
+    return f"{prefix}_" + hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:12]
+
+def _publish_file(src: Path, name: str) -> str:
+    dst = PUBLISHED_DIR / name
+    if not dst.exists():
+        PUBLISHED_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(dst.name + ".tmp")
+        try:
+            os.link(src, tmp)  # fără copie pe același disc
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    return f"{STATIC_URL}/{name}"
+
+def publish(path: Path) -> str:
+    """URL static pentru un atașament (publicat după conținut, deci o singură dată)."""
+    path = Path(path)
+    return _publish_file(path, file_sha256(path) + path.suffix.lower())
+
+def publish_upload(file) -> str:
+    """Ca publish(), pentru un fișier încărcat dar încă nesalvat (copiat pe bucăți)."""
+    up = stream_upload(file, PUBLISHED_DIR)
+    name = up.sha256 + Path(file.name).suffix.lower()
+    if (PUBLISHED_DIR / name).exists():
+        up.path.unlink()
+    else:
+        os.replace(up.path, PUBLISHED_DIR / name)
+    return f"{STATIC_URL}/{name}"
+
+def _iframe(url: str, height: int) -> None:
+    st.markdown(
+        f'<iframe src="{url}" width="100%" height="{height}" loading="lazy" '
+        f'style="border:1px solid #e5e7eb;border-radius:8px;"></iframe>',
+        unsafe_allow_html=True,
+    )
+
+def show_image(path: Path, caption: Optional[str] = None, key: Optional[str] = None) -> None:
+    """Miniatura imaginii + opțiunea de a încărca originalul."""
+    path = Path(path)
+    thumb = thumbnail(path)
+    st.image(str(thumb or path), caption=caption or path.name, use_container_width=True)
+    if thumb is not None and st.checkbox("🔍 original", key=key or _key(path, "orig")):
+        st.image(str(path), use_container_width=True)
+
+def show_pdf(path: Path, height: int = 320, key: Optional[str] = None) -> None:
+    """Link + (opțional) prima pagină; documentul se încarcă în iframe doar la cerere."""
+    path = Path(path)
+    try:
+        url = publish(path)
+    except Exception:
+        st.write(path.name)
+        return
+    st.markdown(f"📄 [{path.name}]({url})")
+    raster = pdf_first_page(path)
+    if raster is not None:
+        st.image(str(raster), use_container_width=True)
+    if st.checkbox("👁 previzualizare", key=key or _key(path, "pdf")):
+        _iframe(url, height)
+
+def show_attachment(path: Path, height: int = 320) -> None:
+    path = Path(path)
+    if not path.exists():
+        return
+    if path.suffix.lower() in IMAGE_EXTS:
+        show_image(path)
+    elif path.suffix.lower() == ".pdf":
+        show_pdf(path, height)
+
+def _upload_thumb(file) -> Optional[bytes]:
+    """Miniatura unei imagini încărcate, ca bytes (None fără Pillow sau dacă nu se poate citi)."""
+    if Image is None:
+        return None
+    try:
+        file.seek(0)
+        with Image.open(file) as im:
+            im = ImageOps.exif_transpose(im)
+            im.thumbnail((THUMB_PX, THUMB_PX))
+            if im.mode not in ("RGB", "L"):
+                im = im.convert("RGB")
+            buf = io.BytesIO()
+            im.save(buf, "JPEG", quality=80)
+        return buf.getvalue()
+    except Exception:
+        return None
+    finally:
+        file.seek(0)
+
+def preview_upload(file, height: int = 320, cache: Optional[Dict] = None) -> None:
+    """Previzualizare pentru un fișier din st.file_uploader (înainte de salvare)."""
+    if not file:
+        return
+    entry = cache.setdefault((file.file_id, file.size), {}) if cache is not None else {}
+    name = file.name.lower()
+    if name.endswith(IMAGE_EXTS):
+        if "thumb" not in entry:
+            entry["thumb"] = _upload_thumb(file)
+        st.image(entry["thumb"] or file, caption=file.name, use_container_width=True)
+    elif name.endswith(".pdf"):
+        st.caption(f"📄 {file.name}")
+        if st.checkbox("👁 previzualizare", key=_key(f"{file.file_id}", "up_pdf")):
+            try:
+                if "url" not in entry:
+                    entry["url"] = publish_upload(file)
+                _iframe(entry["url"], height)
+            except UploadTooLarge as e:
+                st.warning(str(e))
+    else:
+        st.info(f"Fișier încărcat: {file.name}")
+
+def preview_uploads(files: Optional[Sequence], owner: str, height: int = 320) -> None:
+    """
+    Previzualizările fișierelor din uploader-ul «owner» (cheia lui), memorate între rerun-uri.
+    Se apelează la fiecare rerun, și cu listă goală: așa se uită fișierele scoase din uploader.
+    """
+    cache = st.session_state.setdefault(_PREVIEWS, {}).setdefault(owner, {})
+    current = {(f.file_id, f.size) for f in files or []}
+    for k in [k for k in cache if k not in current]:
+        del cache[k]
+    for f in files or []:
+        preview_upload(f, height, cache)
+
+def forget_upload_previews(owner: str) -> None:
+    """După salvare: fișierele nu mai sunt «în așteptare»."""
+    st.session_state.get(_PREVIEWS, {}).pop(owner, None)
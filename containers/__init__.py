@@ -1,13 +1,10 @@
 # containers/__init__.py
-from . import dashboard
-from . import overview
-from . import sections
-from . import new_order
-from . import project_settings
-from . import users
-from . import data_check
-from . import user_profile   # ← nou
-from . import nav  # dacă există, rămâne disponibil
+"""
+Paginile aplicației. Modulele se importă la primul acces (PEP 562): `from containers
+import sections` sau `containers.sections` încarcă doar pagina cerută, nu pe toate
+(altair, plotly, numpy, directoarele de atașamente/avatare se inițializează la nevoie).
+"""
+import importlib
 
 __all__ = [
     "dashboard",
@@ -17,6 +14,14 @@ __all__ = [
     "project_settings",
     "users",
     "data_check",
-    "user_profile",
-    "nav",
+    "user_profile",   # ← nou
+    "nav",  # dacă există, rămâne disponibil
 ]
+
+def __getattr__(name):
+    if name in __all__ or name == "help":
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
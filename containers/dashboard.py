@@ -1,16 +1,24 @@
 # containers/dashboard.py
 from __future__ import annotations
 
+import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import streamlit as st
 
 from utils.data_loader import data
+from utils.material_rollup import rollup
+from utils.paint_scheduler import plan_paint_batches
+from utils.progress_history import progress_store
+from utils.risk_history import classify_risk, days_late, risk_history_frame, snapshot_risk
+from utils.transport_planner import plan_deliveries
 
 APP_ROOT = Path(__file__).resolve().parents[1]
+log = logging.getLogger(__name__)
 
 # ---------- Helpers ----------
 def _normalize_projects(dfp: Optional[pd.DataFrame]) -> pd.DataFrame:
@@ -46,34 +54,93 @@ def _explode_sections(df: pd.DataFrame) -> pd.DataFrame:
                 out.append({"id": r["id"], "section": s})
     return pd.DataFrame(out)
 
-def _risk_bucket(days_late: int) -> str:
-    if days_late <= 0:   # înainte sau exact la termen
-        return "✅ La termen"
-    if 1 <= days_late <= 3:
-        return "⚠️ Avertizare (1–3 zile)"
-    return "⛔ Critic (>3 zile)"
-
-def _parse_activity(notes: str) -> List[dict]:
-    if not notes:
-        return []
-    lines = [ln.strip() for ln in str(notes).splitlines() if "[UPD]" in ln]
-    out = []
-    for ln in lines:
-        # [UPD][YYYY-mm-dd HH:MM][USER:Name][SEC:Section][ALL:0/1] text | FILES: ...
-        try:
-            ts = ln.split("][", 2)[1].strip("]")
-            when = ts.replace("UPD][","")
-            user = ""
-            sec = ""
-            if "[USER:" in ln:
-                user = ln.split("[USER:",1)[1].split("]",1)[0]
-            if "[SEC:" in ln:
-                sec = ln.split("[SEC:",1)[1].split("]",1)[0]
-            msg = ln.split("] ",1)[1] if "] " in ln else ln
-            out.append({"when": when, "user": user, "section": sec, "text": msg})
-        except Exception:
-            out.append({"when":"", "user":"", "section":"", "text": ln})
-    return out
+# ---------- View model (memoizat pe versiunea datelor + filtre) ----------
+VM_CACHE_SIZE = 32
+_VM_CACHE: "OrderedDict[tuple, dict]" = OrderedDict()
+_BASE_CACHE: Dict[int, Tuple[pd.DataFrame, List[str]]] = {}
+
+def _base_frame(version: int) -> Tuple[pd.DataFrame, List[str]]:
+    """Proiectele normalizate + opțiunile de secție, o dată per versiune de date."""
+    hit = _BASE_CACHE.get(version)
+    if hit is None:
+        dfp = _normalize_projects(data.projects.copy())
+        all_secs = sorted(set(_explode_sections(dfp)["section"].tolist())) if not dfp.empty else []
+        _BASE_CACHE.clear()
+        hit = _BASE_CACHE[version] = (dfp, all_secs)
+    return hit
+
+def _build_view_model(dfp: pd.DataFrame, sec_sel: frozenset, start_from, end_to, today: pd.Timestamp, n_users: int) -> dict:
+    # aplicăm filtre
+    f = dfp
+    if sec_sel:
+        ex = _explode_sections(f)
+        keep_ids = ex[ex["section"].isin(sec_sel)]["id"].astype(str).unique().tolist()
+        f = f[f["id"].astype(str).isin(keep_ids)]
+    if start_from:
+        f = f[(f["end"].isna()) | (f["end"] >= pd.to_datetime(start_from))]
+    if end_to:
+        f = f[(f["start"].isna()) | (f["start"] <= pd.to_datetime(end_to))]
+
+    ex_all = _explode_sections(f)
+    overdue = f[(~f["end"].isna()) & (today > f["end"]) & (f["progress_overall"] < 100)]
+
+    # semafor risc
+    tmp = f.copy()
+    tmp["days_late"] = days_late(tmp["end"], today)
+    tmp["bucket"] = classify_risk(tmp["days_late"])
+    agg = tmp.groupby("bucket", dropna=False)["id"].count().reset_index().rename(columns={"id":"count"}).sort_values("count", ascending=False)
+    top = tmp[(tmp["days_late"] > 0) & (tmp["progress_overall"] < 100)].copy()
+    top = top.assign(days_late=top["days_late"].astype(int)).sort_values(["days_late","end"], ascending=[False, True]).head(6)
+
+    # distribuție pe secții
+    if ex_all.empty:
+        counts = pd.DataFrame(columns=["section", "proiecte"])
+    else:
+        counts = ex_all.groupby("section")["id"].nunique().reset_index().rename(columns={"id":"proiecte"})
+        counts = counts.sort_values("proiecte", ascending=False)
+
+    # prognoză 6 săptămâni
+    horizon = today + pd.Timedelta(days=42)
+    g = f[(~f["end"].isna()) & (f["end"].between(today, horizon))].copy()
+    if g.empty:
+        per_week = pd.DataFrame(columns=["week", "proiecte"])
+    else:
+        g["week"] = g["end"].dt.to_period("W-SUN").dt.start_time.dt.date
+        per_week = g.groupby("week")["id"].nunique().reset_index().rename(columns={"id":"proiecte"})
+
+    # activitate recentă (top-K din indexul per proiect)
+    act_df = data.recent_activity(f["id"].tolist(), k=15)
+
+    return {
+        "ids": f["id"].tolist(),
+        "active": int((f["progress_overall"] < 100).sum()),
+        "sections_involved": int(ex_all["section"].nunique()) if not ex_all.empty else 0,
+        "users": n_users,
+        "overdue": int(overdue.shape[0]),
+        "risk_agg": agg,
+        "risk_top": top[["id","name","company","end","days_late","progress_overall"]],
+        "section_counts": counts,
+        "per_week": per_week,
+        "activity": act_df,
+    }
+
+def _cached(key: tuple, build):
+    """LRU comun pentru view model și secțiunile din expandere (cheia începe cu tipul)."""
+    hit = _VM_CACHE.get(key)
+    if hit is not None:
+        _VM_CACHE.move_to_end(key)
+        return hit
+    hit = _VM_CACHE[key] = build()
+    while len(_VM_CACHE) > VM_CACHE_SIZE:
+        _VM_CACHE.popitem(last=False)
+    return hit
+
+def _view_model(version: int, sec_sel: frozenset, start_from, end_to, today: pd.Timestamp, n_users: int) -> dict:
+    """View model-ul dashboard-ului, refolosit cât timp datele și filtrele nu se schimbă (LRU)."""
+    def build() -> dict:
+        dfp, _ = _base_frame(version)
+        return _build_view_model(dfp, sec_sel, start_from, end_to, today, n_users)
+    return _cached(("vm", version, sec_sel, start_from, end_to, today, n_users), build)
 
 # ---------- UI ----------
 def render(ctx=None, **kwargs):
@@ -92,8 +159,11 @@ def render(ctx=None, **kwargs):
 
     st.markdown("## 📊 Dashboard — KPI & risc & activitate")
 
-    dfp = _normalize_projects(data.projects.copy())
-    dfu = _normalize_users(getattr(data, "users", None))
+    # o singură citire a versiunii per rerun (verifică fișierele): toate cheile de mai jos
+    # descriu aceeași stare a datelor, inclusiv după o scriere din afara aplicației
+    version = data.version
+    dfp, all_secs = _base_frame(version)
+    n_users = int(_normalize_users(getattr(data, "users", None)).shape[0])
 
     if dfp.empty:
         st.warning("Nu există proiecte încărcate.")
@@ -101,110 +171,126 @@ def render(ctx=None, **kwargs):
         return
 
     today = pd.to_datetime(datetime.now().date())
+    # snapshot zilnic de risc (o singură scriere pe zi, pe tot portofoliul)
+    try:
+        snapshot_risk(dfp, today.date())
+    except Exception:
+        log.exception("Snapshot-ul zilnic de risc a eșuat")
+    try:
+        progress_store.daily_snapshot(data.projects, today.date())
+    except Exception:
+        log.exception("Snapshot-ul zilnic de progres a eșuat")
 
     # ---------- Filtre ----------
     c1, c2, c3 = st.columns([1.5, 1.2, 1.2])
     with c1:
         # Filtru secție
-        all_secs = sorted(set(_explode_sections(dfp)["section"].tolist()))
         sec_sel = st.multiselect("Secții", options=all_secs, default=[])
     with c2:
         start_from = st.date_input("De la", value=today - pd.Timedelta(days=14))
     with c3:
         end_to = st.date_input("Până la", value=today + pd.Timedelta(days=42))
 
-    # aplicăm filtre
-    f = dfp.copy()
-    if sec_sel:
-        ex = _explode_sections(f)
-        keep_ids = ex[ex["section"].isin(sec_sel)]["id"].astype(str).unique().tolist()
-        f = f[f["id"].astype(str).isin(keep_ids)]
-    if start_from:
-        f = f[(f["end"].isna()) | (f["end"] >= pd.to_datetime(start_from))]
-    if end_to:
-        f = f[(f["start"].isna()) | (f["start"] <= pd.to_datetime(end_to))]
+    vm = _view_model(version, frozenset(sec_sel), start_from, end_to, today, n_users)
+    f = dfp[dfp["id"].isin(vm["ids"])]
+    # corpul expanderelor rulează la fiecare rerun, chiar închise: calculele de mai jos
+    # trec prin același LRU (versiune, filtre, zi)
+    filt = (version, frozenset(sec_sel), start_from, end_to, today)
 
     # ---------- KPI sus ----------
     c1, c2, c3, c4 = st.columns(4)
     with c1:
         st.markdown("<div class='metricbox'>", unsafe_allow_html=True)
-        st.metric("Proiecte active", int((f["progress_overall"] < 100).sum()))
+        st.metric("Proiecte active", vm["active"])
         st.markdown("</div>", unsafe_allow_html=True)
     with c2:
         st.markdown("<div class='metricbox'>", unsafe_allow_html=True)
-        ex = _explode_sections(f)
-        st.metric("Secții implicate", int(ex["section"].nunique()) if not ex.empty else 0)
+        st.metric("Secții implicate", vm["sections_involved"])
         st.markdown("</div>", unsafe_allow_html=True)
     with c3:
         st.markdown("<div class='metricbox'>", unsafe_allow_html=True)
-        st.metric("Utilizatori (total)", int(dfu.shape[0]))
+        st.metric("Utilizatori (total)", vm["users"])
         st.markdown("</div>", unsafe_allow_html=True)
     with c4:
         st.markdown("<div class='metricbox'>", unsafe_allow_html=True)
-        overdue = f[(~f["end"].isna()) & (today > f["end"]) & (f["progress_overall"] < 100)]
-        st.metric("Proiecte întârziate", int(overdue.shape[0]))
+        st.metric("Proiecte întârziate", vm["overdue"])
         st.markdown("</div>", unsafe_allow_html=True)
 
     # ---------- Semafor risc ----------
     st.subheader("Semafor risc (după termenul de finalizare)")
-    tmp = f.copy()
-    tmp["days_late"] = (today - tmp["end"]).dt.days
-    tmp["days_late"] = tmp["days_late"].fillna(-9999)
-    tmp["bucket"] = tmp["days_late"].apply(lambda x: _risk_bucket(int(x)) if x != -9999 else "– fără termen –")
-    agg = tmp.groupby("bucket", dropna=False)["id"].count().reset_index().rename(columns={"id":"count"}).sort_values("count", ascending=False)
     c1, c2 = st.columns([1.4, 2.6])
     with c1:
-        st.dataframe(agg, hide_index=True, use_container_width=True)
+        st.dataframe(vm["risk_agg"], hide_index=True, use_container_width=True)
     with c2:
         # top 6 la risc (cu termen depășit și progres < 100)
-        top = tmp[(tmp["days_late"] > 0) & (tmp["progress_overall"] < 100)].copy()
-        top = top.assign(days_late=top["days_late"].astype(int)).sort_values(["days_late","end"], ascending=[False, True]).head(6)
-        view = top[["id","name","company","end","days_late","progress_overall"]]
-        st.dataframe(view, hide_index=True, use_container_width=True)
+        st.dataframe(vm["risk_top"], hide_index=True, use_container_width=True)
+
+    hist = _cached(("risk_hist", version, today), risk_history_frame)
+    if len(hist) > 1:
+        st.caption("Evoluția riscului (proiecte nefinalizate, snapshot zilnic)")
+        st.line_chart(hist, x="date", y=[c for c in hist.columns if c != "date"], height=200)
 
     # ---------- Distribuție pe secții ----------
     st.subheader("Distribuție pe secții (proiecte care ating secția)")
-    ex_all = _explode_sections(f)
-    if ex_all.empty:
+    if vm["section_counts"].empty:
         st.caption("Nu există secții înregistrate.")
     else:
-        counts = ex_all.groupby("section")["id"].nunique().reset_index().rename(columns={"id":"proiecte"})
-        counts = counts.sort_values("proiecte", ascending=False)
-        st.bar_chart(counts, x="section", y="proiecte", height=220)
+        st.bar_chart(vm["section_counts"], x="section", y="proiecte", height=220)
 
     # ---------- Prognoză 6 săptămâni (proiecte cu deadline în interval) ----------
     st.subheader("Prognoză finalizări (următoarele 6 săptămâni)")
-    horizon = today + pd.Timedelta(days=42)
-    g = f[(~f["end"].isna()) & (f["end"].between(today, horizon))].copy()
-    if g.empty:
+    if vm["per_week"].empty:
         st.caption("Nu există finalizări programate în interval.")
     else:
-        g["week"] = g["end"].dt.to_period("W-SUN").dt.start_time.dt.date
-        per_week = g.groupby("week")["id"].nunique().reset_index().rename(columns={"id":"proiecte"})
-        st.line_chart(per_week, x="week", y="proiecte", height=220)
+        st.line_chart(vm["per_week"], x="week", y="proiecte", height=220)
+
+    # ---------- Burn-up (istoric progres) ----------
+    with st.expander("📈 Burn-up — progres în timp", expanded=False):
+        who = st.selectbox("Proiect", options=["(portofoliu)"] + f["id"].astype(str).tolist(), key="burnup_project")
+        curve = _cached(("burnup", version, today, who), lambda: progress_store.burnup(
+            today - pd.Timedelta(days=90), today, None if who == "(portofoliu)" else who))
+        if len(curve) > 1:
+            st.line_chart(curve, x="date", y="progress", height=220)
+        else:
+            st.caption("Istoricul de progres se construiește zilnic și la fiecare salvare.")
+
+    # ---------- Plan livrări (consolidare curse) ----------
+    with st.expander("🚚 Plan livrări — consolidare curse Transport", expanded=False):
+        plan, no_volume = _cached(("deliveries",) + filt, lambda: plan_deliveries(
+            f, pd.to_datetime(start_from).date(), pd.to_datetime(end_to).date()))
+        if plan.empty:
+            st.caption("Nu există livrări cu volum estimat în interval.")
+        else:
+            st.dataframe(plan, hide_index=True, use_container_width=True)
+        if no_volume:
+            st.caption("Fără volum salvat (nu pot fi planificate): " + ", ".join(no_volume))
+
+    # ---------- Vopsitorie: loturi pe cicluri de cabină ----------
+    with st.expander("🎨 Vopsitorie — loturi pe cicluri de cabină", expanded=False):
+        horizon_days = st.number_input("Orizont (zile)", min_value=1, max_value=60, value=14, key="paint_horizon")
+        cycles, paint_dates = _cached(("paint", version, today, int(horizon_days)),
+                                      lambda: plan_paint_batches(dfp, today.date(), int(horizon_days)))
+        if cycles.empty:
+            st.caption("Nu există fronturi vopsite cu termen în orizont.")
+        else:
+            st.dataframe(cycles, hide_index=True, use_container_width=True)
+            st.dataframe(paint_dates, hide_index=True, use_container_width=True)
+
+    # ---------- Achiziții: necesar materiale pe săptămâni ----------
+    with st.expander("📦 Achiziții — necesar materiale pe săptămâni", expanded=False):
+        def _need() -> pd.DataFrame:
+            rollup.sync(data.projects, version)
+            return rollup.table()
+        need = _cached(("materials", version), _need)
+        if need.empty:
+            st.caption("Nu există proiecte deschise cu configurator salvat.")
+        else:
+            st.dataframe(need, use_container_width=True)
 
     # ---------- Activitate recentă ----------
     st.subheader("Ultimele activități")
-    acts = []
-    for _, r in f.iterrows():
-        for a in _parse_activity(r.get("notes","")):
-            acts.append({
-                "when": a["when"],
-                "project": r.get("name",""),
-                "section": a.get("section",""),
-                "user": a.get("user",""),
-                "text": a.get("text",""),
-            })
-    if acts:
-        act_df = pd.DataFrame(acts)
-        # ordonăm desc după timp dacă se poate parsa
-        try:
-            act_df["_ts"] = pd.to_datetime(act_df["when"], errors="coerce")
-            act_df = act_df.sort_values("_ts", ascending=False)
-            act_df = act_df.drop(columns=["_ts"])
-        except Exception:
-            pass
-        st.dataframe(act_df.head(15), hide_index=True, use_container_width=True)
+    if not vm["activity"].empty:
+        st.dataframe(vm["activity"], hide_index=True, use_container_width=True)
     else:
         st.caption("Nu există activitate înregistrată încă.")
 
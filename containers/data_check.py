@@ -6,6 +6,8 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+from utils.data_loader import data
+
 APP_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = APP_ROOT / "data"
 PROJECTS_XLSX = DATA_DIR / "proiecte.xlsx"
@@ -1,7 +1,6 @@
 # containers/new_order.py
 from __future__ import annotations
 
-import base64
 from datetime import date, timedelta
 from math import ceil
 from pathlib import Path
@@ -17,6 +16,14 @@ from utils.data_loader import (
     PROJECTS_XLSX,
     PROJECT_COLS_ORDER,
 )
+from utils.configurator import VOLUME_REDUCTION_DEZASAMBLAT, item_geometry, config_note_line
+from utils.cut_optimizer import expand_config, nest_parts, summary as cut_summary
+from utils.transport_planner import vehicle_for_volume
+from utils.attachments import attachments
+from utils.perf import timed
+from utils.image_compress import queue_uploads
+from utils.uploads import UploadTooLarge
+from components.previews import forget_upload_previews, preview_uploads, show_image, show_pdf
 
 # --- opțional pentru Gantt (fallback dacă nu e instalat) ---
 try:
@@ -46,7 +53,6 @@ VENEER_H_PER_M2 = 1.6
 # Ambalare
 PACK_BASE_H = 0.5
 PACK_H_PER_M3 = 0.8
-VOLUME_REDUCTION_DEZASAMBLAT = 0.65
 PACK_FACTOR_ASAMBLAT = 1.5
 PACK_FACTOR_DEZASAMBLAT = 1.0
 
@@ -102,37 +108,19 @@ def _maps_links(address: str, pasted_url: str | None = None) -> Tuple[str, str]:
     return (f"https://www.google.com/maps/search/?api=1&query={q}",
             f"https://waze.com/ul?ll&navigate=yes&q={q}")
 
-def _save_attachments(files, proj_id: str, section: str | None = None) -> list[str]:
-    saved = []
-    if not files:
-        return saved
-    target = ATTACH_DIR / proj_id / (section or "_general")
-    target.mkdir(parents=True, exist_ok=True)
-    for f in files:
-        fname = f.name.replace("/", "_").replace("\\", "_")
-        with open(target / fname, "wb") as out:
-            out.write(f.getbuffer())
-        saved.append(str((target / fname).relative_to(APP_ROOT)))
-    return saved
+def _current_user() -> str:
+    return st.session_state.get("auth_name") or st.session_state.get("current_user_name") or "User"
 
-def _preview_upload(file):
-    if not file:
-        return
-    name = file.name.lower()
-    if any(name.endswith(ext) for ext in (".png",".jpg",".jpeg",".webp")):
-        st.image(file, caption=file.name, use_container_width=True)
-    elif name.endswith(".pdf"):
-        b64 = base64.b64encode(file.getvalue()).decode("utf-8")
-        st.markdown(
-            f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="340" style="border:1px solid #bbb;border-radius:8px;"></iframe>',
-            unsafe_allow_html=True,
-        )
-    else:
-        st.info(f"Fișier încărcat: {file.name}")
+def _save_attachments(files, proj_id: str, section: str | None = None,
+                      uploader: str = "", visible_all: bool = False) -> list[str]:
+    saved = attachments.store(files, proj_id, section, uploader, visible_all)
+    queue_uploads(saved)
+    return saved
 
 def _offers_cols() -> List[str]:
     return ["id","company","project","value","offer_date","valid_until","extended_days","status","accepted_date"]
 
+@timed("excel.append_offer")
 def _append_offer(rec: dict):
     try:
         df = pd.read_excel(OFFERS_XLSX, sheet_name="Oferte", engine="openpyxl")
@@ -146,6 +134,7 @@ def _append_offer(rec: dict):
     with pd.ExcelWriter(OFFERS_XLSX, engine="openpyxl", mode="w") as xlw:
         df[_offers_cols()].to_excel(xlw, sheet_name="Oferte", index=False)
 
+@timed("excel.update_offer_status")
 def _update_offer_status(proj_id: str, status: str, accepted_date: date | None = None):
     try:
         df = pd.read_excel(OFFERS_XLSX, sheet_name="Oferte", engine="openpyxl")
@@ -176,39 +165,14 @@ def _compute_from_config(config: List[dict], delivery_type: str) -> Tuple[Dict[s
     needed_h_m = 0.0
 
     for it in config:
-        typ = it["type"]
-        H = max(float(it.get("H", 0)), 0.0) / 1000.0  # m
-        L = max(float(it.get("L", 0)), 0.0) / 1000.0
-        D = max(float(it.get("D", 0)), 0.0) / 1000.0
-        units = max(int(it.get("units", 1)), 1)
-
-        if typ == "Dressing":
-            # lungime totală (mm) și adâncime D; estimăm module de 0.8m
-            length_total_m = max(float(it.get("length_total", 0)), 0.0) / 1000.0
-            module_w = 0.8  # m
-            units = max(1, ceil(length_total_m / module_w))
-            # H poate fi personalizat; dacă lipsește, estimăm 2.4m
-            if H <= 0:
-                H = 2.4
-            L = module_w  # lățimea medie a unui modul pentru volum/ front
-            # volum continuu
-            vol = length_total_m * D * H
-        else:
-            # Dulap simplu sau alte tipuri „unit”
-            if H <= 0: H = 2.0
-            if L <= 0: L = 0.8
-            if D <= 0: D = 0.6
-            vol = H * L * D * units
+        g = item_geometry(it)
+        H, units, vol = g["H"], g["units"], g["volume_m3"]
 
         # Materiale (procente fronturi vopsite / furnir)
-        paint_pct = max(min(int(it.get("paint_pct", 0)), 100), 0)
-        veneer_pct = max(min(int(it.get("veneer_pct", 0)), 100), 0)
+        paint_pct = g["paint_pct"]
+        veneer_pct = g["veneer_pct"]
         # suprafață front estimată: H x (L * units) sau H x lungime_dressing
-        if typ == "Dressing":
-            length_total_m = max(float(it.get("length_total", 0)), 0.0) / 1000.0
-            front_area_m2 = H * length_total_m
-        else:
-            front_area_m2 = H * L * units
+        front_area_m2 = g["front_area_m2"]
 
         # Ore de bază per unitate (dulap) -> scale cu units
         for sec, hpu in BASE_HOURS_PER_UNIT.items():
@@ -239,17 +203,8 @@ def _compute_from_config(config: List[dict], delivery_type: str) -> Tuple[Dict[s
     pack_hours = PACK_BASE_H + PACK_H_PER_M3 * total_vol_m3 * pack_factor
     sec_hours["Ambalare"] = sec_hours.get("Ambalare", 0.0) + pack_hours
 
-    # Vehicul recomandat
-    if total_vol_m3 < 3:
-        vehicle = "Autoutilitară mică (≈3 m³)"
-    elif total_vol_m3 < 6:
-        vehicle = "Van mediu (≈6 m³)"
-    elif total_vol_m3 < 12:
-        vehicle = "Van mare (≈12 m³)"
-    elif total_vol_m3 < 20:
-        vehicle = "Camion 3.5T (≈20 m³)"
-    else:
-        vehicle = "Camion >7.5T"
+    # Vehicul recomandat (clasele sunt comune cu planificatorul de livrări)
+    vehicle = vehicle_for_volume(total_vol_m3).name
 
     # Transformăm ore -> zile (ținând cont de capacități)
     durations_days: Dict[str, int] = {}
@@ -334,6 +289,7 @@ def render(ctx=None, **kwargs):
             with mc1:
                 mat_paint = st.checkbox("Fronturi vopsite (MDF)", value=False, key="mat_paint")
                 paint_pct = st.number_input("Procent vopsite (%)", min_value=0, max_value=100, value=100 if mat_paint else 0, key="paint_pct")
+                paint_finish = st.text_input("Finisaj vopsitorie (RAL / cod)", value="Standard", key="paint_finish", disabled=not mat_paint)
             with mc2:
                 mat_veneer = st.checkbox("Fronturi furnir", value=False, key="mat_veneer")
                 veneer_pct = st.number_input("Procent furnir (%)", min_value=0, max_value=100, value=0 if mat_paint else 100 if mat_veneer else 0, key="veneer_pct")
@@ -348,6 +304,7 @@ def render(ctx=None, **kwargs):
                     "H": H, "L": L, "D": D,
                     "length_total": length_total if st.session_state.sel_typ == "Dressing" else 0,
                     "mat_paint": mat_paint, "paint_pct": paint_pct,
+                    "paint_finish": (paint_finish.strip() or "Standard") if mat_paint else "",
                     "mat_veneer": mat_veneer, "veneer_pct": veneer_pct,
                 }
                 st.session_state.offer_config.append(rec)
@@ -366,6 +323,20 @@ def render(ctx=None, **kwargs):
                 if dur_map:
                     st.caption("Durate estimate (zile) per secție (din configurator): " + ", ".join(f"{k}: {v}" for k,v in dur_map.items()))
 
+                # estimare plăci pentru Debitare (nesting ghilotină)
+                nest = nest_parts(expand_config(st.session_state.offer_config, proj_id))
+                if nest:
+                    st.caption("Debitare (estimare plăci): " + ", ".join(
+                        f"{m}: {r.sheets} plăci, pierdere {r.waste_pct}%" for m, r in nest.items()
+                    ))
+                    with st.expander("✂️ Listă de tăiere (Debitare)", expanded=False):
+                        st.dataframe(cut_summary(nest), hide_index=True, use_container_width=True)
+                        for m, r in nest.items():
+                            st.markdown(f"**{m}** — placă {r.board[0]}×{r.board[1]} mm")
+                            st.dataframe(r.cuts, hide_index=True, use_container_width=True, height=200)
+                            if not r.oversize.empty:
+                                st.warning(f"{len(r.oversize)} piese depășesc formatul plăcii {m}.")
+
         # validare ofertă
         cc1, cc2, cc3 = st.columns([1.4,1,1])
         with cc1: validate_offer = st.button("✅ Validează oferta")
@@ -554,10 +525,14 @@ def render(ctx=None, **kwargs):
                     files = st.file_uploader(f"Documente ({sec})", type=["png","jpg","jpeg","webp","pdf"], accept_multiple_files=True, key=f"up_{sec}")
                 with c3:
                     visible_all = st.checkbox("Vizibil pentru toate secțiile", value=False, key=f"vis_{sec}")
-                    if files:
-                        for f in files: _preview_upload(f)
+                    preview_uploads(files, owner=f"up_{sec}", height=340)
                     if st.button(f"💾 Salvează modificări {sec}", key=f"save_{sec}"):
-                        saved = _save_attachments(files, proj_id, section=sec)
+                        try:
+                            saved = _save_attachments(files, proj_id, section=sec, uploader=_current_user(), visible_all=bool(visible_all))
+                        except UploadTooLarge as e:
+                            st.error(str(e))
+                            st.stop()
+                        forget_upload_previews(f"up_{sec}")
                         entry = {"note": note.strip(), "all": bool(visible_all), "files": saved}
                         st.session_state.sec_notes.setdefault(sec, []).append(entry)
                         st.session_state.sec_participants[sec] = sec_part
@@ -607,8 +582,7 @@ def render(ctx=None, **kwargs):
         st.markdown("### 📝 Note generale & atașamente")
         notes_general = st.text_area("Note proiect (opțional)", height=80)
         uploads_general = st.file_uploader("Documente generale", type=["png","jpg","jpeg","webp","pdf"], accept_multiple_files=True, key="up_general")
-        if uploads_general:
-            for f in uploads_general: _preview_upload(f)
+        preview_uploads(uploads_general, owner="up_general", height=340)
 
         global_files: List[str] = []
         for entries in st.session_state.sec_notes.values():
@@ -621,14 +595,9 @@ def render(ctx=None, **kwargs):
                 try:
                     full = (APP_ROOT / fp).resolve()
                     if str(full).lower().endswith((".png",".jpg",".jpeg",".webp")):
-                        st.image(str(full), use_container_width=True)
+                        show_image(full)
                     elif str(full).lower().endswith(".pdf"):
-                        with open(full, "rb") as fh:
-                            b64 = base64.b64encode(fh.read()).decode("utf-8")
-                        st.markdown(
-                            f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="300" style="border:1px solid #bbb;border-radius:8px;"></iframe>',
-                            unsafe_allow_html=True,
-                        )
+                        show_pdf(full, height=300)
                 except Exception:
                     st.write(fp)
 
@@ -672,7 +641,12 @@ def render(ctx=None, **kwargs):
                 inst_flags[i] = "da"
                 inst_amts[i] = round(float(value) * (float(percents[i]) / 100.0), 2)
 
-            saved_general = _save_attachments(uploads_general, proj_id, section=None)
+            try:
+                saved_general = _save_attachments(uploads_general, proj_id, section=None, uploader=_current_user())
+            except UploadTooLarge as e:
+                st.error(str(e))
+                st.stop()
+            forget_upload_previews("up_general")
 
             # manifest secții
             sec_manifest_lines = []
@@ -686,6 +660,8 @@ def render(ctx=None, **kwargs):
                     )
             sec_manifest = "\n".join(sec_manifest_lines)
             sim_vehicle = st.session_state.get("sim_vehicle","")
+            offer_config = st.session_state.get("offer_config") or []
+            config_line = config_note_line(offer_config, st.session_state.get("offer_delivery", "Asamblate")) if offer_config else ""
 
             new_row = {
                 "id": proj_id,
@@ -712,6 +688,7 @@ def render(ctx=None, **kwargs):
                 "notes": (
                     f"PM: {project_manager}\n"
                     + (sim_vehicle + "\n" if sim_vehicle else "")
+                    + (config_line + "\n" if config_line else "")
                     + f"MANIFEST:\n{sec_manifest}\n"
                     + (f"GLOBAL_FILES: {', '.join(global_files)}\n" if global_files else "")
                     + (f"GENERAL_FILES: {', '.join(saved_general)}" if saved_general else "")
@@ -729,11 +706,9 @@ def render(ctx=None, **kwargs):
             except Exception:
                 full_df = pd.DataFrame(columns=PROJECT_COLS_ORDER)
             full_df = pd.concat([full_df, row_df], ignore_index=True)
-            with pd.ExcelWriter(PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
-                full_df.to_excel(xlw, sheet_name="Proiecte", index=False)
+            data.write_projects(full_df, changed_ids=[proj_id])
 
             _update_offer_status(proj_id, status="Accepted", accepted_date=date.today())
             for k in ["sec_notes","sec_participants","durations_override","simulated_deadlines","sim_vehicle"]:
                 st.session_state.pop(k, None)
             st.success(f"Proiectul **{proj_id}** a fost salvat, iar oferta marcată **Accepted**.")
-            data.refresh()
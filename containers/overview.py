@@ -1,76 +1,29 @@
 # containers/overview.py
 from __future__ import annotations
 import streamlit as st
-import pandas as pd
-from pathlib import Path
 
-APP_ROOT = Path(__file__).resolve().parents[1]
-DATA_DIR = APP_ROOT / "data"
-PROJECTS_XLSX = DATA_DIR / "proiecte.xlsx"
-PERSONAL_XLSX = DATA_DIR / "personal.xlsx"
+from utils.data_loader import data, kpi_summary, project_filter_mask
 
-SHEET_PROJECTS = "Proiecte"
-SHEET_PERSONAL = "Personal"
-
-# Coloane de bază pe care le afișăm; dacă lipsesc, le completăm cu valori goale
-BASE_COLS = [
-    "id", "name", "company", "responsible", "participants",
-    "value", "status", "progress_overall", "start", "end", "sections"
+# Coloanele registrului; «participants» (text lung) doar la cerere
+TABLE_COLS = [
+    "id", "name", "company", "responsible",
+    "progress_overall", "status", "start", "end",
+    "sections", "participants", "value"
 ]
-
-@st.cache_data(show_spinner=False)
-def load_df(path: Path, sheet: str) -> pd.DataFrame:
-    try:
-        return pd.read_excel(path, sheet_name=sheet, engine="openpyxl")
-    except FileNotFoundError:
-        return pd.DataFrame()
-    except Exception as e:
-        st.error(f"Eroare la citirea «{path.name}» / foaia «{sheet}»: {e}")
-        return pd.DataFrame()
-
-def normalize_projects(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-
-    # Asigurăm coloanele așteptate
-    for c in BASE_COLS:
-        if c not in df.columns:
-            df[c] = None
-
-    # Tipuri sigure
-    df["progress_overall"] = pd.to_numeric(df["progress_overall"], errors="coerce")
-    df["status"] = pd.to_numeric(df["status"], errors="coerce")
-
-    for c in ("start", "end"):
-        df[c] = pd.to_datetime(df[c], errors="coerce")
-
-    # “sections” / “participants” ca string
-    df["sections"] = df["sections"].fillna("").astype(str)
-    df["participants"] = df["participants"].fillna("").astype(str)
-
-    # “value” numeric
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
-
-    # Chei de sortare dedicate (evităm erori de tip)
-    df["__end_dt"] = df["end"]
-    df["__status_num"] = df["status"].fillna(-1)
-    df["__prog_num"] = df["progress_overall"].fillna(-1)
-
-    return df
+DEFAULT_TABLE_COLS = [c for c in TABLE_COLS if c != "participants"]
+PAGE_SIZES = [25, 50, 100, 200]
 
 def render(ctx=None, **kwargs):
     st.markdown("## 📚 Vedere generală")
     st.caption("Registru proiecte cu filtre. Compatibil cu «participants», «section_deadlines» și lista extinsă de secții.")
 
-    dfp = load_df(PROJECTS_XLSX, SHEET_PROJECTS)
-    dfu = load_df(PERSONAL_XLSX, SHEET_PERSONAL)
+    # același cache versionat ca restul aplicației (o singură parsare a fișierului)
+    df = data.projects
 
-    if dfp.empty:
+    if df.empty:
         st.warning("Nu am găsit proiecte (data/proiecte.xlsx).")
         return
 
-    df = normalize_projects(dfp.copy())
-
     # ==== Filtre ====
     left, mid, right = st.columns(3)
     with left:
@@ -80,48 +33,43 @@ def render(ctx=None, **kwargs):
         opt_resp = ["(toți)"] + sorted(df["responsible"].dropna().astype(str).unique().tolist())
         resp = st.selectbox("Responsabil", opt_resp, index=0)
     with right:
-        all_secs = sorted({s.strip() for row in df["sections"] for s in row.split(",") if s.strip()})
+        all_secs = sorted({s.strip() for row in df["sections"].fillna("") for s in str(row).split(",") if s.strip()})
         opt_sec = ["(toate)"] + all_secs
         sec = st.selectbox("Secție", opt_sec, index=0)
 
-    f = df
+    filters = {}
     if client != "(toți)":
-        f = f[f["company"].astype(str) == client]
+        filters["company"] = client
     if resp != "(toți)":
-        f = f[f["responsible"].astype(str) == resp]
+        filters["responsible"] = resp
     if sec != "(toate)":
         # IMPORTANT: fără regex -> nu mai cade pe paranteze / simboluri
-        f = f[f["sections"].astype(str).str.contains(sec, regex=False, na=False)]
-
-    # ==== Tabel ====
-    table_cols = [
-        "id", "name", "company", "responsible",
-        "progress_overall", "status", "start", "end",
-        "sections", "participants", "value"
-    ]
-    for c in table_cols:
-        if c not in f.columns:
-            f[c] = None
-
-    # Sortare robustă (după end, apoi status, apoi progres)
-    f_sorted = f.sort_values(
-        by=["__end_dt", "__status_num", "__prog_num"],
-        ascending=[True, False, False],
-        kind="mergesort"  # stabil
-    )
-
-    # Afișăm datele prietenește (date fără timp)
-    out = f_sorted.copy()
-    out["start"] = pd.to_datetime(out["start"], errors="coerce").dt.date
-    out["end"] = pd.to_datetime(out["end"], errors="coerce").dt.date
-
-    st.dataframe(out[table_cols], use_container_width=True)
-
-    # ==== KPI ====
+        filters["sections"] = sec
+
+    # ==== Tabel (paginat în stratul de date) ====
+    show_cols = st.multiselect("Coloane", TABLE_COLS, default=DEFAULT_TABLE_COLS, key="ov_cols") or DEFAULT_TABLE_COLS
+    p1, p2, p3 = st.columns([1, 1, 2])
+    with p1:
+        page_size = st.selectbox("Rânduri / pagină", PAGE_SIZES, index=1, key="ov_page_size")
+    # masca filtrelor se calculează o dată: total pentru paginare + KPI
+    mask = project_filter_mask(df, filters) if filters else None
+    total = int(mask.sum()) if mask is not None else len(df)
+    n_pages = max((total + page_size - 1) // page_size, 1)
+    with p2:
+        page = st.number_input("Pagina", min_value=1, max_value=n_pages, value=1, step=1, key="ov_page")
+    offset = (int(page) - 1) * page_size
+    # Sortare robustă (după end, apoi status, apoi progres), pe index pre-sortat
+    out, total = data.query_projects(offset, page_size, filters=filters, columns=[c for c in TABLE_COLS if c in show_cols])
+    with p3:
+        st.caption(f"Proiecte {offset + 1 if total else 0}–{offset + len(out)} din {total}")
+
+    st.dataframe(out, use_container_width=True)
+
+    # ==== KPI (pe toate proiectele filtrate, nu doar pe pagină) ====
+    f = df if mask is None else df[mask]
+    k = kpi_summary(f)
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Proiecte", len(out))
-    k2.metric("Progres mediu", float(out["progress_overall"].mean(skipna=True).round(1)) if len(out) else 0.0)
-    k3.metric("Valoare totală", float(out["value"].sum(skipna=True)) if len(out) else 0.0)
-    now = pd.Timestamp.now(tz=None)
-    active_mask = (pd.to_datetime(out["start"], errors="coerce") <= now) & (pd.to_datetime(out["end"], errors="coerce") >= now)
-    k4.metric("În lucru acum", int(active_mask.sum()))
+    k1.metric("Proiecte", k["count"])
+    k2.metric("Progres mediu", k["progress_avg"])
+    k3.metric("Valoare totală", k["value_sum"])
+    k4.metric("În lucru acum", k["active_now"])
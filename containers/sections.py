@@ -1,7 +1,6 @@
 # containers/sections.py
 from __future__ import annotations
 
-import base64
 import re
 from datetime import datetime
 from pathlib import Path
@@ -10,7 +9,13 @@ from typing import List, Optional, Tuple
 import pandas as pd
 import streamlit as st
 
-from utils.data_loader import data, PROJECTS_XLSX
+from utils.attachments import attachments
+from utils.perf import timed
+from utils.data_loader import data, PROJECTS_XLSX, SECTIONS
+from utils.section_queues import queues
+from utils.image_compress import queue_uploads
+from utils.uploads import UploadTooLarge
+from components.previews import forget_upload_previews, preview_uploads, show_image, show_pdf
 
 APP_ROOT = Path(__file__).resolve().parents[1]
 ATTACH_DIR = APP_ROOT / "attachments"
@@ -42,35 +47,20 @@ def _parse_sections(row: pd.Series) -> Tuple[List[str], List[int]]:
         out = out[: len(secs)]
     return secs, out
 
-def _save_files(files, proj_id: str, section: str) -> List[str]:
-    paths: List[str] = []
-    if not files:
-        return paths
-    t = ATTACH_DIR / str(proj_id) / section
-    t.mkdir(parents=True, exist_ok=True)
-    for f in files:
-        name = f.name.replace("/", "_").replace("\\", "_")
-        with open(t / name, "wb") as out:
-            out.write(f.getbuffer())
-        paths.append(str((t / name).relative_to(APP_ROOT)))
+def _save_files(files, proj_id: str, section: str, uploader: str = "", visible_all: bool = False) -> List[str]:
+    paths = attachments.store(files, str(proj_id), section, uploader, visible_all)
+    queue_uploads(paths)
     return paths
 
 def _render_attachment(path: Path):
     if not path.exists():
         return
     if path.suffix.lower() in (".png", ".jpg", ".jpeg", ".webp"):
-        st.image(str(path), caption=path.name, use_container_width=True)
+        show_image(path)
     elif path.suffix.lower() == ".pdf":
-        try:
-            with open(path, "rb") as fh:
-                b64 = base64.b64encode(fh.read()).decode("utf-8")
-            st.markdown(
-                f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="320" style="border:0;border-radius:8px;"></iframe>',
-                unsafe_allow_html=True,
-            )
-        except Exception:
-            st.write(path.name)
+        show_pdf(path)
 
+@timed("excel.sections_append_note")
 def _append_note(row_idx: int, section: str, note: str, files_saved: List[str], user_name: str, visible_all: bool):
     try:
         df = pd.read_excel(PROJECTS_XLSX, sheet_name="Proiecte", engine="openpyxl")
@@ -82,9 +72,9 @@ def _append_note(row_idx: int, section: str, note: str, files_saved: List[str],
     entry = f"[UPD][{now}][USER:{user_name}][SEC:{section}][ALL:{1 if visible_all else 0}] {note.strip()} | FILES: {files_str}"
     prev = str(df.at[row_idx, "notes"]) if "notes" in df.columns and pd.notna(df.at[row_idx, "notes"]) else ""
     df.at[row_idx, "notes"] = (prev + ("\n" if prev else "") + entry).strip()
-    with pd.ExcelWriter(PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
-        df.to_excel(xlw, sheet_name="Proiecte", index=False)
+    data.write_projects(df, changed_ids=[str(df.at[row_idx, "id"])])
 
+@timed("excel.sections_update_progress")
 def _update_progress(proj_id: str, section: str, new_prog: int, note: str, files_saved: List[str], user_name: str, visible_all: bool):
     """Actualizează progresul secției și progress_overall în data/proiecte.xlsx."""
     try:
@@ -120,8 +110,7 @@ def _update_progress(proj_id: str, section: str, new_prog: int, note: str, files
     prev_notes = str(df.at[i, "notes"]) if "notes" in df.columns and pd.notna(df.at[i, "notes"]) else ""
     df.at[i, "notes"] = (prev_notes + ("\n" if prev_notes else "") + entry).strip()
 
-    with pd.ExcelWriter(PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
-        df.to_excel(xlw, sheet_name="Proiecte", index=False)
+    data.write_projects(df, changed_ids=[str(proj_id)])
 
 def _normalize_users_df(dfu: Optional[pd.DataFrame]) -> pd.DataFrame:
     """Asigură că există coloanele minime pentru utilizatori."""
@@ -176,6 +165,11 @@ def render(ctx=None, **kwargs):
 
     st.markdown("## 🏭 Secțiuni — Board operator")
 
+    view = st.radio("Vizualizare", ["Pe proiect", "Coadă pe secție"], horizontal=True, key="sec_view")
+    if view == "Coadă pe secție":
+        _render_queue()
+        return
+
     dfp = data.projects.copy()
     dfu = _normalize_users_df(data.users.copy() if hasattr(data, "users") else None)
 
@@ -267,30 +261,18 @@ def render(ctx=None, **kwargs):
                     visible_all = st.checkbox("Vizibil pentru toate secțiile", value=False, key=f"vis_{sec_key}")
                     if files:
                         st.caption("Previzualizări:")
-                        for f in files[:2]:
-                            name = f.name.lower()
-                            if any(name.endswith(ext) for ext in (".png",".jpg",".jpeg",".webp")):
-                                st.image(f, use_container_width=True)
-                            elif name.endswith(".pdf"):
-                                try:
-                                    b64 = base64.b64encode(f.getvalue()).decode("utf-8")
-                                    st.markdown(
-                                        f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="180" style="border:0;"></iframe>',
-                                        unsafe_allow_html=True,
-                                    )
-                                except Exception:
-                                    pass
+                    preview_uploads((files or [])[:2], owner=f"files_{sec_key}", height=180)
 
                 # --- COL C: atașamente + istoric
                 with c:
                     st.caption("Atașamente salvate")
-                    att_dir = ATTACH_DIR / str(proj_id) / sec
                     found = False
-                    if att_dir.exists():
-                        for sub in sorted(att_dir.glob("*")):
-                            if sub.suffix.lower() in (".png",".jpg",".jpeg",".webp",".pdf"):
-                                found = True
-                                _render_attachment(sub)
+                    for _, att in attachments.for_section(str(proj_id), sec).iterrows():
+                        if att["mime"].startswith("image/") or att["mime"] == "application/pdf":
+                            found = True
+                            if att["section"] != sec:
+                                st.caption(f"din {att['section']} (vizibil tuturor)")
+                            _render_attachment(APP_ROOT / att["path"])
                     if not found:
                         st.caption("_Niciun fișier salvat încă._")
 
@@ -301,13 +283,17 @@ def render(ctx=None, **kwargs):
                 c1, c2, _ = st.columns([1, 1, 2])
                 with c1:
                     if st.button("💾 Salvează", key=f"save_{sec_key}"):
-                        saved_paths = _save_files(files, str(proj_id), sec)
                         user_name = st.session_state.get("auth_name") or st.session_state.get("current_user_name") or "User"
+                        try:
+                            saved_paths = _save_files(files, str(proj_id), sec, user_name, bool(visible_all))
+                        except UploadTooLarge as e:
+                            st.error(str(e))
+                            st.stop()
+                        forget_upload_previews(f"files_{sec_key}")
                         assign_info = ""
                         if rname or part_sel:
                             assign_info = f" | ASSIGN: resp={rname or '-'}; parts={', '.join(part_sel) if part_sel else '-'}"
                         _update_progress(str(proj_id), sec, int(new_prog), (note or "") + assign_info, saved_paths, user_name, bool(visible_all))
-                        data.refresh()
                         st.session_state["last_section_key"] = sec_key
                         st.success("Modificările au fost salvate.")
                         st.experimental_rerun()
@@ -335,6 +321,24 @@ def render(ctx=None, **kwargs):
                             st.session_state["last_section_key"] = sec_key
                             st.experimental_rerun()
 
+def _render_queue():
+    """Coada secției: primele N lucrări deschise din toate proiectele."""
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        sec = st.selectbox("Secție", SECTIONS, key="queue_section")
+    with c2:
+        top_n = st.number_input("Primele N", min_value=1, max_value=200, value=15, step=5, key="queue_n")
+    q = queues.top(sec, int(top_n))
+    st.caption(f"{queues.size(sec)} lucrări deschise în «{sec}» · ordonate după termen secție, risc, progres")
+    if q.empty:
+        st.info("Nu există lucrări deschise pentru această secție.")
+        return
+    st.dataframe(
+        q.rename(columns={"id": "Proiect", "name": "Nume", "deadline": "Termen secție",
+                          "days_left": "Zile rămase", "progress": "Progres %", "risk": "Risc proiect"}),
+        hide_index=True, use_container_width=True,
+    )
+
 def _history_for_section(notes: str, section: str, limit: int = 6) -> List[str]:
     if not notes:
         return []
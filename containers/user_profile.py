@@ -1,7 +1,7 @@
 # containers/user_profile.py
 from __future__ import annotations
 
-import base64, re
+import re
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -10,7 +10,13 @@ import numpy as np
 import pandas as pd
 import streamlit as st
 
+from utils.attachments import attachments
+from utils.perf import timed
 from utils.data_loader import data, PROJECTS_XLSX
+from utils.image_compress import queue_uploads
+from utils.uploads import UploadTooLarge, save_upload
+from components.gallery import render_gallery
+from components.previews import forget_upload_previews, preview_uploads
 
 APP_ROOT = Path(__file__).resolve().parents[1]
 AVATAR_DIR = APP_ROOT / "assets" / "avatars"
@@ -42,34 +48,11 @@ def _proj_sections_and_progress(row: pd.Series) -> Tuple[List[str], List[int]]:
         prog = prog[: len(secs)]
     return secs, prog
 
-def _save_files(files, proj_id: str, section: str) -> List[str]:
-    saved = []
-    if not files:
-        return saved
-    target = ATTACH_DIR / proj_id / section
-    target.mkdir(parents=True, exist_ok=True)
-    for f in files:
-        fname = f.name.replace("/", "_").replace("\\", "_")
-        with open(target / fname, "wb") as out:
-            out.write(f.getbuffer())
-        saved.append(str((target / fname).relative_to(APP_ROOT)))
+def _save_files(files, proj_id: str, section: str, uploader: str = "", visible_all: bool = False) -> List[str]:
+    saved = attachments.store(files, proj_id, section, uploader, visible_all)
+    queue_uploads(saved)
     return saved
 
-def _preview_upload(file):
-    if not file:
-        return
-    name = file.name.lower()
-    if any(name.endswith(ext) for ext in (".png", ".jpg", ".jpeg", ".webp")):
-        st.image(file, caption=file.name, use_container_width=True)
-    elif name.endswith(".pdf"):
-        b64 = base64.b64encode(file.getvalue()).decode("utf-8")
-        st.markdown(
-            f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="320" style="border:1px solid #bbb;border-radius:8px;"></iframe>',
-            unsafe_allow_html=True,
-        )
-    else:
-        st.info(f"Fișier încărcat: {file.name}")
-
 def _user_projects(dfp: pd.DataFrame, user_name: str, user_sections: List[str]) -> pd.DataFrame:
     if dfp is None or dfp.empty:
         return pd.DataFrame()
@@ -112,6 +95,7 @@ def _classify_deliveries_for_user(df: pd.DataFrame) -> Dict[str, int]:
     critical = int((d["delay"] > 3).sum())
     return {"ontime": ontime, "delay_2_3": delay_2_3, "critical": critical, "delivered": len(d)}
 
+@timed("excel.profile_update_section")
 def _update_section_status(proj_id: str, section: str, new_progress: int, note: str, files_saved: List[str], visible_all: bool, user_name: str) -> None:
     try:
         df = pd.read_excel(PROJECTS_XLSX, sheet_name="Proiecte", engine="openpyxl")
@@ -145,9 +129,9 @@ def _update_section_status(proj_id: str, section: str, new_progress: int, note:
     prev_notes = str(df.at[i, "notes"]) if pd.notna(df.at[i, "notes"]) else ""
     df.at[i, "notes"] = (prev_notes + ("\n" if prev_notes else "") + entry).strip()
 
-    with pd.ExcelWriter(PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
-        df.to_excel(xlw, sheet_name="Proiecte", index=False)
+    data.write_projects(df, changed_ids=[str(proj_id)])
 
+@timed("excel.profile_mark_delivered")
 def _mark_project_delivered(proj_id: str) -> None:
     try:
         df = pd.read_excel(PROJECTS_XLSX, sheet_name="Proiecte", engine="openpyxl")
@@ -167,8 +151,7 @@ def _mark_project_delivered(proj_id: str) -> None:
     tag = f"DELIVERED_ON: {date.today().isoformat()}"
     if tag not in prev_notes:
         df.at[i, "notes"] = (prev_notes + ("\n" if prev_notes else "") + tag).strip()
-    with pd.ExcelWriter(PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
-        df.to_excel(xlw, sheet_name="Proiecte", index=False)
+    data.write_projects(df, changed_ids=[str(proj_id)])
 
 # ---------- UI ----------
 def render(ctx=None, **kwargs):
@@ -218,9 +201,11 @@ def render(ctx=None, **kwargs):
             st.markdown("_(fără avatar)_")
         up = st.file_uploader("Încarcă avatar", type=["png","jpg","jpeg","webp"], key="up_avatar")
         if up is not None:
-            with open(av_path, "wb") as f:
-                f.write(up.getvalue())
-            st.success("Avatar actualizat. Reîncarcă pagina dacă nu se vede imediat.")
+            try:
+                save_upload(up, av_path)
+                st.success("Avatar actualizat. Reîncarcă pagina dacă nu se vede imediat.")
+            except UploadTooLarge as e:
+                st.error(str(e))
 
     with colB:
         st.markdown(f"### {user_name}")
@@ -293,10 +278,14 @@ def render(ctx=None, **kwargs):
             note = st.text_area(f"Adnotare ({sec})", key=f"up_note_{proj_id}_{sec}", height=90, placeholder="Observații pentru această secție…")
             files = st.file_uploader(f"Documente ({sec})", type=["png","jpg","jpeg","webp","pdf"], accept_multiple_files=True, key=f"up_files_{proj_id}_{sec}")
             vis_all = st.checkbox("Vizibil pentru toate secțiile", value=False, key=f"up_all_{proj_id}_{sec}")
-            if files:
-                for f in files: _preview_upload(f)
+            preview_uploads(files, owner=f"up_files_{proj_id}_{sec}")
             if st.button(f"💾 Salvează {sec}", key=f"save_{proj_id}_{sec}"):
-                saved = _save_files(files, proj_id, sec)
+                try:
+                    saved = _save_files(files, proj_id, sec, user_name, vis_all)
+                except UploadTooLarge as e:
+                    st.error(str(e))
+                    st.stop()
+                forget_upload_previews(f"up_files_{proj_id}_{sec}")
                 _update_section_status(proj_id, sec, new_prog, note, saved, vis_all, user_name)
                 st.success("Actualizat.")
                 st.experimental_rerun()
@@ -310,25 +299,4 @@ def render(ctx=None, **kwargs):
             st.success("Proiect marcat ca livrat. KPI-urile se vor actualiza.")
             st.experimental_rerun()
 
-    st.markdown("### 📎 Atașamente proiect")
-    att_dir = ATTACH_DIR / proj_id
-    listed = False
-    if att_dir.exists():
-        st.caption("Fișiere (listare din sistemul de fișiere proiect):")
-        for sub in sorted(att_dir.glob("**/*")):
-            if sub.is_file() and sub.suffix.lower() in (".png",".jpg",".jpeg",".webp",".pdf"):
-                listed = True
-                if sub.suffix.lower() == ".pdf":
-                    try:
-                        with open(sub, "rb") as fh:
-                            b64 = base64.b64encode(fh.read()).decode("utf-8")
-                        st.markdown(
-                            f'<div style="border:1px solid #e5e7eb;border-radius:8px;margin:4px 0;"><div style="padding:6px 8px;background:#f9fafb;">{sub.name}</div><iframe src="data:application/pdf;base64,{b64}" width="100%" height="280" style="border:0;"></iframe></div>',
-                            unsafe_allow_html=True,
-                        )
-                    except Exception:
-                        st.write(sub.name)
-                else:
-                    st.image(str(sub), caption=sub.name, use_container_width=True)
-    if not listed:
-        st.caption("_Nu sunt atașamente salvate încă._")
+    render_gallery(proj_id, key=f"gal_{proj_id}", title="### 📎 Atașamente proiect")
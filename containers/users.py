@@ -1,7 +1,6 @@
 # containers/users.py
 from __future__ import annotations
 
-import base64
 import re
 from io import BytesIO
 from pathlib import Path
@@ -10,7 +9,10 @@ from typing import Optional
 import pandas as pd
 import streamlit as st
 
+from components.previews import preview_upload
 from utils.data_loader import data
+from utils.perf import timed
+from utils.uploads import UploadTooLarge, save_upload
 
 # --- Căi & fișiere ---
 APP_ROOT = Path(__file__).resolve().parents[1]
@@ -69,6 +71,7 @@ def _read_users() -> pd.DataFrame:
         df = pd.DataFrame(columns=USERS_COLS)
     return _ensure_users_schema(df)
 
+@timed("excel.write_users")
 def _write_users(df: pd.DataFrame) -> None:
     df = _ensure_users_schema(df)
     DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -81,17 +84,7 @@ def _next_user_id(df: pd.DataFrame) -> int:
     return int(pd.to_numeric(df["id"], errors="coerce").fillna(0).max()) + 1
 
 def _preview_upload(file):
-    if not file:
-        return
-    name = file.name.lower()
-    if any(name.endswith(ext) for ext in (".png", ".jpg", ".jpeg", ".webp")):
-        st.image(file, caption=file.name, use_container_width=True)
-    elif name.endswith(".pdf"):
-        b64 = base64.b64encode(file.getvalue()).decode("utf-8")
-        st.markdown(
-            f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="320" style="border:1px solid #bbb;border-radius:8px;"></iframe>',
-            unsafe_allow_html=True,
-        )
+    preview_upload(file, height=320)
 
 def _download_excel(df: pd.DataFrame, filename: str, sheet: str = "Sheet1"):
     buf = BytesIO()
@@ -127,6 +120,7 @@ def _load_roles() -> pd.DataFrame:
             df[k] = False
     return df[["role"] + PERM_KEYS].copy()
 
+@timed("excel.save_roles")
 def _save_roles(df: pd.DataFrame) -> None:
     df = df.copy()
     for k in PERM_KEYS:
@@ -211,9 +205,11 @@ def render(ctx=None, **kwargs):
                         "Încarcă avatar", type=["png", "jpg", "jpeg", "webp"], key=f"up_{sel}"
                     )
                     if up is not None:
-                        with open(avp, "wb") as f:
-                            f.write(up.getvalue())
-                        st.success("Avatar salvat.")
+                        try:
+                            save_upload(up, avp)
+                            st.success("Avatar salvat.")
+                        except UploadTooLarge as e:
+                            st.error(str(e))
                 with colB:
                     name = st.text_input("Nume complet", value=str(u["name"]))
                     email = st.text_input("Email", value=str(u["email"]))
@@ -291,8 +287,10 @@ def render(ctx=None, **kwargs):
                     df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
                     _write_users(df)
                     if avatar_new is not None:
-                        with open(_avatar_path(email_new, name_new), "wb") as f:
-                            f.write(avatar_new.getvalue())
+                        try:
+                            save_upload(avatar_new, _avatar_path(email_new, name_new))
+                        except UploadTooLarge as e:
+                            st.error(str(e))
                     data.refresh()
                     st.success(f"Utilizatorul #{new_id} a fost creat.")
 
@@ -1,15 +1,19 @@
 # streamlit_app.py
 from __future__ import annotations
 
+import importlib
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 import streamlit as st
 
 # ---------------- Page config ----------------
 st.set_page_config(page_title="Project Planner AI Generator", layout="wide")
 APP_ROOT = Path(__file__).resolve().parent
 
+from utils import perf
+RUN_ID = perf.begin_run()
+
 # ---------------- Helpers ----------------
 def _find_logo() -> Optional[Path]:
     for p in [
@@ -28,43 +32,35 @@ def _fallback(msg: str):
         st.info(msg)
     return _r
 
-# ---------------- Containers (nemodificate) ----------------
-try:
-    from containers import dashboard
-except Exception:
-    dashboard = type("X",(object,),{"render": staticmethod(_fallback("Dashboard-ul nu este disponibil."))})
-try:
-    from containers import overview
-except Exception:
-    overview = type("X",(object,),{"render": staticmethod(_fallback("Vederea generală nu este disponibilă."))})
-try:
-    from containers import sections
-except Exception:
-    sections = type("X",(object,),{"render": staticmethod(_fallback("Secțiunile nu sunt disponibile."))})
-try:
-    from containers import new_order
-except Exception:
-    new_order = type("X",(object,),{"render": staticmethod(_fallback("Comanda nouă nu este disponibilă."))})
-try:
-    from containers import users
-except Exception:
-    users = type("X",(object,),{"render": staticmethod(_fallback("Administrarea utilizatorilor nu este disponibilă."))})
-try:
-    from containers import user_profile
-except Exception:
-    user_profile = type("X",(object,),{"render": staticmethod(_fallback("Profilul utilizatorului nu este disponibil."))})
-try:
-    from containers import data_check
-except Exception:
-    data_check = type("X",(object,),{"render": staticmethod(_fallback("Verificarea de date va fi disponibilă în curând."))})
-try:
-    from containers import help
-except Exception:
-    help = type("X",(object,),{"render": staticmethod(_fallback("Ajutorul nu este disponibil în această versiune."))})
+# ---------------- Containers (încărcate la prima deschidere a rutei) ----------------
+class _LazyRoute:
+    """render() al unei pagini; modulul din containers/ se importă la primul apel."""
+
+    def __init__(self, module: str, fallback_msg: str) -> None:
+        self.module = module
+        self.fallback_msg = fallback_msg
+        self._render: Optional[Callable] = None
+
+    def _resolve(self) -> Callable:
+        if self._render is None:
+            try:
+                with perf.span(f"import.{self.module}"):
+                    mod = importlib.import_module(f"containers.{self.module}")
+                self._render = getattr(mod, "render", _fallback(self.fallback_msg))
+            except Exception:
+                self._render = _fallback(self.fallback_msg)
+        return self._render
+
+    def __call__(self, *args, **kwargs):
+        render = self._resolve()
+        with perf.span(f"route.{self.module}"):
+            return render(*args, **kwargs)
 
 # ---------------- Data ctx ----------------
 try:
     from utils import data_loader
+    from utils import progress_history  # noqa: F401  (hook: istoric progres la fiecare salvare)
+    from utils import section_queues  # noqa: F401  (hook: cozi pe secție la fiecare salvare)
     class Ctx: ...
     ctx = Ctx()
     ctx.data = data_loader.data
@@ -73,14 +69,14 @@ except Exception:
 
 # ---------------- Rute (ordine curentă) ----------------
 ROUTES = {
-    "Dashboard": dashboard.render,
-    "Vedere generală": overview.render,
-    "Secțiuni": sections.render,
-    "Profil utilizator": user_profile.render,
-    "Comandă nouă": new_order.render,
-    "Utilizatori": users.render,
-    "Verificare date": getattr(data_check, "render", _fallback("Verificarea de date ...")),
-    "Ajutor": help.render,
+    "Dashboard": _LazyRoute("dashboard", "Dashboard-ul nu este disponibil."),
+    "Vedere generală": _LazyRoute("overview", "Vederea generală nu este disponibilă."),
+    "Secțiuni": _LazyRoute("sections", "Secțiunile nu sunt disponibile."),
+    "Profil utilizator": _LazyRoute("user_profile", "Profilul utilizatorului nu este disponibil."),
+    "Comandă nouă": _LazyRoute("new_order", "Comanda nouă nu este disponibilă."),
+    "Utilizatori": _LazyRoute("users", "Administrarea utilizatorilor nu este disponibilă."),
+    "Verificare date": _LazyRoute("data_check", "Verificarea de date va fi disponibilă în curând."),
+    "Ajutor": _LazyRoute("help", "Ajutorul nu este disponibil în această versiune."),
 }
 PAGES = list(ROUTES.keys())
 
@@ -153,6 +149,7 @@ with st.sidebar:
     st.caption("Versiune aplicație: v20")
     st.caption("Logo: " + ("OK" if _find_logo() else "lipsește"))
     st.caption("Autentificat: " + ("DA" if st.session_state.get("auth") else "NU"))
+    perf_slot = st.container()  # completat după randarea paginii (include rerun-ul curent)
 
 # ---------------- HEADER ÎN CARD ----------------
 with st.container():
@@ -251,5 +248,23 @@ st.session_state["page_key"] = choice
 
 # ---------------- PAGE WRAPPER: card global pentru orice pagină ----------------
 st.markdown('<div class="page-card">', unsafe_allow_html=True)
-ROUTES.get(st.session_state["page_key"], dashboard.render)(ctx)
+try:
+    ROUTES.get(st.session_state["page_key"], ROUTES["Dashboard"])(ctx)
+finally:
+    perf.end_run()  # și la st.stop() / st.rerun() din pagină
 st.markdown('</div>', unsafe_allow_html=True)
+
+# ---------------- Sidebar: performanță (span-uri per rerun) ----------------
+with perf_slot:
+    with st.expander("⏱️ Performanță", expanded=False):
+        cur = perf.spans_frame(RUN_ID)
+        total = cur.loc[cur["name"] == "rerun", "ms"]
+        st.caption(f"Rerun #{RUN_ID}: {float(total.iloc[0]) if len(total) else 0:.0f} ms")
+        if not cur.empty:
+            cur = cur[cur["name"] != "rerun"].sort_values("ms", ascending=False)
+            st.dataframe(cur[["name", "ms", "depth"]].head(15), use_container_width=True, hide_index=True)
+        st.caption("Cele mai lente (de la pornire)")
+        st.dataframe(perf.slowest(10), use_container_width=True, hide_index=True)
+        # CSV-ul se generează doar la click (data ca funcție)
+        st.download_button("⬇️ Export CSV", data=perf.spans_csv, file_name="perf_spans.csv",
+                           mime="text/csv", key="perf_csv")
@@ -0,0 +1,37 @@
+# tests/conftest.py
+from __future__ import annotations
+"""
+Fixture comună: un AppData nou peste copii ale registrelor din data/, în tmp_path.
+
+– Căile modulului (DATA_DIR, PROJECTS_XLSX, PERSONAL_XLSX) și singleton-ul «data» sunt
+  înlocuite doar pe durata testului; fișierele reale din data/ nu se ating.
+– **parses** numără citirile complete ale foii «Proiecte» (_load_projects).
+"""
+
+import shutil
+
+import pytest
+
+from utils import data_loader as dl
+
+@pytest.fixture
+def app_data(tmp_path, monkeypatch):
+    for src in (dl.PROJECTS_XLSX, dl.PERSONAL_XLSX):
+        shutil.copy(src, tmp_path / src.name)
+    monkeypatch.setattr(dl, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(dl, "PROJECTS_XLSX", tmp_path / dl.PROJECTS_XLSX.name)
+    monkeypatch.setattr(dl, "PERSONAL_XLSX", tmp_path / dl.PERSONAL_XLSX.name)
+
+    parses = []
+    load = dl.AppData._load_projects
+
+    def counting_load(self):
+        parses.append(1)
+        return load(self)
+
+    monkeypatch.setattr(dl.AppData, "_load_projects", counting_load)
+    app = dl.AppData()
+    app.parses = parses
+    monkeypatch.setattr(dl, "data", app)
+    monkeypatch.setattr(dl, "_FRAMES_CACHE", {"key": None, "frames": None, "sections": None})
+    return app
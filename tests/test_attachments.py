@@ -0,0 +1,88 @@
+# tests/test_attachments.py
+from __future__ import annotations
+
+import io
+import os
+import time
+
+import pytest
+
+from utils import attachments as att
+
+class _Upload(io.BytesIO):
+    """Ce primește store() de la st.file_uploader: nume, dimensiune, read/seek."""
+
+    def __init__(self, name: str, payload: bytes) -> None:
+        super().__init__(payload)
+        self.name = name
+        self.size = len(payload)
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(att, "APP_ROOT", tmp_path)  # căile din index sunt relative la aplicație
+    root = tmp_path / "attachments"
+    root.mkdir()
+    return att.AttachmentIndex(tmp_path / "att.sqlite", root)
+
+def test_gc_keeps_recent_tmp_files(index, tmp_path):
+    blobs = index.root / "_blobs"
+    (blobs / "ab").mkdir(parents=True)
+    writing = blobs / ".upload-in-progress.tmp"
+    writing.write_bytes(b"partial")
+    stale = blobs / "ab" / "abandoned.tmp"
+    stale.write_bytes(b"old")
+    old = time.time() - 2 * att.TMP_GRACE_S
+    os.utime(stale, (old, old))
+
+    result = index.gc(published_dir=tmp_path / "static")
+
+    assert writing.exists()
+    assert not stale.exists()
+    assert result["blobs_removed"] == 1
+
+def test_scan_keeps_compression_and_uploader_columns(index):
+    saved = index.store([_Upload("plan.png", b"\x89PNG original")], "P-TEST", "CTC", uploader="ana")
+    sha = index.list(project="P-TEST")["sha256"].iloc[0]
+    index.record_compression(sha, "f" * 64, 5)
+    with att.closing(index._connect()) as con, con:  # conținutul de pe disc e «varianta comprimată»
+        con.execute("UPDATE attachments SET sha256 = ? WHERE path = ?", (att.file_sha256(att.APP_ROOT / saved[0]), saved[0]))
+
+    index.scan()
+
+    row = index.list(project="P-TEST").iloc[0]
+    assert row["path"] == saved[0]
+    assert row["orig_size"] == len(b"\x89PNG original")
+    with att.closing(index._connect()) as con:
+        uploader, orig_sha = con.execute("SELECT uploader, orig_sha256 FROM attachments WHERE path = ?", (saved[0],)).fetchone()
+    assert (uploader, orig_sha) == ("ana", sha)
+
+def test_scan_drops_rows_of_deleted_files(index):
+    saved = index.store([_Upload("a.pdf", b"%PDF a"), _Upload("b.pdf", b"%PDF b")], "P-TEST", "CTC")
+    (att.APP_ROOT / saved[0]).unlink()
+
+    index.scan()
+
+    assert index.list(project="P-TEST")["path"].tolist() == [saved[1]]
+
+def test_upload_during_compression_of_same_content(index, tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    np = pytest.importorskip("numpy")
+    from concurrent.futures import ThreadPoolExecutor
+
+    from utils import image_compress
+
+    monkeypatch.setattr(image_compress, "attachments", index)
+    monkeypatch.setattr(image_compress, "APP_ROOT", tmp_path)
+    buf = io.BytesIO()
+    Image.fromarray(np.random.default_rng(1).integers(0, 255, (900, 1400, 3), dtype=np.uint8)).save(buf, "JPEG", quality=98)
+    photo = buf.getvalue()
+    first = index.store([_Upload("poza.jpg", photo)], "P-TEST", "CTC")[0]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        compressing = pool.submit(image_compress.compress_image, tmp_path / first)
+        uploads = [pool.submit(index.store, [_Upload("poza.jpg", photo)], "P-TEST", f"S{i}") for i in range(6)]
+        paths = [p for u in uploads for p in u.result()] + [first]
+        assert compressing.result() is not None
+
+    for p in paths:
+        assert (tmp_path / p).stat().st_size > 0
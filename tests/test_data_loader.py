@@ -0,0 +1,109 @@
+# tests/test_data_loader.py
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from utils import data_loader as dl
+
+def _external_write(df: pd.DataFrame) -> None:
+    """Scriere din afara AppData (alt proces / Excel deschis de mână)."""
+    with pd.ExcelWriter(dl.PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
+        df.to_excel(xlw, sheet_name=dl.SHEET_PROJECTS, index=False)
+
+def test_write_projects_visible_without_reparse(app_data):
+    df = app_data.projects.copy()
+    v0 = app_data.version
+    pid = str(df.loc[0, "id"])
+    df.loc[0, "name"] = "Proiect redenumit"
+
+    app_data.write_projects(df, changed_ids=[pid])
+
+    assert app_data.version == v0 + 1
+    assert app_data.projects.loc[app_data.projects["id"] == pid, "name"].iloc[0] == "Proiect redenumit"
+    assert len(app_data.parses) == 1  # doar citirea inițială
+
+def test_external_write_reparses_once(app_data):
+    df = app_data.projects.copy()
+    v0 = app_data.version
+
+    _external_write(df.head(2))
+
+    # versiunea se schimbă înainte de orice citire a tabelelor (cheile cache-urilor derivate)
+    assert app_data.version == v0 + 1
+    assert len(app_data.projects) == 2
+    assert len(app_data.projects) == 2
+    assert len(app_data.parses) == 2
+
+def test_load_dataframes_sees_external_write(app_data):
+    n = len(dl.load_dataframes()[0])
+
+    _external_write(app_data.projects.head(2))
+
+    assert n > 2
+    assert len(dl.load_dataframes()[0]) == 2
+
+def test_dashboard_base_frame_sees_external_write(app_data, monkeypatch):
+    from containers import dashboard
+
+    monkeypatch.setattr(dashboard, "data", app_data)
+    monkeypatch.setattr(dashboard, "_BASE_CACHE", {})
+    n = len(dashboard._base_frame(app_data.version)[0])
+
+    _external_write(app_data.projects.head(2))
+
+    assert n > 2
+    assert len(dashboard._base_frame(app_data.version)[0]) == 2
+
+def test_kpi_counts_duplicated_ids_like_the_frame(app_data):
+    df = app_data.projects
+    dup = pd.concat([df, df.head(1)], ignore_index=True)
+
+    kpi = dl.KpiAggregates.from_frame(dup)
+
+    assert kpi.count == len(dup)
+    assert kpi.value_sum == pytest.approx(pd.to_numeric(dup["value"], errors="coerce").sum())
+    assert kpi.progress_avg == round(pd.to_numeric(dup["progress_overall"], errors="coerce").mean(), 1)
+
+def test_kpi_deltas_match_full_recompute(app_data):
+    df = app_data.projects.copy()
+    assert app_data.kpi_consistent()
+
+    # inserare (proiect nou, întârziat)
+    new = df.iloc[[0]].copy()
+    new["id"], new["value"], new["progress_overall"], new["end"] = "P-TEST-1", 1234.5, 10.0, "2020-01-01"
+    df = pd.concat([df, new], ignore_index=True)
+    app_data.write_projects(df, changed_ids=["P-TEST-1"])
+    assert app_data.kpi_consistent()
+
+    # modificare (valoare, progres, secții, responsabil)
+    pid = str(df.loc[1, "id"])
+    df.loc[1, ["value", "progress_overall", "sections", "responsible"]] = [1.0, 100.0, "Ofertare", "Alt responsabil"]
+    app_data.write_projects(df, changed_ids=[pid])
+    assert app_data.kpi_consistent()
+
+    # ștergere
+    gone = str(df.loc[0, "id"])
+    df = df[df["id"] != gone].reset_index(drop=True)
+    app_data.write_projects(df, changed_ids=[gone])
+    assert app_data.kpi_consistent()
+
+    # id duplicat adăugat, apoi eliminat
+    df = pd.concat([df, df.iloc[[0]]], ignore_index=True)
+    app_data.write_projects(df, changed_ids=[str(df.loc[0, "id"])])
+    assert app_data.kpi_consistent()
+    df = df.iloc[:-1]
+    app_data.write_projects(df, changed_ids=[str(df.loc[0, "id"])])
+    assert app_data.kpi_consistent()
+
+    assert len(app_data.parses) == 1  # toate deltele, fără re-parsare
+
+def test_failing_write_hook_is_logged(app_data, caplog):
+    def broken(df, changed_ids):
+        raise RuntimeError("hook stricat")
+
+    app_data.add_write_hook(broken)
+    df = app_data.projects.copy()
+    app_data.write_projects(df, changed_ids=[str(df.loc[0, "id"])])
+
+    assert "hook stricat" in caplog.text
@@ -0,0 +1,25 @@
+# tests/test_paint_scheduler.py
+from __future__ import annotations
+
+import json
+from datetime import date
+
+import pandas as pd
+
+from utils.configurator import CONFIG_TAG
+from utils.paint_scheduler import PAINT_SECTION, collect_demands
+
+def _row(pid: str, notes_extra: str = "") -> dict:
+    cfg = {"items": [{"type": "Corp", "H": 2000, "L": 800, "D": 600, "units": 2,
+                      "paint_pct": 100, "paint_finish": "Mat"}]}
+    return {
+        "id": pid, "name": pid, "sections": PAINT_SECTION,
+        "section_deadlines": f"{PAINT_SECTION}: 2026-10-20",
+        "sections_progress": "20",
+        "notes": f"{CONFIG_TAG} {json.dumps(cfg)}{notes_extra}",
+    }
+
+def test_delivered_projects_take_no_booth_cycles():
+    df = pd.DataFrame([_row("P-1"), _row("P-2", "\nDELIVERED_ON: 2026-10-18")])
+    demands = collect_demands(df, date(2026, 10, 19), 7)
+    assert [d.project_id for d in demands] == ["P-1"]
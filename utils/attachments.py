@@ -0,0 +1,512 @@
+# utils/attachments.py
+from __future__ import annotations
+"""
+Index persistent al atașamentelor (data/attachments.sqlite).
+
+– Un rând per fișier: proiect, secție, cale (relativă la aplicație), dimensiune, tip MIME,
+  SHA-256, cine l-a încărcat, când și dacă e «vizibil pentru toate secțiile».
+– Helper-ele de salvare (Secțiuni, Profil, Comandă nouă) apelează **attachments.add()**;
+  galeriile citesc din index (**attachments.list()**) în loc să parcurgă directoarele
+  la fiecare rerun.
+– La prima folosire (index gol) se importă fișierele existente din attachments/, cu
+  autorul și vizibilitatea luate din manifestele «FILES:» din notes.
+– O conexiune SQLite per apel: sigur din thread-urile Streamlit, fără stare partajată.
+– Stocare după conținut: fiecare fișier unic e un blob attachments/_blobs/<sha[:2]>/<sha><ext>,
+  iar attachments/<proiect>/<secție>/<nume> e un hard link spre el (copie dacă sistemul de
+  fișiere nu permite). Același desen urcat în mai multe secții ocupă o singură dată discul.
+– Un nume existent cu alt conținut nu mai e suprascris: se salvează ca «nume (2).ext».
+– **python -m utils.attachments gc** șterge blob-urile orfane și copiile publicate în
+  static/att/ pentru previzualizări ale unor fișiere care nu au mai fost salvate;
+  **dedup** convertește copiile vechi în link-uri. Ambele raportează spațiul economisit.
+"""
+
+import mimetypes
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_loader import APP_ROOT, DATA_DIR, data
+from utils.thumbnails import file_sha256, remember_sha256
+from utils.uploads import check_upload, stream_upload
+
+ATTACH_DIR = APP_ROOT / "attachments"
+ATTACH_DB = DATA_DIR / "attachments.sqlite"
+BLOBS_DIR = ATTACH_DIR / "_blobs"
+PUBLISHED_DIR = APP_ROOT / "static" / "att"  # servit la «app/static/att/…» (components.previews)
+PUBLISHED_GRACE_S = 24 * 3600  # o previzualizare mai nouă poate fi încă deschisă în pagină
+# plasarea blob-urilor și re-legarea căilor (store și compresia din utils.image_compress):
+# un blob nu poate dispărea între verificarea exists() și os.link
+BLOB_LOCK = threading.Lock()
+TMP_GRACE_S = 3600  # un .tmp modificat mai recent poate fi un upload / o compresie în curs
+
+COLUMNS = ["project", "section", "path", "size", "mime", "sha256", "uploader", "ts", "visible_all", "orig_size"]
+GENERAL_SECTION = "_general"  # atașamentele de proiect fără secție (Comandă nouă)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attachments (
+    path        TEXT PRIMARY KEY,
+    project     TEXT NOT NULL,
+    section     TEXT NOT NULL,
+    size        INTEGER,
+    mime        TEXT,
+    sha256      TEXT,
+    uploader    TEXT,
+    ts          TEXT,
+    visible_all INTEGER NOT NULL DEFAULT 0,
+    orig_size   INTEGER,
+    orig_sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_att_proj_sec ON attachments(project, section);
+CREATE INDEX IF NOT EXISTS ix_att_visible ON attachments(visible_all, project);
+CREATE INDEX IF NOT EXISTS ix_att_sha ON attachments(sha256);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_ADDED_COLUMNS = {"orig_size": "INTEGER", "orig_sha256": "TEXT"}  # indexuri create înainte de compresie
+
+_UPSERT = (
+    "INSERT INTO attachments (path, project, section, size, mime, sha256, uploader, ts, visible_all)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT(path) DO UPDATE SET project = excluded.project, section = excluded.section,"
+    " size = excluded.size, mime = excluded.mime, uploader = excluded.uploader, ts = excluded.ts,"
+    " visible_all = excluded.visible_all,"
+    " orig_size = CASE WHEN sha256 = excluded.sha256 THEN orig_size END,"
+    " orig_sha256 = CASE WHEN sha256 = excluded.sha256 THEN orig_sha256 END,"
+    " sha256 = excluded.sha256"
+)
+
+_MANIFEST_RE = re.compile(r"\[ALL:(\d)\].*\|\s*FILES:\s*(.*)$")
+
+def _migrate(con: sqlite3.Connection) -> None:
+    """Schema curentă, inclusiv coloanele adăugate după primele versiuni ale indexului."""
+    con.executescript(_SCHEMA)
+    have = {r[1] for r in con.execute("PRAGMA table_info(attachments)")}
+    for col, typ in _ADDED_COLUMNS.items():
+        if col not in have:
+            con.execute(f"ALTER TABLE attachments ADD COLUMN {col} {typ}")
+    con.execute("CREATE INDEX IF NOT EXISTS ix_att_orig_sha ON attachments(orig_sha256)")
+
+def _rel(path) -> str:
+    p = Path(path)
+    if p.is_absolute():
+        p = p.resolve().relative_to(APP_ROOT)
+    return p.as_posix()
+
+def _mime(path: Path) -> str:
+    return mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+def _safe_name(name: str) -> str:
+    return str(name).replace("/", "_").replace("\\", "_")
+
+def blob_path(sha: str, suffix: str = "", root: Path = ATTACH_DIR) -> Path:
+    return root / "_blobs" / sha[:2] / f"{sha}{suffix.lower()}"
+
+def link_blob(blob: Path, dst: Path) -> None:
+    """dst devine un hard link spre blob (copie ca fallback), înlocuit atomic."""
+    tmp = dst.with_name(dst.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    try:
+        os.link(blob, tmp)
+    except OSError:
+        shutil.copyfile(blob, tmp)
+    os.replace(tmp, dst)
+
+def _free_name(target: Path, name: str, sha: str) -> Tuple[Path, bool]:
+    """
+    Calea sub care se salvează «name» în «target»: aceeași dacă lipsește sau are deja
+    același conținut (al doilea element = True, nimic de scris), altfel «nume (n).ext».
+    """
+    stem, suffix = Path(name).stem, Path(name).suffix
+    candidate, n = target / name, 1
+    while candidate.exists():
+        if file_sha256(candidate) == sha:
+            return candidate, True
+        n += 1
+        candidate = target / f"{stem} ({n}){suffix}"
+    return candidate, False
+
+def _human(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024.0
+
+def _manifest_info(df: pd.DataFrame) -> Dict[str, Tuple[str, int]]:
+    """Cale -> (autor, vizibil tuturor) din liniile «… [ALL:x] … | FILES: a, b» din notes."""
+    out: Dict[str, Tuple[str, int]] = {}
+    if df is None or df.empty or "notes" not in df:
+        return out
+    for notes in df["notes"].dropna().astype(str):
+        for ln in notes.splitlines():
+            m = _MANIFEST_RE.search(ln)
+            if not m:
+                continue
+            user = ln.split("[USER:", 1)[1].split("]", 1)[0] if "[USER:" in ln else ""
+            for fp in (x.strip() for x in m.group(2).split(",")):
+                if fp:
+                    out[Path(fp).as_posix()] = (user, int(m.group(1)))
+    return out
+
+class AttachmentIndex:
+    """Index SQLite al atașamentelor; citirile sunt interogări pe index, nu glob pe disc."""
+
+    def __init__(self, db_path: Path = ATTACH_DB, root: Path = ATTACH_DIR) -> None:
+        self.db_path = Path(db_path)
+        self.root = Path(root)
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(self.db_path, timeout=10)
+        con.row_factory = sqlite3.Row
+        return con
+
+    def _ensure(self) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            with closing(self._connect()) as con, con:
+                _migrate(con)
+                imported = con.execute("SELECT value FROM meta WHERE key = 'imported'").fetchone()
+            if imported is None:
+                self.scan()
+            self._ready = True
+
+    # --- scriere ------------------------------------------------------------------
+    def store(self, files, project: str, section: Optional[str] = None,
+              uploader: str = "", visible_all: bool = False) -> List[str]:
+        """
+        Salvează fișierele încărcate (st.file_uploader): conținutul într-un blob, numele în
+        attachments/<proiect>/<secție>/ ca link spre blob; le înregistrează în index.
+        Întoarce căile relative la aplicație (cele trecute în «FILES:» din notes).
+        Un original deja comprimat (același SHA-256 în «orig_sha256») refolosește varianta
+        comprimată: nu apare a doua oară ca «nume (2).ext».
+        """
+        saved: List[str] = []
+        originals: List[Tuple[str, str, int]] = []  # (cale, sha original, dimensiune originală)
+        if not files:
+            return saved
+        for f in files:
+            check_upload(f)  # refuzăm tot lotul înainte de a scrie ceva
+        target = self.root / str(project) / (section or GENERAL_SECTION)
+        target.mkdir(parents=True, exist_ok=True)
+        for f in files:
+            up = stream_upload(f, self.root / "_blobs")  # o trecere: copiere + hash + dimensiune
+            name = _safe_name(f.name)
+            with BLOB_LOCK:
+                dst, reused = self._place(up, name, target)
+            saved.append(_rel(dst))
+            if reused:
+                originals.append((saved[-1], up.sha256, up.size))
+        self.add(saved, project, section, uploader, visible_all)
+        if originals:
+            with closing(self._connect()) as con, con:
+                con.executemany("UPDATE attachments SET orig_sha256 = ?, orig_size = ? WHERE path = ?",
+                                [(o_sha, o_size, path) for path, o_sha, o_size in originals])
+        return saved
+
+    def _place(self, up, name: str, target: Path) -> Tuple[Path, bool]:
+        """
+        Mută upload-ul în blob-ul lui (sau refolosește varianta comprimată a aceluiași original)
+        și leagă «name» din «target» la el. Întoarce (calea, True dacă s-a refolosit varianta comprimată).
+        Se apelează sub BLOB_LOCK.
+        """
+        sha = self.compressed_as(up.sha256)
+        blob = blob_path(sha, Path(name).suffix, self.root) if sha else None
+        reused = blob is not None and blob.exists()
+        if not reused:
+            sha = up.sha256
+            blob = blob_path(sha, Path(name).suffix, self.root)
+        if reused or blob.exists():
+            up.path.unlink()
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(up.path, blob)
+        dst, same = _free_name(target, name, sha)
+        if not same:
+            link_blob(blob, dst)
+        remember_sha256(dst, sha)
+        return dst, reused
+
+    def _row(self, path: Path, project: str, section: str, uploader: str,
+             visible_all: bool, ts: Optional[str] = None) -> tuple:
+        full = path if path.is_absolute() else APP_ROOT / path
+        st_ = full.stat()
+        return (
+            _rel(full), str(project), str(section or GENERAL_SECTION), int(st_.st_size), _mime(full),
+            file_sha256(full), str(uploader or ""),
+            ts or datetime.now().isoformat(timespec="seconds"), int(bool(visible_all)),
+        )
+
+    def add(self, paths: Iterable, project: str, section: Optional[str] = None,
+            uploader: str = "", visible_all: bool = False) -> int:
+        """Înregistrează (sau actualizează) fișierele tocmai salvate. Întoarce numărul de rânduri."""
+        self._ensure()
+        rows = []
+        for p in paths:
+            try:
+                rows.append(self._row(Path(p), project, section, uploader, visible_all))
+            except OSError:
+                continue
+        if rows:
+            with closing(self._connect()) as con, con:
+                con.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def record_compression(self, old_sha: str, new_sha: str, new_size: int) -> None:
+        """Toate rândurile cu conținutul «old_sha» trec pe varianta comprimată (se păstrează dimensiunea inițială)."""
+        self._ensure()
+        with closing(self._connect()) as con, con:
+            con.execute(
+                "UPDATE attachments SET orig_size = COALESCE(orig_size, size),"
+                " orig_sha256 = COALESCE(orig_sha256, sha256), size = ?, sha256 = ? WHERE sha256 = ?",
+                (int(new_size), new_sha, old_sha))
+
+    def set_visible(self, paths: Iterable, visible_all: bool) -> None:
+        self._ensure()
+        with closing(self._connect()) as con, con:
+            con.executemany("UPDATE attachments SET visible_all = ? WHERE path = ?",
+                            [(int(bool(visible_all)), _rel(p)) for p in paths])
+
+    def remove(self, paths: Iterable) -> None:
+        self._ensure()
+        with closing(self._connect()) as con, con:
+            con.executemany("DELETE FROM attachments WHERE path = ?", [(_rel(p),) for p in paths])
+
+    def scan(self) -> int:
+        """
+        Reconstruiește indexul din attachments/ (migrare, sau după modificări manuale pe disc).
+        Rândurile existente se actualizează pe cale, nu se rescriu de la zero: orig_size /
+        orig_sha256 rămân cât timp conținutul e același, iar autorul, vizibilitatea și data
+        se păstrează pentru fișierele care nu apar în niciun manifest. Se șterg doar rândurile
+        ale căror fișiere nu mai există.
+        """
+        info = _manifest_info(data.projects)
+        with closing(self._connect()) as con, con:
+            _migrate(con)
+            known = {r[0]: (r[1], r[2], r[3]) for r in con.execute("SELECT path, uploader, visible_all, ts FROM attachments")}
+        rows = []
+        if self.root.exists():
+            for f in self.root.glob("*/**/*"):
+                rel = f.relative_to(self.root).parts
+                if not f.is_file() or rel[0].startswith((".", "_")) or len(rel) < 2 or f.name.endswith(".tmp"):
+                    continue
+                section = rel[1] if len(rel) > 2 else GENERAL_SECTION
+                path = _rel(f)
+                if path in info:
+                    (user, vis), ts = info[path], known.get(path, (None, None, None))[2]
+                else:
+                    user, vis, ts = known.get(path, ("", 0, None))
+                try:
+                    ts = ts or datetime.fromtimestamp(f.stat().st_mtime).isoformat(timespec="seconds")
+                    rows.append(self._row(f, rel[0], section, user, bool(vis), ts))
+                except OSError:
+                    continue
+        gone = set(known) - {r[0] for r in rows}
+        with closing(self._connect()) as con, con:
+            con.executemany(_UPSERT, rows)
+            con.executemany("DELETE FROM attachments WHERE path = ?", [(p,) for p in gone])
+            con.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('imported', ?)",
+                        (datetime.now().isoformat(timespec="seconds"),))
+        return len(rows)
+
+    # --- citire -------------------------------------------------------------------
+    def list(self, project: Optional[str] = None, section: Optional[str] = None,
+             visible_all: Optional[bool] = None, mime_prefix: Optional[str] = None,
+             exclude_section: Optional[str] = None, limit: Optional[int] = None,
+             offset: int = 0) -> pd.DataFrame:
+        """Atașamentele care corespund filtrelor, cele mai noi primele."""
+        self._ensure()
+        where, args = [], []
+        if project is not None:
+            where.append("project = ?"); args.append(str(project))
+        if section is not None:
+            where.append("section = ?"); args.append(str(section))
+        if exclude_section is not None:
+            where.append("section <> ?"); args.append(str(exclude_section))
+        if visible_all is not None:
+            where.append("visible_all = ?"); args.append(int(bool(visible_all)))
+        if mime_prefix:
+            where.append("mime LIKE ?"); args.append(mime_prefix + "%")
+        sql = f"SELECT {', '.join(COLUMNS)} FROM attachments"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, path"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"; args += [int(limit), int(offset)]
+        with closing(self._connect()) as con:
+            return pd.read_sql_query(sql, con, params=args)
+
+    def count(self, project: Optional[str] = None, section: Optional[str] = None,
+              mime_prefix: Optional[str] = None) -> int:
+        self._ensure()
+        where, args = [], []
+        if project is not None:
+            where.append("project = ?"); args.append(str(project))
+        if section is not None:
+            where.append("section = ?"); args.append(str(section))
+        if mime_prefix:
+            where.append("mime LIKE ?"); args.append(mime_prefix + "%")
+        sql = "SELECT COUNT(*) FROM attachments" + (" WHERE " + " AND ".join(where) if where else "")
+        with closing(self._connect()) as con:
+            return int(con.execute(sql, args).fetchone()[0])
+
+    def sections(self, project: str) -> List[str]:
+        """Secțiile proiectului care au cel puțin un atașament."""
+        self._ensure()
+        with closing(self._connect()) as con:
+            return [r[0] for r in con.execute(
+                "SELECT DISTINCT section FROM attachments WHERE project = ? ORDER BY section", (str(project),))]
+
+    def compressed_as(self, orig_sha: str) -> Optional[str]:
+        """SHA-256 al variantei comprimate pentru un original deja încărcat (sau None)."""
+        self._ensure()
+        with closing(self._connect()) as con:
+            row = con.execute("SELECT sha256 FROM attachments WHERE orig_sha256 = ? LIMIT 1", (orig_sha,)).fetchone()
+        return row[0] if row else None
+
+    def is_compressed(self, sha: str) -> bool:
+        """Conținutul «sha» e deja rezultatul unei compresii (nu se mai re-encodează)."""
+        self._ensure()
+        with closing(self._connect()) as con:
+            return con.execute("SELECT 1 FROM attachments WHERE sha256 = ? AND orig_sha256 IS NOT NULL LIMIT 1",
+                               (sha,)).fetchone() is not None
+
+    def paths_for(self, sha: str) -> List[str]:
+        """Căile (relative la aplicație) care au conținutul «sha»."""
+        self._ensure()
+        with closing(self._connect()) as con:
+            return [r[0] for r in con.execute("SELECT path FROM attachments WHERE sha256 = ?", (sha,))]
+
+    def compression_stats(self) -> Dict[str, int]:
+        """Fișiere comprimate după upload și octeții înainte / după."""
+        self._ensure()
+        with closing(self._connect()) as con:
+            n, before, after = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(orig_size), 0), COALESCE(SUM(size), 0)"
+                " FROM attachments WHERE orig_size IS NOT NULL").fetchone()
+        return {"files": int(n), "bytes_before": int(before), "bytes_after": int(after)}
+
+    def for_section(self, project: str, section: str) -> pd.DataFrame:
+        """Fișierele secției + cele marcate «vizibil pentru toate secțiile» din proiect."""
+        self._ensure()
+        with closing(self._connect()) as con:
+            return pd.read_sql_query(
+                f"SELECT {', '.join(COLUMNS)} FROM attachments"
+                " WHERE project = ? AND (section = ? OR visible_all = 1) ORDER BY ts DESC, path",
+                con, params=[str(project), str(section)])
+
+    # --- întreținere --------------------------------------------------------------
+    def _linked_files(self):
+        for f in self.root.glob("*/**/*"):
+            rel = f.relative_to(self.root).parts
+            if f.is_file() and not rel[0].startswith((".", "_")) and not f.name.endswith(".tmp"):
+                yield f
+
+    def dedup(self, dry_run: bool = False) -> Dict[str, int]:
+        """Transformă fișierele salvate înainte de blob-uri în link-uri spre blob (o copie per conținut)."""
+        saved = files = 0
+        for f in self._linked_files():
+            sha = file_sha256(f)
+            blob = blob_path(sha, f.suffix, self.root)
+            if blob.exists() and os.path.samefile(blob, f):
+                continue
+            files += 1
+            if blob.exists():
+                saved += f.stat().st_size  # conținut deja în blob: copia dispare
+                if not dry_run:
+                    link_blob(blob, f)
+            elif not dry_run:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                link_blob(f, blob)  # primul exemplar devine blob-ul
+        return {"files": files, "bytes_saved": saved}
+
+    def gc(self, dry_run: bool = False, published_dir: Path = PUBLISHED_DIR) -> Dict[str, int]:
+        """
+        Șterge blob-urile orfane: niciun rând în index cu acel SHA-256 și niciun link pe disc.
+        Șterge și fișierele din «published_dir» (<sha256><ext>) al căror conținut nu e în index
+        (previzualizări de upload-uri nesalvate), mai vechi de PUBLISHED_GRACE_S.
+        Temporarele (.tmp) se șterg doar dacă nu au fost modificate de TMP_GRACE_S: altfel pot
+        fi ale unui upload sau ale unei compresii în curs.
+        Raportează și economia dată de deduplicare (octeți logici − octeți pe disc).
+        """
+        self._ensure()
+        with closing(self._connect()) as con:
+            referenced = dict(con.execute("SELECT sha256, SUM(size) FROM attachments GROUP BY sha256"))
+            # originalele păstrate după compresie (KEEP_ORIGINALS) rămân referite
+            for (sha,) in con.execute("SELECT DISTINCT orig_sha256 FROM attachments WHERE orig_sha256 IS NOT NULL"):
+                referenced.setdefault(sha, 0)
+        removed = freed = stored = logical = 0
+        blobs = self.root / "_blobs"
+        candidates = list(blobs.glob("*.tmp")) + list(blobs.glob("*/*")) if blobs.exists() else []
+        tmp_cutoff = datetime.now().timestamp() - TMP_GRACE_S
+        for b in candidates:
+            try:
+                st_ = b.stat()
+            except FileNotFoundError:  # temporar mutat între timp în locul final
+                continue
+            if b.name.endswith(".tmp") and st_.st_mtime >= tmp_cutoff:
+                continue  # scriere în curs
+            if b.name.endswith(".tmp") or (b.stem not in referenced and st_.st_nlink <= 1):
+                removed += 1
+                freed += st_.st_size
+                if not dry_run:
+                    b.unlink(missing_ok=True)
+            else:
+                stored += st_.st_size
+                logical += int(referenced.get(b.stem) or st_.st_size)
+        pub_removed = pub_freed = 0
+        cutoff = datetime.now().timestamp() - PUBLISHED_GRACE_S
+        pub = Path(published_dir)
+        for f in (pub.glob("*") if pub.exists() else ()):
+            st_ = f.stat()
+            if f.is_file() and st_.st_mtime < cutoff and (f.name.endswith(".tmp") or f.stem not in referenced):
+                pub_removed += 1
+                pub_freed += st_.st_size
+                if not dry_run:
+                    f.unlink()
+        return {"blobs_removed": removed, "bytes_freed": freed,
+                "published_removed": pub_removed, "published_bytes_freed": pub_freed,
+                "logical_bytes": logical, "stored_bytes": stored,
+                "dedup_saved_bytes": max(logical - stored, 0)}
+
+attachments = AttachmentIndex()  # singleton, ca data_loader.data
+
+def _main(argv: List[str]) -> int:
+    cmd = argv[0] if argv else ""
+    dry = "--dry-run" in argv
+    if cmd == "gc":
+        r = attachments.gc(dry_run=dry)
+        print(f"Blob-uri orfane {'de șters' if dry else 'șterse'}: {r['blobs_removed']} ({_human(r['bytes_freed'])})")
+        print(f"Previzualizări nesalvate {'de șters' if dry else 'șterse'} din static/att: "
+              f"{r['published_removed']} ({_human(r['published_bytes_freed'])})")
+        print(f"Deduplicare: {_human(r['logical_bytes'])} logic, {_human(r['stored_bytes'])} pe disc, "
+              f"economie {_human(r['dedup_saved_bytes'])}")
+    elif cmd == "dedup":
+        r = attachments.dedup(dry_run=dry)
+        print(f"Fișiere convertite în link-uri: {r['files']} (economie {_human(r['bytes_saved'])})")
+    elif cmd == "stats":
+        r = attachments.compression_stats()
+        print(f"Imagini comprimate: {r['files']} — {_human(r['bytes_before'])} → {_human(r['bytes_after'])}")
+    elif cmd == "scan":
+        print(f"Index refăcut: {attachments.scan()} fișiere")
+    else:
+        print("Utilizare: python -m utils.attachments {gc|dedup|stats|scan} [--dry-run]")
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
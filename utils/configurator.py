@@ -0,0 +1,76 @@
+# utils/configurator.py
+from __future__ import annotations
+"""
+Geometria componentelor din configuratorul de ofertă (Comandă nouă).
+
+– **item_geometry()**: dimensiuni (m), volum și suprafață front pentru o componentă,
+  cu aceleași valori implicite ca în calculul de ore/volum.
+– Configurația se păstrează în «notes» pe o linie «CONFIG: {...}» (JSON), ca să poată
+  fi refolosită de motoarele de producție (debitare, vopsitorie, achiziții).
+"""
+
+import json
+from math import ceil
+from typing import Any, Dict, List, Optional, Tuple
+
+CONFIG_TAG = "CONFIG:"
+DRESSING_MODULE_W_M = 0.8  # lățimea medie a unui modul de dressing
+VOLUME_REDUCTION_DEZASAMBLAT = 0.65  # volum livrat dezasamblat / asamblat
+
+def item_geometry(it: Dict[str, Any]) -> Dict[str, Any]:
+    """Dimensiuni normalizate (metri) + volum + suprafață front pentru o componentă."""
+    typ = it.get("type", "")
+    H = max(float(it.get("H", 0) or 0), 0.0) / 1000.0
+    L = max(float(it.get("L", 0) or 0), 0.0) / 1000.0
+    D = max(float(it.get("D", 0) or 0), 0.0) / 1000.0
+    units = max(int(it.get("units", 1) or 1), 1)
+    length_total_m = 0.0
+
+    if typ == "Dressing":
+        # lungime totală (mm) și adâncime D; estimăm module de 0.8m
+        length_total_m = max(float(it.get("length_total", 0) or 0), 0.0) / 1000.0
+        units = max(1, ceil(length_total_m / DRESSING_MODULE_W_M))
+        if H <= 0:
+            H = 2.4
+        L = DRESSING_MODULE_W_M
+        vol = length_total_m * D * H
+        front_area_m2 = H * length_total_m
+    else:
+        if H <= 0: H = 2.0
+        if L <= 0: L = 0.8
+        if D <= 0: D = 0.6
+        vol = H * L * D * units
+        front_area_m2 = H * L * units
+
+    return {
+        "type": typ,
+        "H": H, "L": L, "D": D,
+        "units": units,
+        "length_total": length_total_m,
+        "volume_m3": vol,
+        "front_area_m2": front_area_m2,
+        "paint_pct": max(min(int(it.get("paint_pct", 0) or 0), 100), 0),
+        "veneer_pct": max(min(int(it.get("veneer_pct", 0) or 0), 100), 0),
+        "paint_finish": str(it.get("paint_finish") or "").strip() or "Standard",
+    }
+
+def config_note_line(items: List[Dict[str, Any]], delivery_type: str) -> str:
+    """Linia «CONFIG: …» salvată în notele proiectului."""
+    payload = {"delivery": delivery_type, "items": items}
+    return f"{CONFIG_TAG} " + json.dumps(payload, ensure_ascii=False, default=str)
+
+def parse_project_config(notes: Optional[str]) -> Tuple[List[Dict[str, Any]], str]:
+    """(componente, tip livrare) din notele proiectului; ([], "Asamblate") dacă lipsesc."""
+    if not notes:
+        return [], "Asamblate"
+    for ln in str(notes).splitlines():
+        ln = ln.strip()
+        if not ln.startswith(CONFIG_TAG):
+            continue
+        try:
+            payload = json.loads(ln[len(CONFIG_TAG):].strip())
+        except Exception:
+            continue
+        items = payload.get("items") or []
+        return [i for i in items if isinstance(i, dict)], str(payload.get("delivery") or "Asamblate")
+    return [], "Asamblate"
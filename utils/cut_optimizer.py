@@ -0,0 +1,267 @@
+# utils/cut_optimizer.py
+from __future__ import annotations
+"""
+Optimizare debitare (secția Debitare) — nesting 2D ghilotină.
+
+– Transformă componentele din configurator în piese de panou (laterale, blaturi,
+  polițe, spate, fronturi), pe materiale.
+– Așază piesele pe plăci standard, cu lățimea de tăiere (kerf) și margine de tivire.
+– Raportează numărul de plăci, pierderea (%) și lista de tăiere.
+– Piesele sunt ținute în array-uri numpy (nu liste de dict-uri), iar căutarea
+  spațiului liber este vectorizată: o comandă de ~500 piese se așază sub o secundă.
+– Piesele mai multor proiecte pe același material pot fi debitate împreună.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.configurator import DRESSING_MODULE_W_M, item_geometry, parse_project_config
+
+# --- Materiale & plăci ---------------------------------------------------------
+MAT_CARCASS = "PAL 18"
+MAT_FRONT_PAINT = "MDF 18"
+MAT_FRONT_VENEER = "MDF furniruit 18"
+MAT_BACK = "HDF 3"
+MAT_TOP = "Blat 38"
+
+# Format placă (lungime x lățime, mm)
+BOARD_SIZES: Dict[str, Tuple[int, int]] = {
+    MAT_CARCASS: (2800, 2070),
+    MAT_FRONT_PAINT: (2800, 2070),
+    MAT_FRONT_VENEER: (2800, 2070),
+    MAT_BACK: (2800, 2070),
+    MAT_TOP: (4100, 920),
+}
+
+THICK_MM = 18
+KERF_MM = 4       # lățimea pânzei
+TRIM_MM = 10      # tivire pe fiecare margine a plăcii
+
+# --- Listă de piese (array-backed) --------------------------------------------
+@dataclass
+class PartList:
+    """Piese pe coloane: lungime, lățime (mm), material, etichetă, proiect."""
+    w: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    h: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+    material: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+    label: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+    project: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=object))
+
+    def __len__(self) -> int:
+        return int(self.w.shape[0])
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, int, int, str, str, str]]) -> "PartList":
+        """rows: (lungime, lățime, cantitate, material, etichetă, proiect)."""
+        rows = [r for r in rows if r[2] > 0 and r[0] > 0 and r[1] > 0]
+        if not rows:
+            return cls()
+        qty = np.array([r[2] for r in rows], dtype=np.int64)
+        return cls(
+            w=np.repeat(np.array([r[0] for r in rows], dtype=np.int32), qty),
+            h=np.repeat(np.array([r[1] for r in rows], dtype=np.int32), qty),
+            material=np.repeat(np.array([r[3] for r in rows], dtype=object), qty),
+            label=np.repeat(np.array([r[4] for r in rows], dtype=object), qty),
+            project=np.repeat(np.array([r[5] for r in rows], dtype=object), qty),
+        )
+
+    @classmethod
+    def concat(cls, lists: Iterable["PartList"]) -> "PartList":
+        lists = [p for p in lists if len(p)]
+        if not lists:
+            return cls()
+        return cls(*(np.concatenate([getattr(p, c) for p in lists]) for c in ("w", "h", "material", "label", "project")))
+
+    def select(self, mask: np.ndarray) -> "PartList":
+        return PartList(self.w[mask], self.h[mask], self.material[mask], self.label[mask], self.project[mask])
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"project": self.project, "material": self.material, "part": self.label, "w": self.w, "h": self.h})
+
+# --- Expandare configurator -> piese -------------------------------------------
+def _front_split(n: int, paint_pct: int, veneer_pct: int) -> List[Tuple[str, int]]:
+    n_paint = int(round(n * paint_pct / 100.0))
+    n_veneer = min(int(round(n * veneer_pct / 100.0)), n - n_paint)
+    return [(MAT_FRONT_PAINT, n_paint), (MAT_FRONT_VENEER, n_veneer), (MAT_CARCASS, n - n_paint - n_veneer)]
+
+def expand_item(it: dict, project: str = "") -> List[Tuple[int, int, int, str, str, str]]:
+    """Piesele unei componente: (lungime, lățime, cantitate, material, etichetă, proiect)."""
+    g = item_geometry(it)
+    typ = g["type"]
+    H, L, D = int(round(g["H"] * 1000)), int(round(g["L"] * 1000)), int(round(g["D"] * 1000))
+    units = g["units"]
+    t = THICK_MM
+    rows: List[Tuple[int, int, int, str, str, str]] = []
+
+    if typ == "Blat":
+        rows.append((L, D, units, MAT_TOP, "Blat", project))
+    elif typ == "Polițe/rafturi":
+        rows.append((L, D, units, MAT_CARCASS, "Poliță", project))
+    elif typ == "Front MDF vopsit":
+        for mat, n in _front_split(units, g["paint_pct"] or 100, g["veneer_pct"]):
+            rows.append((H, L, n, mat, "Front", project))
+    elif typ == "Dressing":
+        modules = units
+        mod_w = int(round(DRESSING_MODULE_W_M * 1000))
+        inner = mod_w - 2 * t
+        rows += [
+            (H, D, modules + 1, MAT_CARCASS, "Lateral dressing", project),
+            (inner, D, 2 * modules, MAT_CARCASS, "Blat/fund modul", project),
+            (inner, D - 20, 3 * modules, MAT_CARCASS, "Poliță", project),
+            (H, mod_w, modules, MAT_BACK, "Spate", project),
+        ]
+        for mat, n in _front_split(2 * modules, g["paint_pct"], g["veneer_pct"]):
+            rows.append((H, mod_w // 2 - 3, n, mat, "Ușă", project))
+    else:
+        # Dulap simplu, Corp bucătărie și alte tipuri «corp»
+        inner = max(L - 2 * t, 1)
+        shelves = max(1, H // 400 - 1)
+        doors = 1 if L <= 600 else 2
+        rows += [
+            (H, D, 2 * units, MAT_CARCASS, "Lateral", project),
+            (inner, D, 2 * units, MAT_CARCASS, "Blat/fund corp", project),
+            (inner, D - 20, shelves * units, MAT_CARCASS, "Poliță", project),
+            (H, L, units, MAT_BACK, "Spate", project),
+        ]
+        for mat, n in _front_split(doors * units, g["paint_pct"], g["veneer_pct"]):
+            rows.append((H - 4, L // doors - 3, n, mat, "Ușă", project))
+    return rows
+
+def expand_config(items: List[dict], project: str = "") -> PartList:
+    rows: List[Tuple[int, int, int, str, str, str]] = []
+    for it in items:
+        rows += expand_item(it, project)
+    return PartList.from_rows(rows)
+
+# --- Nesting ghilotină ---------------------------------------------------------
+@dataclass
+class NestResult:
+    material: str
+    board: Tuple[int, int]
+    sheets: int
+    parts_area_m2: float
+    waste_pct: float
+    cuts: pd.DataFrame
+    oversize: pd.DataFrame
+
+class _FreeRects:
+    """Dreptunghiuri libere (toate plăcile) în array-uri preallocate."""
+    def __init__(self, capacity: int) -> None:
+        self.a = np.zeros((max(capacity, 8), 5), dtype=np.int64)  # x, y, w, h, sheet
+        self.n = 0
+
+    def add(self, x: int, y: int, w: int, h: int, sheet: int) -> None:
+        if w <= 0 or h <= 0:
+            return
+        if self.n == self.a.shape[0]:
+            self.a = np.concatenate([self.a, np.zeros_like(self.a)])
+        self.a[self.n] = (x, y, w, h, sheet)
+        self.n += 1
+
+    def remove(self, i: int) -> None:
+        self.n -= 1
+        self.a[i] = self.a[self.n]
+
+    def best(self, pw: int, ph: int, allow_rotate: bool) -> Tuple[int, bool]:
+        """Indexul dreptunghiului cu cel mai mic rest pe latura scurtă (-1 dacă nu încape)."""
+        if self.n == 0:
+            return -1, False
+        fw, fh = self.a[: self.n, 2], self.a[: self.n, 3]
+        big = np.iinfo(np.int64).max
+        s0 = np.where((fw >= pw) & (fh >= ph), np.minimum(fw - pw, fh - ph), big)
+        i0 = int(np.argmin(s0))
+        if not allow_rotate or pw == ph:
+            return (i0, False) if s0[i0] != big else (-1, False)
+        s1 = np.where((fw >= ph) & (fh >= pw), np.minimum(fw - ph, fh - pw), big)
+        i1 = int(np.argmin(s1))
+        if s0[i0] == big and s1[i1] == big:
+            return -1, False
+        return (i1, True) if s1[i1] < s0[i0] else (i0, False)
+
+def nest_material(parts: PartList, material: str, board: Optional[Tuple[int, int]] = None,
+                  kerf: int = KERF_MM, trim: int = TRIM_MM, allow_rotate: bool = True) -> NestResult:
+    """Așază piesele unui singur material pe plăci (ghilotină, best-short-side-fit)."""
+    board = board or BOARD_SIZES.get(material, BOARD_SIZES[MAT_CARCASS])
+    BW, BH = board[0] - 2 * trim, board[1] - 2 * trim
+
+    fits = (parts.w <= BW) & (parts.h <= BH)
+    if allow_rotate:
+        fits |= (parts.h <= BW) & (parts.w <= BH)
+    over, ok = parts.select(~fits), parts.select(fits)
+
+    n = len(ok)
+    order = np.lexsort((-(ok.w.astype(np.int64) * ok.h), -np.maximum(ok.w, ok.h)))
+    free = _FreeRects(2 * n + 4)
+    sheets = 0
+    px = np.zeros(n, dtype=np.int64); py = np.zeros(n, dtype=np.int64)
+    pw_out = np.zeros(n, dtype=np.int64); ph_out = np.zeros(n, dtype=np.int64)
+    psheet = np.zeros(n, dtype=np.int64); prot = np.zeros(n, dtype=bool)
+
+    for k in order:
+        w, h = int(ok.w[k]), int(ok.h[k])
+        i, rot = free.best(w, h, allow_rotate)
+        if i < 0:
+            free.add(0, 0, BW, BH, sheets)
+            sheets += 1
+            i, rot = free.best(w, h, allow_rotate)
+        if rot:
+            w, h = h, w
+        x, y, fw, fh, s = (int(v) for v in free.a[i])
+        free.remove(i)
+        px[k], py[k], pw_out[k], ph_out[k], psheet[k], prot[k] = x + trim, y + trim, w, h, s + 1, rot
+        # tăietura pe axa cu restul mai scurt păstrează cel mai mare rest întreg
+        rw, rh = fw - w - kerf, fh - h - kerf
+        if fw - w < fh - h:
+            free.add(x + w + kerf, y, rw, h, s)
+            free.add(x, y + h + kerf, fw, rh, s)
+        else:
+            free.add(x + w + kerf, y, rw, fh, s)
+            free.add(x, y + h + kerf, w, rh, s)
+
+    parts_area = float((ok.w.astype(np.int64) * ok.h).sum()) / 1e6
+    board_area = sheets * board[0] * board[1] / 1e6
+    waste = round(100.0 * (1 - parts_area / board_area), 1) if board_area else 0.0
+    cuts = pd.DataFrame({
+        "sheet": psheet, "project": ok.project, "part": ok.label,
+        "x": px, "y": py, "w": pw_out, "h": ph_out, "rotated": prot,
+    }).sort_values(["sheet", "y", "x"], kind="mergesort").reset_index(drop=True)
+    return NestResult(material, board, sheets, round(parts_area, 3), waste, cuts, over.to_frame())
+
+def nest_parts(parts: PartList, **kwargs) -> Dict[str, NestResult]:
+    """Nesting separat pe fiecare material."""
+    out: Dict[str, NestResult] = {}
+    for mat in sorted(set(parts.material.tolist())):
+        out[mat] = nest_material(parts.select(parts.material == mat), mat, **kwargs)
+    return out
+
+def nest_projects(df: pd.DataFrame, project_ids: Optional[List[str]] = None,
+                  materials: Optional[List[str]] = None, **kwargs) -> Dict[str, NestResult]:
+    """Debitare comună pentru mai multe proiecte (configurația din «notes»), pe material."""
+    lists: List[PartList] = []
+    if df is not None and not df.empty:
+        for _, r in df.iterrows():
+            pid = str(r.get("id"))
+            if project_ids is not None and pid not in project_ids:
+                continue
+            items, _ = parse_project_config(r.get("notes"))
+            if items:
+                lists.append(expand_config(items, pid))
+    parts = PartList.concat(lists)
+    if materials is not None and len(parts):
+        parts = parts.select(np.isin(parts.material, materials))
+    return nest_parts(parts, **kwargs)
+
+def summary(results: Dict[str, NestResult]) -> pd.DataFrame:
+    rows = [{
+        "material": r.material,
+        "board": f"{r.board[0]}x{r.board[1]}",
+        "sheets": r.sheets,
+        "parts": int(len(r.cuts)),
+        "parts_m2": r.parts_area_m2,
+        "waste_pct": r.waste_pct,
+        "oversize": int(len(r.oversize)),
+    } for r in results.values()]
+    return pd.DataFrame(rows, columns=["material", "board", "sheets", "parts", "parts_m2", "waste_pct", "oversize"])
@@ -9,14 +9,32 @@ Data Loader unificat pentru Project Planner v20.
 – Expune clasa **AppData** (cum o importă aplicația) + alias **DataLoader = AppData**.
 – Alias-uri: **data.users** (=> personal).
 – **diagnostics()** este METODĂ (apelabilă) + proprietate **diagnostics_data** dacă vrei dict direct.
+– Cache-ul e legat de versiunea fișierelor (mtime + dimensiune): o scriere din afară
+  este vizibilă la următorul acces, fără a re-parsa la fiecare rerun.
+– **recent_activity()**: ultimele K activități («[UPD]» din notes) prin k-way merge peste
+  liste per proiect deja sortate.
+– **query_projects()**: pagini din registru (offset/limit, sortare, filtre, coloane) peste
+  indexuri pre-sortate, refăcute doar la o nouă versiune a datelor.
+– Scrierea proiectelor trece prin **write_projects()**; agregatele KPI (**data.kpi**) primesc delta,
+  iar modulele interesate se abonează cu **add_write_hook()**.
 """
 
+import heapq
+import logging
+from collections import Counter
 from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from utils.perf import span, timed
+
+log = logging.getLogger(__name__)
+
 # --- Căi & foi ----------------------------------------------------------------
 APP_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = APP_ROOT / "data"
@@ -65,12 +83,21 @@ PERSON_COLS_ORDER: List[str] = [
 ]
 
 # --- Utilitare interne ---------------------------------------------------------
+@timed("excel.read")
 def _safe_read_excel(path: Path, sheet: str) -> pd.DataFrame:
     try:
         return pd.read_excel(path, sheet_name=sheet, engine="openpyxl")
     except Exception:
         return pd.DataFrame()
 
+def file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, dimensiune) — versiunea fișierului pe disc; None dacă lipsește."""
+    try:
+        st_ = path.stat()
+        return st_.st_mtime_ns, st_.st_size
+    except OSError:
+        return None
+
 def ensure_project_columns(df: pd.DataFrame) -> pd.DataFrame:
     for c in PROJECT_COLS_ORDER:
         if c not in df.columns:
@@ -93,6 +120,7 @@ def _parse_date_iso(series: pd.Series) -> pd.Series:
         s.loc[mask] = s2
     return s.dt.date
 
+@timed("normalize.projects")
 def _normalize_projects(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         df = pd.DataFrame(columns=PROJECT_COLS_ORDER)
@@ -130,6 +158,7 @@ def _normalize_projects(df: pd.DataFrame) -> pd.DataFrame:
 
     return df[PROJECT_COLS_ORDER]
 
+@timed("normalize.personal")
 def _normalize_personal(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         df = pd.DataFrame(columns=PERSON_COLS_ORDER)
@@ -172,37 +201,281 @@ def parse_section_deadlines(deadlines_field: Union[str, float, None]) -> Dict[st
         if ":" not in p:
             continue
         sec, d = p.split(":", 1)
-        out[sec.strip()] = pd.to_datetime(d.strip(), errors="coerce")
+        d = d.strip()
+        try:
+            # cale rapidă pentru formatul salvat de aplicație (YYYY-MM-DD)
+            out[sec.strip()] = pd.Timestamp(date.fromisoformat(d))
+        except ValueError:
+            out[sec.strip()] = pd.to_datetime(d, errors="coerce")
+    return out
+
+def section_windows(row: Union[pd.Series, Dict[str, Any]]) -> Dict[str, tuple]:
+    """
+    Fereastra (început, termen) a fiecărei secții, în ordinea din «sections»:
+    începutul = termenul secției precedente (sau «start» proiect), ca la planificare.
+    """
+    out: Dict[str, tuple] = {}
+    deadlines = parse_section_deadlines(row.get("section_deadlines"))
+    prev = pd.to_datetime(row.get("start"), errors="coerce")
+    for sec in [s.strip() for s in str(row.get("sections") or "").split(",") if s.strip()]:
+        end = deadlines.get(sec)
+        if end is None or pd.isna(end):
+            continue
+        start = prev if prev is not None and not pd.isna(prev) and prev <= end else end
+        out[sec] = (start, end)
+        prev = end
     return out
 
+def parse_activity(notes: Union[str, float, None]) -> List[Dict[str, str]]:
+    """Liniile «[UPD]» din notes: {when, user, section, text}, în ordinea din fișier."""
+    if notes is None or (isinstance(notes, float) and pd.isna(notes)) or not str(notes).strip():
+        return []
+    lines = [ln.strip() for ln in str(notes).splitlines() if "[UPD]" in ln]
+    out = []
+    for ln in lines:
+        # [UPD][YYYY-mm-dd HH:MM][USER:Name][SEC:Section][ALL:0/1] text | FILES: ...
+        try:
+            ts = ln.split("][", 2)[1].strip("]")
+            when = ts.replace("UPD][","")
+            user = ""
+            sec = ""
+            if "[USER:" in ln:
+                user = ln.split("[USER:",1)[1].split("]",1)[0]
+            if "[SEC:" in ln:
+                sec = ln.split("[SEC:",1)[1].split("]",1)[0]
+            msg = ln.split("] ",1)[1] if "] " in ln else ln
+            out.append({"when": when, "user": user, "section": sec, "text": msg})
+        except Exception:
+            out.append({"when":"", "user":"", "section":"", "text": ln})
+    return out
+
+def _activity_ts(when: str) -> datetime:
+    """Momentul unei activități; neparsabil -> datetime.min (ajunge la final)."""
+    try:
+        return datetime.strptime(when.strip(), "%Y-%m-%d %H:%M")
+    except ValueError:
+        ts = pd.to_datetime(when, errors="coerce")
+        return datetime.min if pd.isna(ts) else ts.to_pydatetime().replace(tzinfo=None)
+
 def filter_projects_by_section(df: pd.DataFrame, section: str) -> pd.DataFrame:
     if not section:
         return df
     return df[df["sections"].astype(str).str.contains(section, regex=False, na=False)].copy()
 
+# --- Agregate KPI (actualizate incremental la scriere) -------------------------
+class KpiAggregates:
+    """
+    Agregate de portofoliu ținute în memorie: count, value_sum, progress_sum, set întârziate,
+    număr proiecte pe secție și pe responsabil. Se actualizează cu delta (rând vechi → rând nou)
+    la fiecare scriere prin AppData; citirile sunt O(1).
+    Contribuțiile se țin pe «id», ca listă de rânduri: un id duplicat (semnalat de Diagnoză)
+    contează de două ori, exact ca în sumele pe tabel; rândurile fără id stau sub "".
+    """
+
+    def __init__(self, today: Optional[date] = None) -> None:
+        self.as_of: date = today or date.today()
+        self.count = 0
+        self.value_sum = 0.0
+        self.progress_sum = 0.0
+        self.progress_n = 0  # rânduri cu progres numeric (media ignoră lipsurile, ca .mean())
+        self.overdue: Set[str] = set()
+        self.per_section: Counter = Counter()
+        self.per_responsible: Counter = Counter()
+        self._rows: Dict[str, List[tuple]] = {}  # id -> [(value, progress, end, sections, responsible), …]
+
+    @staticmethod
+    def _contrib(row: Union[pd.Series, Dict[str, Any]]) -> tuple:
+        value = pd.to_numeric(row.get("value"), errors="coerce")
+        prog = pd.to_numeric(row.get("progress_overall"), errors="coerce")
+        end = pd.to_datetime(row.get("end"), errors="coerce")
+        resp = row.get("responsible")
+        return (
+            0.0 if pd.isna(value) else float(value),
+            None if pd.isna(prog) else float(prog),
+            None if pd.isna(end) else end.date(),
+            tuple(split_sections(row.get("sections"))),
+            None if resp is None or pd.isna(resp) or not str(resp).strip() else str(resp).strip(),
+        )
+
+    def _is_overdue(self, c: tuple) -> bool:
+        return c[2] is not None and c[2] < self.as_of and (c[1] or 0.0) < 100
+
+    @staticmethod
+    def _pid(value: Any) -> str:
+        return "" if value is None or pd.isna(value) else str(value).strip()
+
+    def _add(self, c: tuple, sign: int) -> None:
+        self.count += sign
+        self.value_sum += sign * c[0]
+        if c[1] is not None:
+            self.progress_sum += sign * c[1]
+            self.progress_n += sign
+        for sec in c[3]:
+            self.per_section[sec] += sign
+            if self.per_section[sec] <= 0:
+                del self.per_section[sec]
+        if c[4] is not None:
+            self.per_responsible[c[4]] += sign
+            if self.per_responsible[c[4]] <= 0:
+                del self.per_responsible[c[4]]
+
+    def set_rows(self, project_id: Any, rows: Iterable[Union[pd.Series, Dict[str, Any]]]) -> None:
+        """Înlocuiește contribuțiile id-ului cu rândurile date (listă goală = proiect șters)."""
+        pid = self._pid(project_id)
+        for c in self._rows.pop(pid, []):
+            self._add(c, -1)
+        new = [self._contrib(r) for r in rows]
+        for c in new:
+            self._add(c, +1)
+        if new:
+            self._rows[pid] = new
+        if any(self._is_overdue(c) for c in new):
+            self.overdue.add(pid)
+        else:
+            self.overdue.discard(pid)
+
+    def upsert(self, row: Union[pd.Series, Dict[str, Any]]) -> None:
+        """Aplică delta pentru un rând inserat sau modificat (singurul rând cu acel id)."""
+        self.set_rows(row.get("id"), [row])
+
+    def remove(self, project_id: str) -> None:
+        self.set_rows(project_id, [])
+
+    def roll_date(self, today: Optional[date] = None) -> None:
+        """La schimbarea zilei recalculăm doar setul de întârziate (din contribuțiile reținute)."""
+        today = today or date.today()
+        if today == self.as_of:
+            return
+        self.as_of = today
+        self.overdue = {pid for pid, cs in self._rows.items() if any(self._is_overdue(c) for c in cs)}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, today: Optional[date] = None) -> "KpiAggregates":
+        agg = cls(today)
+        groups: Dict[str, List[pd.Series]] = {}
+        if df is not None and not df.empty:
+            for _, r in df.iterrows():
+                groups.setdefault(cls._pid(r.get("id")), []).append(r)
+        for pid, rows in groups.items():
+            agg.set_rows(pid, rows)
+        return agg
+
+    @property
+    def progress_avg(self) -> float:
+        return round(self.progress_sum / self.progress_n, 1) if self.progress_n else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "value_sum": round(self.value_sum, 2),
+            "progress_sum": round(self.progress_sum, 2),
+            "progress_avg": self.progress_avg,
+            "overdue": sorted(self.overdue),
+            "per_section": dict(sorted(self.per_section.items())),
+            "per_responsible": dict(sorted(self.per_responsible.items())),
+        }
+
+# --- Sortare / filtrare pentru registrul paginat --------------------------------
+# ordinea implicită din «Vedere generală»: termen ↑, status ↓, progres ↓
+DEFAULT_PROJECT_SORT: Tuple[Tuple[str, bool], ...] = (("end", True), ("status", False), ("progress_overall", False))
+
+def _sort_key(s: pd.Series, ascending: bool) -> np.ndarray:
+    """Cheie numerică pentru lexsort; valorile lipsă ajung la final (ca la sort_values)."""
+    if s.name in ("start", "end"):
+        v = pd.to_datetime(s, errors="coerce").to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+        v[pd.isna(pd.to_datetime(s, errors="coerce")).to_numpy()] = np.nan
+    elif pd.api.types.is_numeric_dtype(s):
+        # ca în overview: lipsă = −1 pentru status / progres
+        v = pd.to_numeric(s, errors="coerce").fillna(-1).to_numpy(dtype=float)
+    else:
+        v = pd.Series(pd.factorize(s.fillna("").astype(str), sort=True)[0], index=s.index).to_numpy(dtype=float)
+    v = v if ascending else -v
+    return np.where(np.isnan(v), np.inf, v)
+
+def project_filter_mask(df: pd.DataFrame, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+    """Filtre egalitate pe coloane; «sections» = secția apare în listă (fără regex)."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, val in (filters or {}).items():
+        if val is None or col not in df.columns:
+            continue
+        if col == "sections":
+            mask &= df[col].fillna("").astype(str).str.contains(str(val), regex=False).to_numpy()
+        else:
+            mask &= (df[col].astype(str) == str(val)).to_numpy()
+    return mask
+
 # --- Clasa cerută de app: AppData (cu alias DataLoader) -----------------------
 @dataclass
 class _Cache:
     projects: Optional[pd.DataFrame] = None
     personal: Optional[pd.DataFrame] = None
+    kpi: Optional[KpiAggregates] = None
+    # versiunea fișierelor din care s-a citit cache-ul (scrieri din afara AppData)
+    projects_stamp: Optional[Tuple[int, int]] = None
+    personal_stamp: Optional[Tuple[int, int]] = None
 
 class AppData:
     """Loader cu cache intern; folosit în tot proiectul."""
     def __init__(self) -> None:
         self._cache = _Cache()
+        # crește la fiecare reîncărcare/scriere; cheie pentru cache-urile derivate (vezi «version»)
+        self._version = 0
+        # activitatea fiecărui proiect, sortată descrescător: id -> (notes, listă)
+        self._activity: Dict[str, tuple] = {}
+        # permutări pre-sortate ale proiectelor, valabile pentru o versiune
+        self._sort_index: Dict[str, Any] = {"version": None, "perm": {}}
+        # apelate după fiecare write_projects(df, changed_ids) (ex. istoric progres)
+        self._write_hooks: List[Callable[[pd.DataFrame, Optional[List[str]]], None]] = []
+
+    @property
+    def version(self) -> int:
+        """
+        Versiunea datelor, cheie pentru cache-urile derivate. Verifică întâi fișierele: o scriere
+        din afara aplicației schimbă versiunea chiar dacă apelantul nu a citit încă tabelele.
+        """
+        self._check_stamps()
+        return self._version
+
+    def _check_stamps(self) -> None:
+        if self._cache.projects is not None and file_stamp(PROJECTS_XLSX) != self._cache.projects_stamp:
+            self.refresh()  # fișierul a fost modificat în afara write_projects()
+        if self._cache.personal is not None and file_stamp(PERSONAL_XLSX) != self._cache.personal_stamp:
+            self._cache.personal = None
+            self._version += 1
 
     @property
     def projects(self) -> pd.DataFrame:
+        stamp = file_stamp(PROJECTS_XLSX)
+        if self._cache.projects is not None and stamp != self._cache.projects_stamp:
+            self.refresh()  # fișierul a fost modificat în afara write_projects()
         if self._cache.projects is None:
             self._cache.projects = self._load_projects()
+            self._cache.projects_stamp = stamp
         return self._cache.projects
 
     @property
     def personal(self) -> pd.DataFrame:
+        stamp = file_stamp(PERSONAL_XLSX)
+        if self._cache.personal is not None and stamp != self._cache.personal_stamp:
+            self._cache.personal = None
+            self._version += 1
         if self._cache.personal is None:
             self._cache.personal = self._load_personal()
+            self._cache.personal_stamp = stamp
         return self._cache.personal
 
+    @property
+    def kpi(self) -> KpiAggregates:
+        """Agregatele de portofoliu (construite o dată, apoi actualizate la fiecare scriere)."""
+        if self._cache.kpi is None:
+            self._cache.kpi = KpiAggregates.from_frame(self.projects)
+        self._cache.kpi.roll_date()
+        return self._cache.kpi
+
+    def kpi_consistent(self) -> bool:
+        """Verifică agregatele incrementale față de un recalcul complet."""
+        return self.kpi.snapshot() == KpiAggregates.from_frame(self.projects).snapshot()
+
     # Alias compatibil cerut de Dashboard: data.users
     @property
     def users(self) -> pd.DataFrame:
@@ -223,12 +496,118 @@ class AppData:
 
     def refresh(self) -> None:
         self._cache = _Cache()
+        self._version += 1
+
+    def sorted_index(self, sort: Sequence[Tuple[str, bool]] = DEFAULT_PROJECT_SORT) -> np.ndarray:
+        """Permutarea pozițiilor din «projects» pentru o sortare (lexsort, memorată per versiune)."""
+        if self._sort_index["version"] != self.version:
+            self._sort_index = {"version": self.version, "perm": {}}
+        key = tuple((c, bool(a)) for c, a in sort)
+        perm = self._sort_index["perm"].get(key)
+        if perm is None:
+            df = self.projects
+            keys = [_sort_key(df[c], a) for c, a in key if c in df.columns]
+            # lexsort: ultima cheie e cea principală; stabil, ca mergesort
+            perm = np.lexsort(keys[::-1]) if keys else np.arange(len(df))
+            self._sort_index["perm"][key] = perm
+        return perm
+
+    def query_projects(self, offset: int = 0, limit: int = 50,
+                       sort: Sequence[Tuple[str, bool]] = DEFAULT_PROJECT_SORT,
+                       filters: Optional[Dict[str, Any]] = None,
+                       columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        O pagină din registrul de proiecte: (rânduri [offset, offset+limit), total după filtre).
+        Sortarea folosește indexul pre-sortat; se copiază doar rândurile și coloanele cerute.
+        """
+        df = self.projects
+        perm = self.sorted_index(sort)
+        if filters:
+            perm = perm[project_filter_mask(df, filters)[perm]]
+        total = int(len(perm))
+        offset = max(int(offset), 0)
+        rows = perm[offset:offset + max(int(limit), 0)]
+        cols = [c for c in (columns or list(df.columns)) if c in df.columns]
+        return df.iloc[rows][cols].reset_index(drop=True), total
+
+    def _project_activity(self, pid: str, name: str, notes: Any) -> List[tuple]:
+        """Activitatea unui proiect (cea mai recentă prima); re-parsată doar dacă notes s-a schimbat."""
+        hit = self._activity.get(pid)
+        if hit is not None and hit[0] == notes and hit[1] == name:
+            return hit[2]
+        acts = [(_activity_ts(a["when"]), i, {"when": a["when"], "project": name, "section": a["section"],
+                                             "user": a["user"], "text": a["text"]})
+                for i, a in enumerate(parse_activity(notes))]
+        # sortare stabilă: la același moment rămâne ordinea din notes
+        acts.sort(key=lambda x: x[0], reverse=True)
+        self._activity[pid] = (notes, name, acts)
+        return acts
+
+    def recent_activity(self, ids: Optional[Sequence[str]] = None, k: int = 15) -> pd.DataFrame:
+        """
+        Ultimele «k» activități din proiectele date (toate, implicit).
+        Listele per proiect sunt deja sortate, deci se face doar un k-way merge (heapq).
+        """
+        cols = ["when", "project", "section", "user", "text"]
+        df = self.projects
+        if ids is not None:
+            df = df[df["id"].isin(set(ids))]
+        streams = [self._project_activity(str(r.id), str(r.name or ""), r.notes)
+                   for r in df[["id", "name", "notes"]].itertuples(index=False)]
+        merged = heapq.merge(*streams, key=lambda x: x[0], reverse=True)
+        return pd.DataFrame([a[2] for a in islice(merged, max(int(k), 0))], columns=cols)
+
+    def add_write_hook(self, fn: Callable[[pd.DataFrame, Optional[List[str]]], None]) -> None:
+        if fn not in self._write_hooks:
+            self._write_hooks.append(fn)
+
+    def _run_write_hooks(self, changed_ids: Optional[List[str]]) -> None:
+        for fn in list(self._write_hooks):
+            try:
+                with span(f"hook.{getattr(fn, '__qualname__', fn)}"):
+                    fn(self.projects, changed_ids)
+            except Exception:
+                # un hook defect nu blochează salvarea, dar starea lui rămâne în urmă: se vede în log
+                log.exception("Hook-ul de scriere %s a eșuat", getattr(fn, "__qualname__", fn))
+
+    @timed("excel.write_projects")
+    def write_projects(self, df: pd.DataFrame, changed_ids: Optional[List[str]] = None) -> None:
+        """
+        Scrie foaia «Proiecte» și actualizează cache-ul fără a re-parsa fișierul.
+        Cu «changed_ids», agregatele KPI primesc doar delta rândurilor inserate/modificate;
+        fără, cache-ul este invalidat complet.
+        """
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        with pd.ExcelWriter(PROJECTS_XLSX, engine="openpyxl", mode="w") as xlw:
+            df.to_excel(xlw, sheet_name=SHEET_PROJECTS, index=False)
+
+        stamp = file_stamp(PROJECTS_XLSX)
+        if changed_ids is None or self._cache.projects is None:
+            self.refresh()
+            self._run_write_hooks(changed_ids)
+            return
+        new = _normalize_projects(df)
+        kpi = self._cache.kpi
+        if kpi is not None:
+            changed = {KpiAggregates._pid(i) for i in changed_ids}
+            rows: Dict[str, List[pd.Series]] = {pid: [] for pid in changed}  # fără rânduri = șters
+            ids = new["id"].map(KpiAggregates._pid)
+            for _, r in new[ids.isin(changed)].iterrows():
+                rows[KpiAggregates._pid(r.get("id"))].append(r)
+            for pid, rs in rows.items():
+                kpi.set_rows(pid, rs)
+        self._cache.projects = new
+        self._cache.projects_stamp = stamp
+        self._version += 1
+        self._run_write_hooks(changed_ids)
 
     # --- intern ---------------------------------------------------------------
+    @timed("data._load_projects")
     def _load_projects(self) -> pd.DataFrame:
         df = _safe_read_excel(PROJECTS_XLSX, SHEET_PROJECTS)
         return _normalize_projects(df)
 
+    @timed("data._load_personal")
     def _load_personal(self) -> pd.DataFrame:
         df = _safe_read_excel(PERSONAL_XLSX, SHEET_PERSONAL)
         return _normalize_personal(df)
@@ -252,10 +631,7 @@ class AppData:
         end_dt   = pd.to_datetime(dfp.get("end"), errors="coerce") if not dfp.empty else pd.Series([], dtype="datetime64[ns]")
         active = int(((start_dt <= today) & (end_dt >= today)).sum()) if not dfp.empty else 0
 
-        sections_active = 0
-        if not dfp.empty and "sections" in dfp.columns:
-            tokens = {s.strip() for row in dfp["sections"].fillna("") for s in str(row).split(",") if s.strip()}
-            sections_active = len(tokens)
+        sections_active = len(self.kpi.per_section)
 
         missing_proj_crit = [c for c in ["id","name","company","value","start","end","status","progress_overall"] if c not in dfp.columns]
         diagnostics = {
@@ -267,6 +643,7 @@ class AppData:
             },
             "counts": {
                 "projects_rows": int(len(dfp)),
+                "projects_overdue": len(self.kpi.overdue),
                 "users_rows": int(len(dfu)),
                 "projects_active_now": active,
                 "sections_active": sections_active,
@@ -297,8 +674,13 @@ def kpi_summary(df: pd.DataFrame) -> Dict[str, Union[int, float]]:
     if df.empty:
         return {"count": 0, "progress_avg": 0.0, "value_sum": 0.0, "active_now": 0}
     today = pd.Timestamp.today()
-    progress_avg = float(pd.to_numeric(df["progress_overall"], errors="coerce").mean(skipna=True) or 0.0)
-    value_sum = float(pd.to_numeric(df["value"], errors="coerce").sum(skipna=True) or 0.0)
+    if df is data._cache.projects:
+        # portofoliul complet: citim agregatele întreținute incremental
+        progress_avg = data.kpi.progress_avg
+        value_sum = data.kpi.value_sum
+    else:
+        progress_avg = float(pd.to_numeric(df["progress_overall"], errors="coerce").mean(skipna=True) or 0.0)
+        value_sum = float(pd.to_numeric(df["value"], errors="coerce").sum(skipna=True) or 0.0)
     start_dt = pd.to_datetime(df["start"], errors="coerce")
     end_dt = pd.to_datetime(df["end"], errors="coerce")
     active = ((start_dt <= today) & (end_dt >= today)).sum()
@@ -308,3 +690,77 @@ def kpi_summary(df: pd.DataFrame) -> Dict[str, Union[int, float]]:
         "value_sum": round(value_sum, 2),
         "active_now": int(active),
     }
+
+# --- Cadre pentru pagina «View Grafic» -----------------------------------------
+PROJECT_STATUS_LABELS = ("Planificare", "Execuție", "Finalizare", "On Hold")
+_FRAMES_CACHE: Dict[str, Any] = {"key": None, "frames": None, "sections": None}
+
+def _project_status(row) -> str:
+    raw = str(row.get("status") or "").strip()
+    if raw in PROJECT_STATUS_LABELS:
+        return raw
+    prog = pd.to_numeric(row.get("progress_overall"), errors="coerce")
+    if "DELIVERED_ON:" in str(row.get("notes") or "") or (pd.notna(prog) and prog >= 100):
+        return "Finalizare"
+    return "Planificare" if pd.isna(prog) or prog <= 0 else "Execuție"
+
+def _task_status(progress: float) -> str:
+    if progress >= 100:
+        return "Done"
+    return "In Progress" if progress > 0 else "To Do"
+
+def load_dataframes(today: Optional[date] = None) -> tuple:
+    """
+    (projects, tasks, schedule, teams) derivate din AppData:
+    – projects: project_id, name, owner, status, budget, deadline, progress;
+    – tasks: câte un task pe proiect × secție, cu progress și planned_progress (earned value);
+    – schedule: fereastra planificată a fiecărei secții; teams: personalul pe secții.
+    Rezultatul se păstrează până la următoarea versiune a datelor.
+    """
+    # import local: utils.earned_value importă la rândul lui din acest modul
+    from utils.earned_value import section_ev
+
+    today = today or date.today()
+    key = (data.version, today)
+    if _FRAMES_CACHE["key"] == key:
+        return _FRAMES_CACHE["frames"]
+
+    dfp = data.projects
+    people = data.personal
+    primary = people[people["is_primary"] == 1].drop_duplicates("section").set_index("section")["name"]
+
+    projects = pd.DataFrame({
+        "project_id": dfp["id"].astype(str),
+        "name": dfp["name"],
+        "owner": dfp["responsible"].fillna("").astype(str),
+        "status": [_project_status(r) for _, r in dfp.iterrows()],
+        "budget": pd.to_numeric(dfp["value"], errors="coerce").fillna(0.0),
+        "deadline": dfp["end"],
+        "progress": pd.to_numeric(dfp["progress_overall"], errors="coerce").fillna(0.0),
+    })
+
+    sec = section_ev(dfp, today)
+    owners = projects.set_index("project_id")["owner"]
+    tasks = pd.DataFrame({
+        "task_id": sec["id"] + ":" + sec["section"],
+        "project_id": sec["id"],
+        "title": sec["section"] + " / " + sec["name"],
+        "section": sec["section"],
+        "status": sec["actual"].map(_task_status),
+        "progress": sec["actual"],
+        "planned_progress": sec["planned"].fillna(0.0),
+        "created_at": sec["plan_start"].dt.date,
+        "assignee": sec["section"].map(primary).fillna(sec["id"].map(owners)),
+    })
+    schedule = sec[["id", "section", "plan_start", "plan_end"]].rename(
+        columns={"id": "project_id", "plan_start": "start", "plan_end": "end"})
+    teams = people[["name", "section", "role", "email"]].copy()
+
+    frames = (projects, tasks, schedule, teams)
+    _FRAMES_CACHE.update(key=key, frames=frames, sections=sec)
+    return frames
+
+def load_section_ev(today: Optional[date] = None) -> pd.DataFrame:
+    """Tabelul proiect × secție (earned value) din care derivă load_dataframes, pentru aceeași zi."""
+    load_dataframes(today)
+    return _FRAMES_CACHE["sections"]
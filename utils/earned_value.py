@@ -0,0 +1,129 @@
+# utils/earned_value.py
+from __future__ import annotations
+"""
+Earned value pe secții: progres planificat vs. realizat.
+
+– Planul fiecărei secții e liniar pe fereastra ei (section_windows: de la termenul secției
+  precedente / «start» până la termenul secției); secțiile fără termen folosesc «start»–«end».
+– Progres planificat / realizat pe proiect = medie ponderată pe secții (implicit ponderi egale,
+  ca la «progress_overall»).
+– SPI = realizat / planificat, SV = realizat − planificat (puncte procentuale);
+  cu «value», SV se exprimă și în lei.
+– Calculul e vectorizat pe tot portofoliul (un tabel lung proiect × secție).
+"""
+
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import parse_section_progress, section_windows
+
+SECTION_COLS = ["id", "name", "section", "weight", "plan_start", "plan_end", "actual", "planned", "sv", "spi"]
+PROJECT_COLS = ["id", "name", "value", "actual", "planned", "sv", "spi", "sv_value"]
+
+def _empty_sections(cols) -> pd.DataFrame:
+    """Tabel proiect × secție gol, dar cu tipurile coloanelor (ferestrele rămân datetime64)."""
+    out = pd.DataFrame({c: pd.Series(dtype=object) for c in cols})
+    for c in ("weight", "actual", "planned", "sv", "spi"):
+        if c in out:
+            out[c] = out[c].astype(float)
+    for c in ("plan_start", "plan_end"):
+        out[c] = pd.Series(dtype="datetime64[ns]")
+    return out
+
+def _spi(actual: np.ndarray, planned: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(planned > 0, actual / planned, np.nan)
+
+def section_frame(df: pd.DataFrame, weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Tabel lung proiect × secție: pondere, fereastră planificată și progres realizat."""
+    rows = []
+    if df is None or df.empty:
+        return _empty_sections(SECTION_COLS[:7])
+    for _, r in df.iterrows():
+        secs = [s.strip() for s in str(r.get("sections") or "").split(",") if s.strip()]
+        if not secs:
+            continue
+        prog = parse_section_progress(r.get("sections_progress"))
+        windows = section_windows(r)
+        p_start = pd.to_datetime(r.get("start"), errors="coerce")
+        p_end = pd.to_datetime(r.get("end"), errors="coerce")
+        for i, sec in enumerate(secs):
+            ws, we = windows.get(sec, (p_start, p_end))
+            rows.append({
+                "id": str(r.get("id")), "name": str(r.get("name") or ""), "section": sec,
+                "weight": float((weights or {}).get(sec, 1.0)),
+                "plan_start": ws, "plan_end": we,
+                "actual": float(min(max(prog[i] if i < len(prog) else 0, 0), 100)),
+            })
+    out = pd.DataFrame(rows, columns=SECTION_COLS[:7])
+    out["plan_start"] = pd.to_datetime(out["plan_start"], errors="coerce")
+    out["plan_end"] = pd.to_datetime(out["plan_end"], errors="coerce")
+    return out
+
+def planned_progress(sec: pd.DataFrame, today: Optional[date] = None) -> np.ndarray:
+    """Progres planificat (0–100) la data «today» pentru fiecare rând proiect × secție."""
+    t = pd.Timestamp(today or date.today())
+    start = sec["plan_start"].to_numpy(dtype="datetime64[ns]")
+    end = sec["plan_end"].to_numpy(dtype="datetime64[ns]")
+    t64 = np.datetime64(t.to_datetime64(), "ns")
+    span = (end - start).astype("timedelta64[s]").astype(float)
+    done = (t64 - start).astype("timedelta64[s]").astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(span > 0, done / span, np.where(t64 >= end, 1.0, 0.0))
+    frac = np.clip(frac, 0.0, 1.0) * 100.0
+    missing = np.isnat(start) | np.isnat(end)
+    return np.where(missing, np.nan, frac)
+
+def section_ev(df: pd.DataFrame, today: Optional[date] = None,
+               weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """SPI / SV pe fiecare secție a fiecărui proiect."""
+    sec = section_frame(df, weights)
+    if sec.empty:
+        return _empty_sections(SECTION_COLS)
+    sec["planned"] = planned_progress(sec, today).round(1)
+    sec["sv"] = (sec["actual"] - sec["planned"]).round(1)
+    sec["spi"] = np.round(_spi(sec["actual"].to_numpy(), sec["planned"].to_numpy()), 2)
+    return sec[SECTION_COLS]
+
+def project_ev(df: pd.DataFrame, today: Optional[date] = None,
+               weights: Optional[Dict[str, float]] = None,
+               sections: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """SPI / SV pe proiect (medie ponderată pe secțiile cu plan)."""
+    sec = section_ev(df, today, weights) if sections is None else sections
+    if sec.empty:
+        return pd.DataFrame(columns=PROJECT_COLS)
+    s = sec[sec["planned"].notna()].copy()
+    s["w_act"] = s["weight"] * s["actual"]
+    s["w_plan"] = s["weight"] * s["planned"]
+    g = s.groupby(["id", "name"], sort=False)[["weight", "w_act", "w_plan"]].sum().reset_index()
+    g["actual"] = (g["w_act"] / g["weight"]).round(1)
+    g["planned"] = (g["w_plan"] / g["weight"]).round(1)
+    g["sv"] = (g["actual"] - g["planned"]).round(1)
+    g["spi"] = np.round(_spi(g["actual"].to_numpy(), g["planned"].to_numpy()), 2)
+    values = pd.to_numeric(df.set_index(df["id"].astype(str))["value"], errors="coerce") if "value" in df else pd.Series(dtype=float)
+    g["value"] = g["id"].map(values[~values.index.duplicated()]).fillna(0.0)
+    g["sv_value"] = (g["sv"] / 100.0 * g["value"]).round(2)
+    return g[PROJECT_COLS]
+
+def portfolio_ev(df: pd.DataFrame, today: Optional[date] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 sections: Optional[pd.DataFrame] = None) -> Dict[str, float]:
+    """
+    Totaluri pe portofoliu: progres realizat / planificat mediu, SPI, SV și proiecte în urmă.
+    «sections» (ex. load_section_ev()) evită recalculul tabelului proiect × secție.
+    """
+    p = project_ev(df, today, weights, sections=sections)
+    if p.empty:
+        return {"projects": 0, "actual": 0.0, "planned": 0.0, "spi": float("nan"), "sv": 0.0, "behind": 0}
+    actual, planned = float(p["actual"].mean()), float(p["planned"].mean())
+    return {
+        "projects": int(len(p)),
+        "actual": round(actual, 1),
+        "planned": round(planned, 1),
+        "spi": round(actual / planned, 2) if planned > 0 else float("nan"),
+        "sv": round(actual - planned, 1),
+        "behind": int((p["sv"] < 0).sum()),
+    }
@@ -0,0 +1,132 @@
+# utils/image_compress.py
+from __future__ import annotations
+"""
+Compresie în fundal a pozelor încărcate (telefoane: 4–12 MB / poză).
+
+– Rulează într-un thread pool după ce salvarea s-a întors: butonul «Salvează» nu așteaptă.
+– Elimină EXIF (orientarea se aplică întâi), limitează latura la MAX_PX și re-encodează
+  în același format (JPEG/WebP cu calitate fixă, PNG optimizat, fără pierderi); numele
+  fișierului rămâne neschimbat, deci manifestele «FILES:» din notes rămân valide.
+– Varianta comprimată devine un blob nou; toate căile cu același conținut se re-leagă
+  la el, iar indexul reține dimensiunea inițială (orig_size) și noul SHA-256.
+– Originalul se păstrează doar cu KEEP_ORIGINALS; altfel blob-ul vechi se șterge.
+– Conținutul care e deja rezultatul unei compresii nu se re-encodează (fără pierderi în lanț).
+– Re-encodarea rulează fără lacăt; înlocuirea blob-ului și re-legarea căilor se fac sub
+  attachments.BLOB_LOCK, același lacăt pe care îl ia upload-ul (store) când leagă un blob.
+– Imediat după compresie se generează miniatura (din varianta finală).
+"""
+
+import hashlib
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+try:  # dependență opțională
+    from PIL import Image, ImageOps
+except Exception:  # pragma: no cover
+    Image = None
+    ImageOps = None
+
+from utils.attachments import BLOB_LOCK, attachments, blob_path, link_blob
+from utils.data_loader import APP_ROOT
+from utils.thumbnails import file_sha256, queue_thumbnails, remember_sha256
+
+MAX_PX = 2560  # latura maximă păstrată
+MIN_BYTES = 300 * 1024  # sub atât nu merită re-encodat
+JPEG_QUALITY = 82
+WEBP_QUALITY = 80
+KEEP_ORIGINALS = False
+
+_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".webp": "WEBP", ".png": "PNG"}
+_POOL: Optional[ThreadPoolExecutor] = None
+
+def _encode(src: Path, dst: Path, fmt: str) -> None:
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((MAX_PX, MAX_PX))
+        if fmt == "JPEG":
+            if im.mode not in ("RGB", "L"):
+                im = im.convert("RGB")
+            im.save(dst, fmt, quality=JPEG_QUALITY, optimize=True, progressive=True)
+        elif fmt == "WEBP":
+            im.save(dst, fmt, quality=WEBP_QUALITY, method=4)
+        else:
+            im.save(dst, fmt, optimize=True)
+    # fără exif=/pnginfo=: metadatele (inclusiv GPS) nu se mai scriu
+
+def compress_image(path) -> Optional[Tuple[int, int]]:
+    """
+    Comprimă imaginea de la «path» (relativă la aplicație sau absolută).
+    Întoarce (octeți înainte, octeți după) sau None dacă nu s-a modificat nimic.
+    """
+    full = Path(path) if Path(path).is_absolute() else APP_ROOT / path
+    fmt = _FORMATS.get(full.suffix.lower())
+    if Image is None or fmt is None or not full.exists():
+        return None
+    before = full.stat().st_size
+    if before < MIN_BYTES:
+        return None
+    old_sha = file_sha256(full)
+    if attachments.is_compressed(old_sha):  # re-upload al unui original deja comprimat
+        return None
+    # re-encodarea (secunde) nu ține lacătul; doar mutarea blob-ului și re-legarea căilor
+    tmp = attachments.root / "_blobs" / f".{uuid.uuid4().hex}.tmp"
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        _encode(full, tmp, fmt)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        return None
+    after = tmp.stat().st_size
+    if after >= before:
+        tmp.unlink()
+        return None
+    h = hashlib.sha256()
+    with open(tmp, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    new_sha = h.hexdigest()
+    with BLOB_LOCK:  # comun cu attachments.store(): un upload nu leagă un blob pe cale de ștergere
+        if file_sha256(full) != old_sha:  # fișierul s-a schimbat între timp
+            tmp.unlink()
+            return None
+        new_blob = blob_path(new_sha, full.suffix, attachments.root)
+        if new_blob.exists():
+            tmp.unlink()
+        else:
+            new_blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, new_blob)
+        targets = {APP_ROOT / p for p in attachments.paths_for(old_sha)} | {full}
+        for t in targets:
+            link_blob(new_blob, t)
+            remember_sha256(t, new_sha)
+        attachments.record_compression(old_sha, new_sha, after)
+        old_blob = blob_path(old_sha, full.suffix, attachments.root)
+        if not KEEP_ORIGINALS and old_blob.exists() and old_blob.stat().st_nlink <= 1:
+            old_blob.unlink()
+    return before, after
+
+def _postprocess(path: Path) -> None:
+    try:
+        compress_image(path)
+    finally:
+        queue_thumbnails([path])
+
+def queue_uploads(paths: Iterable) -> None:
+    """După salvare: compresie (imagini) + miniaturi, în fundal."""
+    global _POOL
+    items = [APP_ROOT / p if not Path(p).is_absolute() else Path(p) for p in paths]
+    if not items:
+        return
+    if Image is None:
+        queue_thumbnails(items)
+        return
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="compress")
+    for p in items:
+        if p.suffix.lower() in _FORMATS:
+            _POOL.submit(_postprocess, p)
+        else:
+            queue_thumbnails([p])
@@ -0,0 +1,181 @@
+# utils/material_rollup.py
+from __future__ import annotations
+"""
+Necesar de materiale pe săptămâni pentru Achiziții.
+
+– Pentru fiecare proiect deschis, configurația din «notes» se transformă în cantități:
+  plăci (m² pe material, din piesele de debitare), m² vopsiți, m² furnir, volum ambalat.
+– Fiecare material e cerut în săptămâna în care începe secția care îl consumă
+  (fereastra secției din «section_deadlines»).
+– Calcul incremental: se păstrează contribuția fiecărui proiect; la o modificare se scade
+  vechea contribuție și se adaugă cea nouă, fără a reface tot portofoliul.
+– Sincronizarea completă (sync) se face o singură dată per versiune de date; salvările
+  cu «changed_ids» ajung prin hook (on_write) și ating doar proiectele respective.
+"""
+
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.configurator import VOLUME_REDUCTION_DEZASAMBLAT, item_geometry, parse_project_config
+from utils.cut_optimizer import expand_config
+from utils.data_loader import data, section_windows
+
+MAT_PAINT = "Vopsitorie (m² vopsiți)"
+MAT_VENEER = "Furnir (m²)"
+MAT_PACK = "Ambalare (m³)"
+
+# secția care consumă materialul (prima existentă în proiect)
+CONSUMER_SECTIONS: Dict[str, List[str]] = {
+    "board": ["Debitare", "CNC", "Asamblare"],
+    MAT_PAINT: ["Pregătire vopsitorie", "Vopsitorie"],
+    MAT_VENEER: ["Furnir"],
+    MAT_PACK: ["Ambalare", "Transport (Livrare)"],
+}
+
+Key = Tuple[date, str]  # (luni săptămână, material)
+
+def _week(ts) -> date:
+    return pd.Timestamp(ts).to_period("W-SUN").start_time.date()
+
+def _is_open(row) -> bool:
+    prog = pd.to_numeric(row.get("progress_overall"), errors="coerce")
+    if "DELIVERED_ON:" in str(row.get("notes") or ""):
+        return False
+    return pd.isna(prog) or float(prog) < 100
+
+def _signature(row) -> str:
+    items, delivery = parse_project_config(row.get("notes"))
+    raw = "|".join(str(x) for x in (
+        row.get("sections"), row.get("section_deadlines"), row.get("start"), items, delivery, _is_open(row),
+    ))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def project_demand(row) -> Dict[Key, float]:
+    """Contribuția unui proiect: {(săptămână, material): cantitate}."""
+    out: Dict[Key, float] = {}
+    if not _is_open(row):
+        return out
+    items, delivery = parse_project_config(row.get("notes"))
+    if not items:
+        return out
+    windows = section_windows(row)
+    fallback = pd.to_datetime(row.get("start"), errors="coerce")
+
+    def _when(kind: str) -> Optional[date]:
+        for sec in CONSUMER_SECTIONS[kind]:
+            if sec in windows:
+                return _week(windows[sec][0])
+        return None if pd.isna(fallback) else _week(fallback)
+
+    def _add(kind: str, material: str, qty: float) -> None:
+        wk = _when(kind)
+        if wk is None or qty <= 0:
+            return
+        out[(wk, material)] = out.get((wk, material), 0.0) + qty
+
+    parts = expand_config(items, str(row.get("id")))
+    if len(parts):
+        area = parts.w.astype(np.int64) * parts.h / 1e6
+        for mat in sorted(set(parts.material.tolist())):
+            _add("board", f"{mat} (m²)", float(area[parts.material == mat].sum()))
+
+    vol = 0.0
+    for it in items:
+        g = item_geometry(it)
+        _add(MAT_PAINT, MAT_PAINT, g["front_area_m2"] * g["paint_pct"] / 100.0)
+        _add(MAT_VENEER, MAT_VENEER, g["front_area_m2"] * g["veneer_pct"] / 100.0)
+        vol += g["volume_m3"]
+    # același factor ca în configurator pentru livrarea dezasamblată
+    _add(MAT_PACK, MAT_PACK, vol * (1.0 if delivery == "Asamblate" else VOLUME_REDUCTION_DEZASAMBLAT))
+    return out
+
+class MaterialRollup:
+    """Totaluri săptămână × material, întreținute incremental pe proiect."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[Key, float] = {}
+        self._contrib: Dict[str, Dict[Key, float]] = {}
+        self._sig: Dict[str, str] = {}
+        self.recomputed = 0  # câte proiecte au fost recalculate (diagnostic)
+        self._version: Optional[int] = None  # versiunea datelor cu care totalurile sunt la zi
+
+    def _apply(self, contrib: Dict[Key, float], sign: float) -> None:
+        for k, q in contrib.items():
+            v = self._totals.get(k, 0.0) + sign * q
+            if abs(v) < 1e-9:
+                self._totals.pop(k, None)
+            else:
+                self._totals[k] = v
+
+    def remove(self, project_id: str) -> None:
+        old = self._contrib.pop(project_id, None)
+        self._sig.pop(project_id, None)
+        if old:
+            self._apply(old, -1.0)
+
+    def upsert(self, row) -> bool:
+        """Actualizează un proiect; întoarce True dacă a fost recalculat."""
+        pid = str(row.get("id"))
+        sig = _signature(row)
+        if self._sig.get(pid) == sig:
+            return False
+        self.remove(pid)
+        new = project_demand(row)
+        self._contrib[pid] = new
+        self._sig[pid] = sig
+        self._apply(new, +1.0)
+        self.recomputed += 1
+        return True
+
+    def sync(self, df: pd.DataFrame, version: Optional[int] = None) -> int:
+        """
+        Aliniază cu tabelul de proiecte; recalculează doar proiectele modificate.
+        Cu «version» (data.version), un al doilea apel pe aceeași versiune nu mai parcurge tabelul.
+        """
+        if version is not None and version == self._version:
+            return 0
+        seen = set()
+        changed = 0
+        if df is not None and not df.empty:
+            for _, r in df.iterrows():
+                seen.add(str(r.get("id")))
+                changed += int(self.upsert(r))
+        for pid in [p for p in self._contrib if p not in seen]:
+            self.remove(pid)
+            changed += 1
+        self._version = version
+        return changed
+
+    def on_write(self, df: pd.DataFrame, changed_ids: Optional[List[str]]) -> None:
+        """Hook după write_projects: actualizează doar proiectele salvate."""
+        # fără id-uri sau dacă totalurile nu erau la zi cu versiunea dinaintea scrierii,
+        # următorul sync reface alinierea completă
+        if changed_ids is None or self._version is None or self._version != data.version - 1:
+            self._version = None
+            return
+        ids = {str(i).strip() for i in changed_ids}
+        rows = df[df["id"].astype(str).str.strip().isin(ids)] if df is not None and not df.empty else df
+        for _, r in (rows.iterrows() if rows is not None else ()):
+            self.upsert(r)
+            ids.discard(str(r.get("id")).strip())
+        for pid in ids:
+            self.remove(pid)
+        self._version = data.version
+
+    def table(self, weeks: Optional[Iterable[date]] = None) -> pd.DataFrame:
+        """Tabel săptămână × material (cantități rotunjite)."""
+        if not self._totals:
+            return pd.DataFrame()
+        s = pd.Series(self._totals)
+        s.index = pd.MultiIndex.from_tuples(s.index, names=["week", "material"])
+        t = s.unstack("material").fillna(0.0).sort_index().round(2)
+        if weeks is not None:
+            t = t[t.index.isin(list(weeks))]
+        return t
+
+rollup = MaterialRollup()  # singleton, ca data_loader.data
+data.add_write_hook(rollup.on_write)
@@ -0,0 +1,192 @@
+# utils/paint_scheduler.py
+from __future__ import annotations
+"""
+Programare pe loturi a cabinei de vopsire (secția Vopsitorie), pe toate proiectele.
+
+– Suprafața vopsită = paint_pct × suprafața fronturilor (configuratorul din «notes»),
+  redusă cu progresul deja raportat pe secția Vopsitorie.
+– Proiectele cu termen Vopsitorie în următoarele N zile sunt grupate pe finisaj;
+  fiecare ciclu de cabină conține un singur finisaj, până la suprafața cabinei.
+– Durata unui ciclu = aplicare (m² / ritm) + uscare (ore/ciclu), ca în «Ritmuri pe secțiuni».
+– Ciclurile se așază în ordinea termenelor, în limita orelor zilnice ale secției.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.configurator import item_geometry, parse_project_config
+from utils.data_loader import DATA_DIR, parse_section_deadlines, split_sections, parse_section_progress
+
+PAINT_SECTION = "Vopsitorie"
+RATES_CSV = DATA_DIR / "ritmuri.csv"  # același fișier ca pagina Ajutor
+
+# Valori implicite (identice cu help.DEFAULT_RATES / new_order.SEC_CAPACITY_HPD)
+DEFAULT_APPLY_M2_PER_H = 6.0
+DEFAULT_DRY_H_PER_CYCLE = 2.0
+DEFAULT_HOURS_PER_DAY = 16.0
+BOOTH_AREA_M2 = 12.0  # suprafață fronturi pe rastel / ciclu
+
+def load_paint_rates() -> Tuple[float, float]:
+    """(ritm aplicare m²/oră, uscare ore/ciclu) din data/ritmuri.csv, cu fallback la implicite."""
+    apply_rate, dry = DEFAULT_APPLY_M2_PER_H, DEFAULT_DRY_H_PER_CYCLE
+    try:
+        if RATES_CSV.exists():
+            df = pd.read_csv(RATES_CSV)
+            v = df[df["section"].astype(str) == PAINT_SECTION]
+            rate = pd.to_numeric(v["rate"], errors="coerce")
+            m_apply = v["unit"].astype(str).str.contains("mp/oră", regex=False) & rate.gt(0)
+            m_dry = v["metric"].astype(str).str.contains("uscare", case=False, regex=False)
+            if m_apply.any():
+                apply_rate = float(rate[m_apply].iloc[0])
+            if m_dry.any() and pd.notna(rate[m_dry].iloc[0]):
+                dry = float(rate[m_dry].iloc[0])
+    except Exception:
+        pass
+    return apply_rate, dry
+
+# --- Cerere vopsire per proiect -------------------------------------------------
+@dataclass
+class PaintDemand:
+    project_id: str
+    name: str
+    finish: str
+    area_m2: float
+    due: date
+
+def painted_area_by_finish(items: List[dict]) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for it in items:
+        g = item_geometry(it)
+        if g["paint_pct"] <= 0 or g["front_area_m2"] <= 0:
+            continue
+        out[g["paint_finish"]] = out.get(g["paint_finish"], 0.0) + g["front_area_m2"] * g["paint_pct"] / 100.0
+    return out
+
+def collect_demands(df: pd.DataFrame, today: date, horizon_days: int) -> List[PaintDemand]:
+    """Suprafața rămasă de vopsit pentru proiectele cu termen Vopsitorie ≤ azi + N zile."""
+    out: List[PaintDemand] = []
+    if df is None or df.empty:
+        return out
+    limit = today + timedelta(days=int(horizon_days))
+    for _, r in df.iterrows():
+        if "DELIVERED_ON:" in str(r.get("notes") or ""):
+            continue  # livrat – nu mai ocupă cabina, chiar dacă progresul e rămas în urmă
+        secs = split_sections(r.get("sections"))
+        if PAINT_SECTION not in secs:
+            continue
+        due = parse_section_deadlines(r.get("section_deadlines")).get(PAINT_SECTION)
+        if due is None or pd.isna(due) or due.date() > limit:
+            continue
+        # progresul e stocat în ordinea din «sections» (nu în ordinea nomenclatorului)
+        raw_secs = [s.strip() for s in str(r.get("sections") or "").split(",") if s.strip()]
+        prog = parse_section_progress(r.get("sections_progress"))
+        done = prog[raw_secs.index(PAINT_SECTION)] if PAINT_SECTION in raw_secs and raw_secs.index(PAINT_SECTION) < len(prog) else 0
+        if done >= 100:
+            continue
+        items, _ = parse_project_config(r.get("notes"))
+        for finish, area in painted_area_by_finish(items).items():
+            left = area * (1 - max(done, 0) / 100.0)
+            if left > 1e-6:
+                out.append(PaintDemand(str(r.get("id")), str(r.get("name") or ""), finish, left, due.date()))
+    return out
+
+# --- Loturi / cicluri -----------------------------------------------------------
+@dataclass
+class BoothCycle:
+    finish: str
+    area_m2: float = 0.0
+    shares: List[Tuple[str, float]] = field(default_factory=list)  # (proiect, m²)
+    due: Optional[date] = None
+    day: Optional[date] = None
+
+    def hours(self, apply_rate: float, dry_h: float) -> float:
+        return self.area_m2 / max(apply_rate, 1e-9) + dry_h
+
+def pack_cycles(demands: List[PaintDemand], booth_area: float = BOOTH_AREA_M2) -> List[BoothCycle]:
+    """Umple ciclurile pe finisaj, în ordinea termenelor; un proiect poate trece în ciclul următor."""
+    by_finish: Dict[str, List[PaintDemand]] = {}
+    for d in demands:
+        by_finish.setdefault(d.finish, []).append(d)
+    cycles: List[BoothCycle] = []
+    for finish, lst in by_finish.items():
+        cur = BoothCycle(finish)
+        for d in sorted(lst, key=lambda x: (x.due, x.project_id)):
+            left = d.area_m2
+            while left > 1e-6:
+                take = min(left, booth_area - cur.area_m2)
+                cur.area_m2 += take
+                cur.shares.append((d.project_id, take))
+                cur.due = d.due if cur.due is None else min(cur.due, d.due)
+                left -= take
+                if cur.area_m2 >= booth_area - 1e-6:
+                    cycles.append(cur)
+                    cur = BoothCycle(finish)
+        if cur.shares:
+            cycles.append(cur)
+    return cycles
+
+def schedule_cycles(cycles: List[BoothCycle], start: date, apply_rate: float, dry_h: float,
+                    hours_per_day: float = DEFAULT_HOURS_PER_DAY) -> List[BoothCycle]:
+    """Calendar: ciclurile (EDD) ocupă orele zilnice ale cabinei; un ciclu nu se împarte pe zile."""
+    day, used = start, 0.0
+    ordered = sorted(cycles, key=lambda c: (c.due or date.max, c.finish))
+    for c in ordered:
+        h = c.hours(apply_rate, dry_h)
+        if used > 0 and used + h > hours_per_day:
+            day, used = day + timedelta(days=1), 0.0
+        c.day = day
+        used += h
+    return ordered
+
+def plan_paint_batches(df: pd.DataFrame, today: date, horizon_days: int = 14,
+                       apply_rate: Optional[float] = None, dry_h: Optional[float] = None,
+                       hours_per_day: float = DEFAULT_HOURS_PER_DAY,
+                       booth_area: float = BOOTH_AREA_M2) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Întoarce (calendar cicluri, date vopsire per proiect).
+    Ritmurile lipsă se citesc din data/ritmuri.csv.
+    """
+    if apply_rate is None or dry_h is None:
+        r_apply, r_dry = load_paint_rates()
+        apply_rate = r_apply if apply_rate is None else apply_rate
+        dry_h = r_dry if dry_h is None else dry_h
+
+    demands = collect_demands(df, today, horizon_days)
+    cycles = schedule_cycles(pack_cycles(demands, booth_area), today, apply_rate, dry_h, hours_per_day)
+
+    cal_cols = ["day", "cycle", "finish", "area_m2", "fill_pct", "hours", "projects"]
+    cal = pd.DataFrame([{
+        "day": c.day,
+        "cycle": i,
+        "finish": c.finish,
+        "area_m2": round(c.area_m2, 2),
+        "fill_pct": round(100.0 * c.area_m2 / booth_area, 1) if booth_area else 0.0,
+        "hours": round(c.hours(apply_rate, dry_h), 2),
+        "projects": ", ".join(f"{pid}: {a:.1f} m²" for pid, a in c.shares),
+    } for i, c in enumerate(cycles, start=1)], columns=cal_cols)
+
+    # data vopsirii = ziua ultimului ciclu care conține proiectul
+    last_day: Dict[str, date] = {}
+    for c in cycles:
+        for pid, _ in c.shares:
+            last_day[pid] = max(last_day.get(pid, c.day), c.day)
+    proj: Dict[str, dict] = {}
+    for d in demands:
+        p = proj.setdefault(d.project_id, {"id": d.project_id, "name": d.name, "finishes": set(), "area_m2": 0.0, "due": d.due})
+        p["finishes"].add(d.finish)
+        p["area_m2"] += d.area_m2
+    rows = []
+    for pid, p in proj.items():
+        pd_day = last_day.get(pid)
+        rows.append({
+            "id": pid, "name": p["name"], "finishes": ", ".join(sorted(p["finishes"])),
+            "area_m2": round(p["area_m2"], 2), "due": p["due"], "paint_date": pd_day,
+            "late": bool(pd_day and pd_day > p["due"]),
+        })
+    per_proj = pd.DataFrame(rows, columns=["id", "name", "finishes", "area_m2", "due", "paint_date", "late"])
+    if not per_proj.empty:
+        per_proj = per_proj.sort_values(["paint_date", "due"], kind="mergesort").reset_index(drop=True)
+    return cal, per_proj
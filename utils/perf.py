@@ -0,0 +1,122 @@
+# utils/perf.py
+from __future__ import annotations
+"""
+Instrumentare ușoară a căilor «fierbinți» dintr-un rerun.
+
+– **span(nume)**: context manager; **timed(nume)**: decorator. Fiecare măsurătoare ajunge
+  într-un ring buffer (ultimele SPANS_MAX), cu rerun-ul, adâncimea (span-uri imbricate)
+  și thread-ul.
+– **begin_run()** / **end_run()** delimitează un rerun (apelate din streamlit_app.py; end_run
+  adaugă span-ul «rerun» cu durata totală); span-urile din thread-uri de fundal
+  (miniaturi, compresie) au rerun gol.
+– Citire: **spans_frame()**, **slowest()** (agregat pe nume), **spans_csv()** pentru export.
+– Agregatul pe nume (număr, total, maxim) se actualizează la fiecare span, deci slowest()
+  nu reconstruiește tabelul din buffer; acoperă tot de la pornire (sau de la clear()).
+– Costul unui span e de ordinul microsecundelor: poate rămâne activ în producție.
+"""
+
+import functools
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+SPANS_MAX = 5000
+
+@dataclass
+class Span:
+    run: Optional[int]
+    name: str
+    start: float  # epoch (s)
+    ms: float
+    depth: int
+    thread: str
+
+_SPANS: Deque[Span] = deque(maxlen=SPANS_MAX)
+_AGG: Dict[str, List[float]] = {}  # nume → [număr, total ms, maxim ms]
+_AGG_LOCK = threading.Lock()  # span-uri și din thread-urile de fundal
+_RUNS = itertools.count(1)
+_local = threading.local()
+
+def _record(s: Span) -> None:
+    _SPANS.append(s)
+    with _AGG_LOCK:
+        a = _AGG.get(s.name)
+        if a is None:
+            _AGG[s.name] = [1, s.ms, s.ms]
+        else:
+            a[0] += 1
+            a[1] += s.ms
+            a[2] = max(a[2], s.ms)
+
+def begin_run() -> int:
+    """Un nou rerun în thread-ul curent; span-urile următoare îi aparțin."""
+    _local.run = next(_RUNS)
+    _local.depth = 0
+    _local.run_start = (time.time(), time.perf_counter())
+    return _local.run
+
+def end_run() -> None:
+    """Închide rerun-ul curent cu un span «rerun» (durata totală a scriptului)."""
+    start = getattr(_local, "run_start", None)
+    if start is not None:
+        ms = (time.perf_counter() - start[1]) * 1000.0
+        _record(Span(current_run(), "rerun", start[0], ms, 0, threading.current_thread().name))
+        _local.run_start = None
+
+def current_run() -> Optional[int]:
+    return getattr(_local, "run", None)
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    start = time.time()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - t0) * 1000.0
+        _local.depth = depth
+        _record(Span(current_run(), name, start, ms, depth, threading.current_thread().name))
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator: fiecare apel devine un span (implicit «modul.funcție»)."""
+    def deco(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+# --- citire -----------------------------------------------------------------------
+def spans_frame(run: Optional[int] = None) -> pd.DataFrame:
+    """Span-urile din buffer (opțional doar ale unui rerun), în ordinea înregistrării."""
+    rows = [(s.run, s.name, s.start, s.ms, s.depth, s.thread) for s in list(_SPANS) if run is None or s.run == run]
+    out = pd.DataFrame(rows, columns=["run", "name", "start", "ms", "depth", "thread"])
+    out["start"] = pd.to_datetime(out["start"], unit="s")
+    out["ms"] = out["ms"].round(2)
+    return out
+
+def slowest(n: int = 10) -> pd.DataFrame:
+    """Cele mai costisitoare span-uri, agregate pe nume (max, medie, număr), din agregatul incremental."""
+    with _AGG_LOCK:
+        top = sorted(_AGG.items(), key=lambda kv: kv[1][2], reverse=True)[:max(int(n), 0)]
+    rows = [(name, int(c), total / c, mx, total) for name, (c, total, mx) in top]
+    return pd.DataFrame(rows, columns=["name", "count", "mean_ms", "max_ms", "total_ms"]).round(2)
+
+def spans_csv() -> bytes:
+    return spans_frame().to_csv(index=False).encode("utf-8")
+
+def clear() -> None:
+    _SPANS.clear()
+    with _AGG_LOCK:
+        _AGG.clear()
@@ -0,0 +1,258 @@
+# utils/progress_history.py
+from __future__ import annotations
+"""
+Istoric zilnic al progresului pe secții (pentru burn-up / earned value).
+
+– Fișier binar append-only data/progres_istoric.bin, înregistrări numpy de 10 octeți:
+  (zi, index proiect, index secție, progres int8).
+– Se scriu doar modificările (delta față de ultima valoare cunoscută); o secție scoasă
+  din proiect primește progres −1. Câțiva ani de istoric rămân la câțiva MB.
+– Id-urile de proiect și numele secțiilor sunt în data/progres_istoric.json (index → nume).
+– Se scrie o dată pe zi (snapshot complet) și la fiecare salvare (hook în write_projects).
+– Înregistrările sunt ordonate după zi, deci un interval se citește cu searchsorted.
+– Starea curentă e ținută în memorie pe proiect ({proiect: {secție: progres}}), cu indexuri
+  nume → poziție: un hook pe câteva id-uri atinge doar rândurile și starea acelor proiecte.
+"""
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import DATA_DIR, SECTIONS, data, parse_section_progress
+
+PROGRESS_BIN = DATA_DIR / "progres_istoric.bin"
+PROGRESS_META = DATA_DIR / "progres_istoric.json"
+
+REC_DTYPE = np.dtype([("day", "<i4"), ("proj", "<i4"), ("sec", "i1"), ("prog", "i1")])
+REMOVED = -1  # secția nu mai face parte din proiect
+
+def _day_num(d) -> int:
+    """Zile de la 1970-01-01."""
+    return int(np.datetime64(pd.Timestamp(d).date(), "D").astype(np.int64))
+
+def _day_from_num(n) -> pd.Timestamp:
+    return pd.Timestamp(np.datetime64(int(n), "D"))
+
+def project_progress(row) -> Dict[str, int]:
+    """{secție: progres 0–100} din «sections» + «sections_progress» (aceeași ordine)."""
+    secs = [s.strip() for s in str(row.get("sections") or "").split(",") if s.strip()]
+    prog = parse_section_progress(row.get("sections_progress"))
+    return {s: int(min(max(prog[i] if i < len(prog) else 0, 0), 100)) for i, s in enumerate(secs)}
+
+class ProgressStore:
+    """Snapshot-uri de progres, codate delta, pe disc."""
+
+    def __init__(self, bin_path: Path = PROGRESS_BIN, meta_path: Path = PROGRESS_META) -> None:
+        self.bin_path = Path(bin_path)
+        self.meta_path = Path(meta_path)
+        self._meta: Optional[Dict] = None
+        self._state: Dict[int, Dict[int, int]] = {}  # proiect → {secție: ultimul progres}
+        self._ix: Dict[str, Dict[str, int]] = {"projects": {}, "sections": {}}
+        self._last_day = -(2 ** 31)
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    # --- încărcare ----------------------------------------------------------------
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st_ = self.bin_path.stat()
+            return st_.st_mtime_ns, st_.st_size
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        stamp = self._file_stamp()
+        if self._meta is not None and stamp == self._stamp:
+            return
+        try:
+            self._meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            self._meta = {}
+        self._meta.setdefault("projects", [])
+        self._meta.setdefault("sections", list(SECTIONS))
+        self._meta.setdefault("last_full", None)
+        self._ix = {k: {name: i for i, name in enumerate(self._meta[k])} for k in ("projects", "sections")}
+        self._state = {}
+        self._last_day = -(2 ** 31)
+        recs = self._records()
+        if len(recs):
+            # ultima valoare per (proiect, secție) = starea curentă
+            key = recs["proj"].astype(np.int64) * 256 + recs["sec"].astype(np.int64)
+            _, last = np.unique(key[::-1], return_index=True)
+            last = len(recs) - 1 - last
+            for p, s, v in zip(recs["proj"][last].tolist(), recs["sec"][last].tolist(), recs["prog"][last].tolist()):
+                self._state.setdefault(p, {})[s] = v
+            self._last_day = int(recs["day"][-1])
+        self._stamp = stamp
+
+    def _records(self) -> np.ndarray:
+        if not self.bin_path.exists() or self.bin_path.stat().st_size < REC_DTYPE.itemsize:
+            return np.empty(0, dtype=REC_DTYPE)
+        return np.memmap(self.bin_path, dtype=REC_DTYPE, mode="r")
+
+    def _index(self, kind: str, name: str) -> int:
+        ix = self._ix[kind]
+        i = ix.get(name)
+        if i is None:
+            i = ix[name] = len(self._meta[kind])
+            self._meta[kind].append(name)
+        return i
+
+    @staticmethod
+    def _rows(df: pd.DataFrame, only: Optional[set]) -> Iterable[Tuple[str, Dict]]:
+        """(id, rând) pentru proiectele de comparat; cu «only», doar pozițiile acelor id-uri."""
+        ids = df["id"].fillna("").astype(str).str.strip().tolist() if "id" in df else [""] * len(df)
+        if only is None:
+            pos = range(len(ids))
+        else:
+            at = {pid: i for i, pid in enumerate(ids) if pid}  # proiect → poziția rândului
+            pos = sorted(at[pid] for pid in only if pid in at)
+        secs = df["sections"].tolist() if "sections" in df else [None] * len(df)
+        progs = df["sections_progress"].tolist() if "sections_progress" in df else [None] * len(df)
+        for i in pos:
+            if ids[i]:
+                yield ids[i], {"sections": secs[i], "sections_progress": progs[i]}
+
+    def _save_meta(self) -> None:
+        tmp = self.meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._meta, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.meta_path)
+
+    # --- scriere ------------------------------------------------------------------
+    def record(self, df: pd.DataFrame, day: Optional[date] = None,
+               ids: Optional[Iterable[str]] = None) -> int:
+        """
+        Adaugă modificările de progres față de ultima stare cunoscută.
+        Cu «ids», se compară doar proiectele respective. Întoarce numărul de înregistrări scrise.
+        """
+        self._load()
+        if df is None or df.empty:
+            return 0
+        # zilele rămân crescătoare în fișier (condiția pentru searchsorted)
+        day = day or date.today()
+        dnum = max(_day_num(day), self._last_day)
+        only = {str(i).strip() for i in ids} if ids is not None else None
+
+        rows: List[Tuple[int, int, int, int]] = []
+        seen_proj = set()
+        for pid, r in self._rows(df, only):
+            p = self._index("projects", pid)
+            seen_proj.add(p)
+            current = {self._index("sections", s): v for s, v in project_progress(r).items()}
+            known = self._state.get(p, {})
+            rows += [(dnum, p, s, v) for s, v in current.items() if known.get(s) != v]
+            rows += [(dnum, p, s, REMOVED) for s, v in known.items() if s not in current and v != REMOVED]
+        # proiecte șterse (la snapshot complet: toate cele care lipsesc din tabel)
+        pix = self._ix["projects"]
+        gone = {pix[pid] for pid in only if pid in pix} if only is not None else set(self._state)
+        for p in gone - seen_proj:
+            rows += [(dnum, p, s, REMOVED) for s, v in self._state.get(p, {}).items() if v != REMOVED]
+
+        if rows:
+            arr = np.array(rows, dtype=REC_DTYPE)
+            self.bin_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.bin_path, "ab") as fh:
+                fh.write(arr.tobytes())
+            for d, p, s, v in rows:
+                self._state.setdefault(p, {})[s] = v
+            self._last_day = dnum
+        if only is None:
+            self._meta["last_full"] = pd.Timestamp(day).date().isoformat()
+        self._save_meta()
+        self._stamp = self._file_stamp()
+        return len(rows)
+
+    def daily_snapshot(self, df: pd.DataFrame, today: Optional[date] = None) -> bool:
+        """Snapshot complet, cel mult o dată pe zi."""
+        self._load()
+        key = (today or date.today()).isoformat()
+        if self._meta.get("last_full") == key:
+            return False
+        self.record(df, today)
+        return True
+
+    def on_write(self, df: pd.DataFrame, changed_ids: Optional[List[str]]) -> None:
+        self.record(df, ids=changed_ids)
+
+    # --- citire -------------------------------------------------------------------
+    def read_range(self, start, end) -> np.ndarray:
+        """Înregistrările cu zi în [start, end] (slice din fișier, fără scanare completă)."""
+        recs = self._records()
+        lo = np.searchsorted(recs["day"], _day_num(start), side="left")
+        hi = np.searchsorted(recs["day"], _day_num(end), side="right")
+        return np.asarray(recs[lo:hi])
+
+    def _state_before(self, d0: int, tail: np.ndarray, proj: Optional[int]) -> np.ndarray:
+        """
+        Starea (proiect, secție, progres) la începutul zilei d0.
+        – Perechile fără modificări de la d0 încoace au valoarea curentă (din memorie).
+        – Pentru celelalte, fișierul se citește înapoi de la d0, pe bucăți, doar până la
+          ultima lor valoare anterioară; perechile care nu apar nu existau încă.
+        """
+        key = lambda p, s: (p << 8) | (s & 0xFF)
+        current = {key(p, s): (p, s, v)
+                   for p, secs in self._state.items() if proj is None or p == proj
+                   for s, v in secs.items()}
+        pending = {key(int(p), int(s)) for p, s in zip(tail["proj"].tolist(), tail["sec"].tolist())}
+        out = [v for k, v in current.items() if k not in pending]
+        recs = self._records()
+        hi = int(np.searchsorted(recs["day"], d0, side="left")) if len(recs) else 0
+        step = 1 << 16
+        while pending and hi > 0:
+            lo = max(hi - step, 0)
+            chunk = np.asarray(recs[lo:hi])[::-1]
+            if proj is not None:
+                chunk = chunk[chunk["proj"] == proj]
+            for p, s, v in zip(chunk["proj"].tolist(), chunk["sec"].tolist(), chunk["prog"].tolist()):
+                k = key(p, s)
+                if k in pending:
+                    pending.discard(k)
+                    out.append((p, s, v))
+            hi = lo
+        return np.array(out, dtype=[("proj", "<i4"), ("sec", "i1"), ("prog", "i1")])
+
+    def burnup(self, start, end, project_id: Optional[str] = None) -> pd.DataFrame:
+        """
+        Progres mediu pe zile în [start, end]: pe portofoliu sau pentru un singur proiect.
+        Secțiile au pondere egală, ca la calculul «progress_overall».
+        """
+        self._load()
+        cols = ["date", "progress"]
+        d0, d1 = _day_num(start), _day_num(end)
+        proj = None
+        if project_id is not None:
+            proj = self._ix["projects"].get(str(project_id).strip())
+            if proj is None:
+                return pd.DataFrame(columns=cols)
+        # din fișier se citește fereastra (plus ce s-a scris după ea); starea la «start»
+        # se reconstituie din starea curentă, nu din tot istoricul
+        tail = self.read_range(start, _day_from_num(max(self._last_day, d1)))
+        if proj is not None:
+            tail = tail[tail["proj"] == proj]
+        window = tail[tail["day"] <= d1]
+        base = self._state_before(d0, tail, proj)
+        if not len(base) and not len(window):
+            return pd.DataFrame(columns=cols)
+
+        f = pd.DataFrame({
+            "day": np.concatenate([np.full(len(base), d0, dtype=np.int64), window["day"].astype(np.int64)]),
+            "proj": np.concatenate([base["proj"], window["proj"]]),
+            "sec": np.concatenate([base["sec"], window["sec"]]),
+            "prog": np.concatenate([base["prog"], window["prog"]]).astype(float),
+        })
+        wide = f.pivot_table(index="day", columns=["proj", "sec"], values="prog", aggfunc="last")
+        wide = wide.reindex(np.arange(d0, d1 + 1)).ffill()
+        wide = wide.where(wide != REMOVED)
+        per_proj = wide.T.groupby(level="proj").mean().T  # medie pe secții
+        out = pd.DataFrame({
+            "date": [_day_from_num(d) for d in per_proj.index],
+            "progress": per_proj.mean(axis=1).round(1).to_numpy(),
+        })
+        return out.dropna(subset=["progress"]).reset_index(drop=True)
+
+progress_store = ProgressStore()  # singleton, ca data_loader.data
+data.add_write_hook(progress_store.on_write)
@@ -0,0 +1,157 @@
+# utils/risk_history.py
+from __future__ import annotations
+"""
+Semafor risc (după termenul de finalizare) + istoric zilnic.
+
+– **classify_risk()**: încadrarea pe toată coloana «days_late» cu np.select (fără .apply).
+– **snapshot_risk()**: o dată pe zi se adaugă o înregistrare în data/risc_istoric.jsonl:
+  data, câte o coloană cu numărul de proiecte pe categorie și «ids» (id-urile pe categorie);
+  fișierul nu se rescrie niciodată.
+– Verificarea «ziua există deja» citește doar ultima linie; graficul în timp folosește
+  numărătorile (fără a recalcula zilele trecute), **risk_ids()** id-urile unei zile.
+– Vechiul data/risc_istoric.json (o listă per coloană) se convertește o singură dată,
+  cu tot cu id-uri; fișierul vechi rămâne pe disc.
+"""
+
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import DATA_DIR
+
+RISK_HISTORY = DATA_DIR / "risc_istoric.jsonl"
+LEGACY_HISTORY_JSON = DATA_DIR / "risc_istoric.json"
+
+BUCKET_OK = "✅ La termen"
+BUCKET_WARN = "⚠️ Avertizare (1–3 zile)"
+BUCKET_CRIT = "⛔ Critic (>3 zile)"
+BUCKET_NONE = "– fără termen –"
+BUCKETS: List[str] = [BUCKET_OK, BUCKET_WARN, BUCKET_CRIT, BUCKET_NONE]
+
+def days_late(end: pd.Series, today: pd.Timestamp) -> pd.Series:
+    """Zile de întârziere față de «end» (NaN dacă nu există termen)."""
+    return (today - pd.to_datetime(end, errors="coerce")).dt.days
+
+def classify_risk(late: pd.Series) -> np.ndarray:
+    """Categoria de risc pentru fiecare valoare din «days_late» (vectorizat)."""
+    v = pd.to_numeric(late, errors="coerce").to_numpy(dtype=float)
+    return np.select(
+        [np.isnan(v), v <= 0, v <= 3],
+        [BUCKET_NONE, BUCKET_OK, BUCKET_WARN],
+        default=BUCKET_CRIT,
+    )
+
+# --- Istoric --------------------------------------------------------------------
+_KEYS = {BUCKET_OK: "ok", BUCKET_WARN: "warn", BUCKET_CRIT: "crit", BUCKET_NONE: "none"}
+
+_HIST_CACHE: Dict = {"stamp": None, "rows": [], "frame": None}
+
+def _record(day: str, counts: Dict[str, int], ids: Dict[str, List[str]]) -> str:
+    row: Dict = {"date": day}
+    row.update({_KEYS[b]: int(counts.get(b, 0)) for b in BUCKETS})
+    row["ids"] = {_KEYS[b]: list(ids.get(b, [])) for b in BUCKETS}
+    return json.dumps(row, ensure_ascii=False, separators=(",", ":"))
+
+def _migrate_json() -> None:
+    """Istoricul vechi (JSON cu o listă per coloană) devine jsonl; numărătorile și id-urile se păstrează."""
+    if RISK_HISTORY.exists() or not LEGACY_HISTORY_JSON.exists():
+        return
+    try:
+        old = json.loads(LEGACY_HISTORY_JSON.read_text(encoding="utf-8"))
+    except Exception:
+        return
+    counts, ids = old.get("counts", {}), old.get("ids", {})
+    at = lambda col, b, i, default: (col.get(b) or [])[i] if i < len(col.get(b) or []) else default
+    lines = [_record(d, {b: at(counts, b, i, 0) for b in BUCKETS}, {b: at(ids, b, i, []) for b in BUCKETS})
+             for i, d in enumerate(old.get("date", []))]
+    if lines:
+        tmp = RISK_HISTORY.with_suffix(".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp, RISK_HISTORY)
+
+def _last_date() -> Optional[str]:
+    """Data ultimei înregistrări (citită de la coada fișierului, înapoi până la începutul liniei)."""
+    try:
+        with open(RISK_HISTORY, "rb") as fh:
+            end = fh.seek(0, os.SEEK_END)
+            pos, tail = end, b""
+            while pos > 0 and tail.rstrip(b"\n").count(b"\n") == 0:
+                step = min(4096, pos)
+                pos -= step
+                fh.seek(pos)
+                tail = fh.read(step) + tail
+        last = tail.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+        return json.loads(last.decode("utf-8")).get("date") if last else None
+    except (OSError, ValueError):
+        return None
+
+def snapshot_risk(df: pd.DataFrame, today: Optional[date] = None, force: bool = False) -> bool:
+    """
+    Adaugă snapshot-ul zilei (proiecte nefinalizate). Idempotent: dacă ziua există deja,
+    nu scrie nimic (cu force=True adaugă o linie nouă, care o înlocuiește pe cea veche la citire).
+    Întoarce True dacă fișierul a fost modificat.
+    """
+    _migrate_json()
+    key = (today or date.today()).isoformat()
+    if _last_date() == key and not force:
+        return False
+
+    ids: Dict[str, List[str]] = {b: [] for b in BUCKETS}
+    if df is not None and not df.empty:
+        prog = pd.to_numeric(df.get("progress_overall"), errors="coerce").fillna(0.0)
+        open_ = df[prog < 100]
+        buckets = classify_risk(days_late(open_["end"], pd.Timestamp(key)))
+        for b, pid in zip(buckets, open_["id"].astype(str)):
+            ids[b].append(pid)
+
+    RISK_HISTORY.parent.mkdir(parents=True, exist_ok=True)
+    with open(RISK_HISTORY, "a", encoding="utf-8") as fh:
+        fh.write(_record(key, {b: len(v) for b, v in ids.items()}, ids) + "\n")
+    return True
+
+def _read_history() -> List[Dict]:
+    """Înregistrările din fișier (memorate cât timp fișierul nu se schimbă); ultima pe zi câștigă."""
+    _migrate_json()
+    try:
+        st_ = RISK_HISTORY.stat()
+        stamp = (st_.st_mtime_ns, st_.st_size)
+    except OSError:
+        return []
+    if _HIST_CACHE["stamp"] != stamp:
+        by_day: Dict[str, Dict] = {}
+        with open(RISK_HISTORY, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue  # linie trunchiată (scriere întreruptă)
+                if row.get("date"):
+                    by_day.pop(row["date"], None)
+                    by_day[row["date"]] = row
+        _HIST_CACHE.update(stamp=stamp, rows=sorted(by_day.values(), key=lambda r: r["date"]), frame=None)
+    return _HIST_CACHE["rows"]
+
+def risk_ids(day) -> Dict[str, List[str]]:
+    """Id-urile proiectelor pe categorie în ziua «day» (gol dacă ziua nu are snapshot)."""
+    key = pd.Timestamp(day).date().isoformat()
+    for row in reversed(_read_history()):
+        if row["date"] == key:
+            ids = row.get("ids") or {}
+            return {b: list(ids.get(k, [])) for b, k in _KEYS.items()}
+    return {b: [] for b in BUCKETS}
+
+def risk_history_frame() -> pd.DataFrame:
+    """Tabel pentru grafic: o linie pe zi, o coloană pe categorie."""
+    rows = _read_history()
+    if not rows:
+        return pd.DataFrame(columns=["date"] + BUCKETS)
+    if _HIST_CACHE.get("frame") is None:
+        out = pd.DataFrame({"date": pd.to_datetime([r["date"] for r in rows], errors="coerce")})
+        for b, k in _KEYS.items():  # categorii adăugate ulterior lipsesc din liniile vechi
+            out[b] = [int(r.get(k) or 0) for r in rows]
+        _HIST_CACHE["frame"] = out.dropna(subset=["date"]).reset_index(drop=True)
+    return _HIST_CACHE["frame"]
@@ -0,0 +1,141 @@
+# utils/section_queues.py
+from __future__ import annotations
+"""
+Cozi de lucru pe secție (board operator), peste toate proiectele deschise.
+
+– Fiecare secție are un heap cu secțiunile de proiect nefinalizate, ordonate după
+  termenul secției (section_deadlines), riscul proiectului și progresul secției.
+– Actualizare incrementală: la o salvare se reintroduc doar proiectele modificate;
+  intrările vechi sunt invalidate «leneș» (rămân în heap și se aruncă la citire).
+– top(secție, N) costă O(N log M), indiferent de mărimea portofoliului.
+"""
+
+import heapq
+import itertools
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_loader import data, parse_section_deadlines, parse_section_progress
+from utils.risk_history import BUCKET_CRIT, BUCKET_WARN, classify_risk, days_late
+
+RISK_RANK = {BUCKET_CRIT: 2, BUCKET_WARN: 1}
+_NO_DEADLINE = date.max.toordinal()
+
+Entry = Tuple[tuple, int, str]  # (prioritate, secvență, id proiect)
+
+def _risks(end: pd.Series, today: date):
+    return classify_risk(days_late(end, pd.Timestamp(today)))
+
+class SectionQueues:
+    """Un heap per secție; intrările invalide se elimină la citire."""
+
+    def __init__(self) -> None:
+        self._heaps: Dict[str, List[Entry]] = {}
+        self._live: Dict[Tuple[str, str], int] = {}  # (secție, proiect) -> secvența intrării valide
+        self._info: Dict[Tuple[str, str], dict] = {}  # detalii afișate în coadă
+        self._sections: Dict[str, List[str]] = {}  # proiect -> secții cu intrare validă
+        self._count: Dict[str, int] = {}  # intrări valide per secție
+        self._seq = itertools.count()
+        self.as_of: Optional[date] = None
+        self.version: Optional[int] = None
+
+    # --- întreținere --------------------------------------------------------------
+    def remove(self, project_id: str) -> None:
+        for sec in self._sections.pop(project_id, []):
+            self._live.pop((sec, project_id), None)
+            self._info.pop((sec, project_id), None)
+            self._count[sec] -= 1
+
+    def upsert(self, row, risk: Optional[str] = None) -> None:
+        pid = str(row.get("id") or "").strip()
+        if not pid:
+            return
+        self.remove(pid)
+        if "DELIVERED_ON:" in str(row.get("notes") or ""):
+            return
+        today = self.as_of or date.today()
+        secs = [s.strip() for s in str(row.get("sections") or "").split(",") if s.strip()]
+        prog = parse_section_progress(row.get("sections_progress"))
+        deadlines = parse_section_deadlines(row.get("section_deadlines"))
+        if risk is None:
+            risk = str(_risks(pd.Series([row.get("end")]), today)[0])
+        placed: List[str] = []
+        for i, sec in enumerate(secs):
+            p = prog[i] if i < len(prog) else 0
+            if p >= 100:
+                continue
+            dl = deadlines.get(sec)
+            dl = None if dl is None or pd.isna(dl) else dl.date()
+            prio = (dl.toordinal() if dl else _NO_DEADLINE, -RISK_RANK.get(risk, 0), p)
+            seq = next(self._seq)
+            heap = self._heaps.setdefault(sec, [])
+            heapq.heappush(heap, (prio, seq, pid))
+            self._live[(sec, pid)] = seq
+            self._info[(sec, pid)] = {
+                "id": pid, "name": str(row.get("name") or ""), "deadline": dl,
+                "days_left": (dl - today).days if dl else None,
+                "progress": int(p), "risk": risk,
+            }
+            placed.append(sec)
+            self._count[sec] = self._count.get(sec, 0) + 1
+            if len(heap) > 64 and len(heap) > 2 * self._count.get(sec, 0) + 2:
+                self._compact(sec)
+        self._sections[pid] = placed
+
+    def _compact(self, section: str) -> None:
+        """Scoate din heap intrările invalidate (când au ajuns majoritare)."""
+        heap = [e for e in self._heaps.get(section, []) if self._live.get((section, e[2])) == e[1]]
+        heapq.heapify(heap)
+        self._heaps[section] = heap
+
+    def rebuild(self, df: pd.DataFrame, today: Optional[date] = None) -> None:
+        self.__init__()
+        self.as_of = today or date.today()
+        if df is not None and not df.empty:
+            for (_, r), risk in zip(df.iterrows(), _risks(df["end"], self.as_of)):
+                self.upsert(r, str(risk))
+
+    def on_write(self, df: pd.DataFrame, changed_ids: Optional[List[str]]) -> None:
+        if self.as_of is None:
+            return  # încă neconstruită; se construiește la prima citire
+        if changed_ids is None:
+            self.rebuild(df, self.as_of)
+        else:
+            ids = {str(i).strip() for i in changed_ids}
+            rows = df[df["id"].astype(str).isin(ids)]
+            for _, r in rows.iterrows():
+                self.upsert(r)
+            for pid in ids - set(rows["id"].astype(str)):
+                self.remove(pid)
+        self.version = data.version
+
+    def ensure_current(self) -> None:
+        """Reconstruiește dacă s-a schimbat ziua sau datele s-au reîncărcat în afara hook-ului."""
+        today = date.today()
+        if self.as_of != today or self.version != data.version:
+            self.rebuild(data.projects, today)
+            self.version = data.version
+
+    # --- citire -------------------------------------------------------------------
+    def top(self, section: str, n: int = 10) -> pd.DataFrame:
+        """Primele N lucrări ale secției (termen ↑, risc ↓, progres ↑)."""
+        self.ensure_current()
+        heap = self._heaps.get(section, [])
+        picked: List[Entry] = []
+        while heap and len(picked) < n:
+            e = heapq.heappop(heap)
+            if self._live.get((section, e[2])) == e[1]:
+                picked.append(e)
+            # intrările invalide nu se mai pun înapoi
+        for e in picked:
+            heapq.heappush(heap, e)
+        cols = ["id", "name", "deadline", "days_left", "progress", "risk"]
+        return pd.DataFrame([self._info[(section, e[2])] for e in picked], columns=cols)
+
+    def size(self, section: str) -> int:
+        return self._count.get(section, 0)
+
+queues = SectionQueues()  # singleton, ca data_loader.data
+data.add_write_hook(queues.on_write)
@@ -0,0 +1,123 @@
+# utils/thumbnails.py
+from __future__ import annotations
+"""
+Miniaturi pentru atașamentele foto (galerii Secțiuni / Profil / Comandă nouă).
+
+– Miniatura se salvează în attachments/.thumbs/<sha[:2]>/<sha>_<px>.webp (JPEG dacă
+  Pillow nu are WebP), unde sha = SHA-256 al conținutului: aceeași poză încărcată de
+  două ori are o singură miniatură.
+– Generare «leneșă» la prima afișare sau în fundal (thread pool) imediat după upload.
+– Pillow e opțional: fără el, thumbnail() întoarce None și se afișează originalul.
+– Pentru PDF, prima pagină se rasterizează (PyMuPDF, opțional) în același director.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+try:  # dependență opțională
+    from PIL import Image, ImageOps
+except Exception:  # pragma: no cover
+    Image = None
+    ImageOps = None
+
+try:  # randare PDF, opțională
+    import fitz  # PyMuPDF
+except Exception:  # pragma: no cover
+    fitz = None
+
+from utils.data_loader import APP_ROOT
+
+ATTACH_DIR = APP_ROOT / "attachments"
+THUMBS_DIR = ATTACH_DIR / ".thumbs"
+THUMB_PX = 480  # latura maximă
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+
+_HASHES: Dict[Tuple[str, int, int], str] = {}  # (cale, mtime_ns, dimensiune) -> sha256
+_POOL: Optional[ThreadPoolExecutor] = None
+
+def _thumb_format() -> Tuple[str, str]:
+    if Image is not None and "WEBP" in Image.registered_extensions().values():
+        return "WEBP", ".webp"
+    return "JPEG", ".jpg"
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 al fișierului, memorat cât timp fișierul nu se schimbă."""
+    st_ = path.stat()
+    key = (str(path), st_.st_mtime_ns, st_.st_size)
+    sha = _HASHES.get(key)
+    if sha is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        sha = _HASHES[key] = h.hexdigest()
+    return sha
+
+def remember_sha256(path: Path, sha: str) -> None:
+    """Înregistrează un SHA-256 deja calculat (ex. la salvarea upload-ului), fără a reciti fișierul."""
+    st_ = Path(path).stat()
+    _HASHES[(str(path), st_.st_mtime_ns, st_.st_size)] = sha
+
+def thumb_path_for(sha: str, px: int = THUMB_PX) -> Path:
+    return THUMBS_DIR / sha[:2] / f"{sha}_{px}{_thumb_format()[1]}"
+
+def _make_thumbnail(src: Path, dst: Path, px: int) -> None:
+    fmt, _ = _thumb_format()
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)  # poze de pe telefon: orientarea corectă
+        im.thumbnail((px, px))
+        if fmt == "JPEG" and im.mode not in ("RGB", "L"):
+            im = im.convert("RGB")
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dst.with_name(dst.name + ".tmp")
+        im.save(tmp, fmt, quality=80)
+    os.replace(tmp, dst)  # nu lăsăm miniaturi trunchiate dacă se întrerupe
+
+def thumbnail(path: Path, px: int = THUMB_PX) -> Optional[Path]:
+    """Miniatura imaginii (generată la nevoie) sau None dacă nu se poate face."""
+    path = Path(path)
+    if Image is None or path.suffix.lower() not in IMAGE_EXTS or not path.exists():
+        return None
+    try:
+        dst = thumb_path_for(file_sha256(path), px)
+        if not dst.exists():
+            _make_thumbnail(path, dst, px)
+        return dst
+    except Exception:
+        return None
+
+def pdf_first_page(path: Path, px: int = THUMB_PX) -> Optional[Path]:
+    """Raster al primei pagini dintr-un PDF (cache pe disc) sau None fără renderer."""
+    path = Path(path)
+    if fitz is None or Image is None or path.suffix.lower() != ".pdf" or not path.exists():
+        return None
+    try:
+        dst = thumb_path_for(file_sha256(path) + "_p1", px)
+        if not dst.exists():
+            with fitz.open(path) as doc:
+                page = doc.load_page(0)
+                zoom = px / max(page.rect.width, page.rect.height)
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            im = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dst.with_name(dst.name + ".tmp")
+            im.save(tmp, _thumb_format()[0], quality=80)
+            os.replace(tmp, dst)
+        return dst
+    except Exception:
+        return None
+
+def queue_thumbnails(paths: Iterable, px: int = THUMB_PX) -> None:
+    """Generează în fundal miniaturile pentru fișierele tocmai salvate (căi relative la aplicație)."""
+    global _POOL
+    items = [APP_ROOT / p if not Path(p).is_absolute() else Path(p) for p in paths]
+    items = [p for p in items if p.suffix.lower() in IMAGE_EXTS + (".pdf",)]
+    if Image is None or not items:
+        return
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="thumbs")
+    for p in items:
+        _POOL.submit(pdf_first_page if p.suffix.lower() == ".pdf" else thumbnail, p, px)
@@ -0,0 +1,239 @@
+# utils/transport_planner.py
+from __future__ import annotations
+"""
+Planificator livrări (Transport (Livrare)) pe mai multe proiecte.
+
+– Citește volumul și înălțimea utilă salvate în «notes» la crearea proiectului
+  (linia «… | Volum estimat: X m³ | Înălțime utilă minimă: Y m»).
+– Grupează proiectele pe ziua termenului de Transport din «section_deadlines».
+– Împachetează încărcăturile în clasele de vehicul (first-fit-decreasing),
+  cu căutare exactă opțională pentru zilele cu puține proiecte.
+– Comenzile mai mari decât cel mai mare vehicul sunt împărțite în mai multe curse.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_loader import parse_section_deadlines, split_sections
+
+TRANSPORT_SECTION = "Transport (Livrare)"
+
+# --- Clase vehicul -------------------------------------------------------------
+@dataclass(frozen=True)
+class Vehicle:
+    name: str
+    capacity_m3: float
+    height_m: float  # înălțime utilă interioară (orientativ)
+
+# Aceleași praguri ca în configuratorul de ofertă (new_order._compute_from_config)
+VEHICLE_CLASSES: List[Vehicle] = [
+    Vehicle("Autoutilitară mică (≈3 m³)", 3.0, 1.3),
+    Vehicle("Van mediu (≈6 m³)", 6.0, 1.7),
+    Vehicle("Van mare (≈12 m³)", 12.0, 1.9),
+    Vehicle("Camion 3.5T (≈20 m³)", 20.0, 2.2),
+    Vehicle("Camion >7.5T", 45.0, 2.6),
+]
+
+# Peste acest număr de încărcături pe zi rămânem doar la euristică
+EXACT_MAX_ITEMS = 8
+
+_EPS = 1e-9
+
+def vehicle_for_volume(volume_m3: float) -> Vehicle:
+    """Vehiculul recomandat doar după volum (comportamentul istoric al configuratorului)."""
+    for v in VEHICLE_CLASSES[:-1]:
+        if volume_m3 < v.capacity_m3:
+            return v
+    return VEHICLE_CLASSES[-1]
+
+def _classes_for_height(height_m: float) -> List[Vehicle]:
+    ok = [v for v in VEHICLE_CLASSES if v.height_m + _EPS >= height_m]
+    return ok or [VEHICLE_CLASSES[-1]]
+
+def _smallest_fit(volume_m3: float, height_m: float) -> Vehicle:
+    for v in _classes_for_height(height_m):
+        if volume_m3 <= v.capacity_m3 + _EPS:
+            return v
+    return VEHICLE_CLASSES[-1]
+
+# --- Încărcături ---------------------------------------------------------------
+@dataclass
+class DeliveryLoad:
+    project_id: str
+    name: str
+    day: date
+    volume_m3: float
+    height_m: float
+    part: str = ""  # «1/2» dacă proiectul a fost împărțit pe mai multe curse
+
+    @property
+    def label(self) -> str:
+        return f"{self.project_id}" + (f" ({self.part})" if self.part else "")
+
+@dataclass
+class Trip:
+    day: date
+    loads: List[DeliveryLoad] = field(default_factory=list)
+
+    @property
+    def volume_m3(self) -> float:
+        return sum(l.volume_m3 for l in self.loads)
+
+    @property
+    def height_m(self) -> float:
+        return max((l.height_m for l in self.loads), default=0.0)
+
+    @property
+    def vehicle(self) -> Vehicle:
+        return _smallest_fit(self.volume_m3, self.height_m)
+
+_RE_VOLUME = re.compile(r"Volum estimat:\s*([\d.,]+)\s*m³")
+_RE_HEIGHT = re.compile(r"Înălțime utilă minimă:\s*([\d.,]+)\s*m")
+
+def parse_transport_load(notes: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """(volum_m3, înălțime_m) din notele proiectului, sau (None, None)."""
+    if not notes:
+        return None, None
+    text = str(notes)
+    vol = _RE_VOLUME.search(text)
+    hgt = _RE_HEIGHT.search(text)
+    def _num(m):
+        try:
+            return float(m.group(1).replace(",", ".")) if m else None
+        except Exception:
+            return None
+    return _num(vol), _num(hgt)
+
+def collect_loads(df: pd.DataFrame, start: date, end: date) -> Tuple[List[DeliveryLoad], List[str]]:
+    """
+    Proiectele cu termen de Transport în [start, end].
+    Întoarce (încărcături, id-uri sărite din lipsă de volum salvat).
+    """
+    loads: List[DeliveryLoad] = []
+    skipped: List[str] = []
+    if df is None or df.empty:
+        return loads, skipped
+    for _, r in df.iterrows():
+        if TRANSPORT_SECTION not in split_sections(r.get("sections")):
+            continue
+        if "DELIVERED_ON:" in str(r.get("notes") or ""):
+            continue
+        dl = parse_section_deadlines(r.get("section_deadlines")).get(TRANSPORT_SECTION)
+        if dl is None or pd.isna(dl):
+            continue
+        day = dl.date()
+        if day < start or day > end:
+            continue
+        vol, hgt = parse_transport_load(r.get("notes"))
+        if not vol or vol <= 0:
+            skipped.append(str(r.get("id")))
+            continue
+        loads.append(DeliveryLoad(str(r.get("id")), str(r.get("name") or ""), day, float(vol), float(hgt or 0.0)))
+    return loads, skipped
+
+def _split_oversized(loads: List[DeliveryLoad]) -> List[DeliveryLoad]:
+    """Împarte o comandă care nu încape în cel mai mare vehicul în curse pline + rest."""
+    out: List[DeliveryLoad] = []
+    for l in loads:
+        cap = _classes_for_height(l.height_m)[-1].capacity_m3
+        if l.volume_m3 <= cap + _EPS:
+            out.append(l)
+            continue
+        n_full = int(l.volume_m3 // cap)
+        rest = l.volume_m3 - n_full * cap
+        n = n_full + (1 if rest > _EPS else 0)
+        for i in range(n):
+            vol = cap if i < n_full else rest
+            out.append(DeliveryLoad(l.project_id, l.name, l.day, round(vol, 3), l.height_m, f"{i+1}/{n}"))
+    return out
+
+# --- Împachetare ---------------------------------------------------------------
+def _fits(trip: Trip, load: DeliveryLoad) -> bool:
+    height = max(trip.height_m, load.height_m)
+    cap = _classes_for_height(height)[-1].capacity_m3
+    return trip.volume_m3 + load.volume_m3 <= cap + _EPS
+
+def pack_ffd(loads: List[DeliveryLoad], day: date) -> List[Trip]:
+    """First-fit-decreasing: fiecare încărcătură intră în prima cursă deschisă în care încape."""
+    trips: List[Trip] = []
+    for l in sorted(loads, key=lambda x: (-x.volume_m3, -x.height_m)):
+        for t in trips:
+            if _fits(t, l):
+                t.loads.append(l)
+                break
+        else:
+            trips.append(Trip(day, [l]))
+    return trips
+
+def _plan_cost(trips: List[Trip]) -> Tuple[int, float]:
+    # întâi numărul de curse, apoi capacitatea totală angajată (vehicule mai mici)
+    return len(trips), round(sum(t.vehicle.capacity_m3 for t in trips), 6)
+
+def pack_exact(loads: List[DeliveryLoad], day: date) -> List[Trip]:
+    """Căutare exhaustivă (branch & bound) — doar pentru seturi mici."""
+    items = sorted(loads, key=lambda x: (-x.volume_m3, -x.height_m))
+    best = pack_ffd(items, day)
+    best_cost = _plan_cost(best)
+    bins: List[List[DeliveryLoad]] = []
+
+    def _rec(i: int) -> None:
+        nonlocal best, best_cost
+        if len(bins) > best_cost[0]:
+            return
+        if i == len(items):
+            trips = [Trip(day, list(b)) for b in bins]
+            cost = _plan_cost(trips)
+            if cost < best_cost:
+                best, best_cost = trips, cost
+            return
+        it = items[i]
+        for b in bins:
+            if _fits(Trip(day, b), it):
+                b.append(it)
+                _rec(i + 1)
+                b.pop()
+        if len(bins) + 1 <= best_cost[0]:
+            bins.append([it])
+            _rec(i + 1)
+            bins.pop()
+
+    _rec(0)
+    return best
+
+def plan_day(loads: List[DeliveryLoad], day: date, exact: bool = True, exact_limit: int = EXACT_MAX_ITEMS) -> List[Trip]:
+    items = _split_oversized(loads)
+    if exact and len(items) <= exact_limit:
+        return pack_exact(items, day)
+    return pack_ffd(items, day)
+
+def plan_deliveries(df: pd.DataFrame, start: date, end: date, exact: bool = True,
+                    exact_limit: int = EXACT_MAX_ITEMS) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Plan de încărcare pe zile pentru proiectele cu Transport în [start, end].
+    Întoarce (tabel curse, id-uri fără volum salvat).
+    """
+    loads, skipped = collect_loads(df, start, end)
+    by_day: Dict[date, List[DeliveryLoad]] = {}
+    for l in loads:
+        by_day.setdefault(l.day, []).append(l)
+
+    rows = []
+    for day in sorted(by_day):
+        for n, t in enumerate(plan_day(by_day[day], day, exact=exact, exact_limit=exact_limit), start=1):
+            v = t.vehicle
+            rows.append({
+                "day": day,
+                "trip": n,
+                "vehicle": v.name,
+                "capacity_m3": v.capacity_m3,
+                "load_m3": round(t.volume_m3, 2),
+                "fill_pct": round(100.0 * t.volume_m3 / v.capacity_m3, 1) if v.capacity_m3 else 0.0,
+                "max_height_m": round(t.height_m, 2),
+                "projects": ", ".join(l.label for l in t.loads),
+            })
+    cols = ["day", "trip", "vehicle", "capacity_m3", "load_m3", "fill_pct", "max_height_m", "projects"]
+    return pd.DataFrame(rows, columns=cols), skipped
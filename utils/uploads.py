@@ -0,0 +1,83 @@
+# utils/uploads.py
+from __future__ import annotations
+"""
+Persistarea fișierelor încărcate (st.file_uploader), comună tuturor paginilor.
+
+– Fișierul se copiază pe bucăți de CHUNK_SIZE într-un fișier temporar din directorul
+  destinație; în aceeași trecere se calculează SHA-256 și dimensiunea.
+– Limitele pe tip (UPLOAD_LIMITS) se verifică înainte de copiere (după «size») și în timpul
+  ei; la depășire temporarul se șterge și se ridică **UploadTooLarge**.
+– Mutarea în locul final e atomică (os.replace): nu rămân fișiere trunchiate.
+– Memoria folosită per upload e cel mult o bucată, nu încă o copie a fișierului.
+"""
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict
+
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+MB = 1024 * 1024
+UPLOAD_LIMITS: Dict[str, int] = {
+    ".pdf": 50 * MB,
+    ".png": 25 * MB, ".jpg": 25 * MB, ".jpeg": 25 * MB, ".webp": 25 * MB,
+    ".mp4": 200 * MB, ".mov": 200 * MB,
+}
+DEFAULT_LIMIT = 20 * MB
+
+class UploadTooLarge(ValueError):
+    """Fișierul depășește limita pentru tipul lui."""
+
+@dataclass
+class StreamedUpload:
+    path: Path
+    sha256: str
+    size: int
+
+def limit_for(name: str) -> int:
+    return UPLOAD_LIMITS.get(Path(str(name)).suffix.lower(), DEFAULT_LIMIT)
+
+def _too_large(name: str, limit: int) -> UploadTooLarge:
+    return UploadTooLarge(f"«{name}» depășește limita de {limit // MB} MB pentru acest tip de fișier.")
+
+def check_upload(file) -> None:
+    """Verificare rapidă după dimensiunea raportată de uploader (fără a citi conținutul)."""
+    limit = limit_for(file.name)
+    size = getattr(file, "size", None)
+    if size is not None and size > limit:
+        raise _too_large(file.name, limit)
+
+def stream_upload(file, tmp_dir: Path) -> StreamedUpload:
+    """Copiază «file» pe bucăți într-un temporar din tmp_dir; întoarce temporarul, SHA-256 și dimensiunea."""
+    check_upload(file)
+    limit = limit_for(file.name)
+    tmp_dir = Path(tmp_dir)
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+    tmp = tmp_dir / f".{uuid.uuid4().hex}.tmp"
+    h = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    try:
+        with open(tmp, "wb") as out:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large(file.name, limit)
+                h.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        file.seek(0)  # uploader-ul rămâne utilizabil pentru previzualizări
+    return StreamedUpload(tmp, h.hexdigest(), size)
+
+def save_upload(file, dst: Path) -> StreamedUpload:
+    """Salvează «file» la «dst» (pe bucăți, cu înlocuire atomică)."""
+    dst = Path(dst)
+    up = stream_upload(file, dst.parent)
+    os.replace(up.path, dst)
+    return StreamedUpload(dst, up.sha256, up.size)